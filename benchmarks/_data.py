@@ -0,0 +1,49 @@
+import os
+
+import pandas as pd
+
+from core import datastore
+
+# ===========================
+# KONFIGURASI BENCHMARK
+# ===========================
+# Modul biasa (bukan conftest) agar bisa di-import di mode import pytest apa pun;
+# file bench memakai isinya lewat fixture di conftest.py
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Faktor pengali data sintetis; 1 = CSV bawaan. Bisa dipersempit, mis. BENCH_SCALES=1,10
+SCALES = tuple(int(value) for value in os.environ.get("BENCH_SCALES", "1,10,100,1000").split(","))
+
+KESEHATAN_PATH = "data/kesehatan/kesehatan_stunting.csv"
+SOSIAL_PATHS = [path for path in datastore.DATASETS if path.startswith("data/sosial/")]
+
+# ===========================
+# DATA SINTETIS
+# ===========================
+def scale_frame(df, factor):
+    """Perbesar data `factor` kali; tiap salinan digeser ke tahun-tahun sebelumnya agar periode terakhir tetap sama"""
+    if factor == 1:
+        return df.copy()
+
+    year_col = next((col for col in ("Tahun", "tahun") if col in df.columns), None)
+    copies = []
+    for i in range(factor):
+        copy = df.copy()
+        if year_col is not None:
+            span = int(df[year_col].max() - df[year_col].min()) + 1
+            copy[year_col] = copy[year_col] - span * i
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+def read_raw(source_path, factor):
+    """CSV mentah (belum dibersihkan) yang sudah diperbesar; ikut DASHBOARD_DATA_DIR bila di-set"""
+    return scale_frame(pd.read_csv(datastore.source_file(source_path)), factor)
+
+def clean_frame(raw_df, source_path):
+    """Jalankan pembersih dan encoding kategori yang sama dengan core.datastore"""
+    df = datastore.DATASETS[source_path](raw_df.copy())
+    return datastore.encode_categoricals(df, source_path)
+
+def dataset_name(source_path):
+    """Nama dataset seperti kunci load_sosial_data di dashboard_sosial"""
+    return os.path.basename(source_path).replace('.csv', '').replace('_', ' ').title()
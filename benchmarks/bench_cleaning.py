@@ -0,0 +1,18 @@
+import pytest
+
+from core.cleaning import clean_numeric_columns, extract_rupiah_value, extract_rupiah_value_series
+
+# ===========================
+# PEMBERSIHAN ANGKA
+# ===========================
+@pytest.mark.parametrize("name", ["Bantuan Sosial", "Bencana Alam", "Peserta Kb"])
+def bench_clean_numeric_columns(benchmark, sosial_raw, name):
+    benchmark(clean_numeric_columns, sosial_raw[name])
+
+def bench_extract_rupiah_value(benchmark, sosial_raw):
+    kerugian = sosial_raw["Bencana Alam"]["Kerugian_Rupiah"]
+    benchmark(kerugian.map, extract_rupiah_value)
+
+def bench_extract_rupiah_value_series(benchmark, sosial_raw):
+    kerugian = sosial_raw["Bencana Alam"]["Kerugian_Rupiah"]
+    benchmark(extract_rupiah_value_series, kerugian)
@@ -0,0 +1,88 @@
+import pytest
+
+from core.datastore import load_dataset
+from core.kecamatan import (
+    FACT_SOURCES,
+    UNKNOWN_ID,
+    build_fact_table,
+    kecamatan_ids,
+    load_dimension,
+    load_fact_table,
+    slice_profile,
+)
+
+# Kecamatan yang diprofilkan (Kecamatan_ID di master_kecamatan)
+PROFILE_KECAMATAN_ID = 22
+
+@pytest.fixture(scope="module")
+def dimension():
+    return load_dimension()
+
+@pytest.fixture(scope="module")
+def fact_datasets(clean_dataset):
+    return {path: clean_dataset(path) for path in FACT_SOURCES}
+
+# ===========================
+# KUNCI INTEGER KECAMATAN
+# ===========================
+def bench_load_dimension(benchmark):
+    dimension = benchmark(load_dimension)
+    assert dimension.index.is_unique
+
+def bench_kecamatan_ids(benchmark, kesehatan_df, dimension):
+    # Nama -> Kecamatan_ID lewat kode kategori (hanya kategori unik yang dipetakan)
+    ids = benchmark(kecamatan_ids, kesehatan_df['Kecamatan'], dimension)
+    assert (ids != UNKNOWN_ID).all()
+
+def bench_kecamatan_ids_from_strings(benchmark, kesehatan_df, dimension):
+    # Pembanding: kolom teks biasa (mis. hasil merge tanpa Categorical) harus di-encode dulu
+    names = kesehatan_df['Kecamatan'].astype(str)
+    ids = benchmark(kecamatan_ids, names, dimension)
+    assert (ids != UNKNOWN_ID).all()
+
+def bench_join_on_int_key(benchmark, kesehatan_df, dimension):
+    # Join ke dimensi (region, centroid) lewat int key
+    ids = kecamatan_ids(kesehatan_df['Kecamatan'], dimension)
+    joined = benchmark(lambda: dimension[['Region', 'Lat', 'Lon']].reindex(ids.to_numpy()))
+    assert len(joined) == len(kesehatan_df)
+
+def bench_join_on_name(benchmark, kesehatan_df, dimension):
+    # Pembanding: merge dimensi berdasarkan nama kecamatan (string)
+    names = kesehatan_df[['Kecamatan']].astype(str)
+    lookup = dimension[['Kecamatan', 'Region', 'Lat', 'Lon']]
+    joined = benchmark(names.merge, lookup, on='Kecamatan', how='left')
+    assert len(joined) == len(kesehatan_df)
+
+# ===========================
+# TABEL FAKTA KECAMATAN x TAHUN
+# ===========================
+def bench_build_fact_table(benchmark, fact_datasets, dimension):
+    facts = benchmark(build_fact_table, fact_datasets, dimension)
+    assert facts.index.is_monotonic_increasing
+
+def bench_profile_from_fact_table(benchmark):
+    # Isi dashboard_profil_kecamatan: tabel fakta dari cache kolumnar lalu satu slice index
+    load_fact_table()
+    profile = benchmark(lambda: slice_profile(load_fact_table(), PROFILE_KECAMATAN_ID))
+    assert not profile.empty
+
+def bench_profile_slice(benchmark, fact_datasets, dimension):
+    # Slice saja (tabel fakta sudah ada di cache Streamlit)
+    facts = build_fact_table(fact_datasets, dimension)
+    profile = benchmark(slice_profile, facts, PROFILE_KECAMATAN_ID)
+    assert not profile.empty
+
+def bench_profile_from_sector_loads(benchmark, dimension):
+    # Pembanding: load penuh tiap dataset sektor lalu filter baris satu kecamatan
+    name = dimension.loc[PROFILE_KECAMATAN_ID, "Kecamatan"]
+
+    def profile_from_sectors():
+        sectors = {}
+        for path in FACT_SOURCES:
+            df = load_dataset(path)
+            kecamatan_col = "kecamatan" if "kecamatan" in df.columns else "Kecamatan"
+            sectors[path] = df[df[kecamatan_col] == name]
+        return sectors
+
+    sectors = benchmark(profile_from_sectors)
+    assert all(not df.empty for df in sectors.values())
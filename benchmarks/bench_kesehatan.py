@@ -0,0 +1,78 @@
+from core.kesehatan import (
+    append_period_rows,
+    build_facilities_index,
+    build_faskes_analysis,
+    build_latest_period_index,
+    build_period_index,
+    create_sorted_period_data,
+    faskes_comparison_plot_data,
+    get_latest_facilities_data,
+    latest_facilities_snapshot,
+    lookup_latest_period,
+    slice_period_trend,
+)
+
+# ===========================
+# PERIODE & FASILITAS
+# ===========================
+def bench_get_latest_facilities_data(benchmark, kesehatan_df):
+    faskes_df = benchmark(get_latest_facilities_data, kesehatan_df)
+    assert not faskes_df.empty
+
+def bench_create_sorted_period_data(benchmark, kesehatan_df):
+    # Dashboard memanggilnya dengan salinan data terfilter
+    sorted_df = benchmark(lambda: create_sorted_period_data(kesehatan_df.copy()))
+    assert sorted_df['Periode'].notna().all()
+
+# ===========================
+# INDEKS PERIODE
+# ===========================
+def bench_build_period_index(benchmark, kesehatan_df):
+    index = benchmark(build_period_index, kesehatan_df)
+    assert not index.empty
+
+def bench_append_period_rows(benchmark, kesehatan_df):
+    # Periode terakhir datang belakangan: hanya selnya yang ditambahkan ke indeks lama
+    latest_year = kesehatan_df['Tahun'].max()
+    new_rows = kesehatan_df[kesehatan_df['Tahun'] == latest_year]
+    index = build_period_index(kesehatan_df.drop(new_rows.index))
+    updated = benchmark(append_period_rows, index, new_rows)
+    assert updated.equals(build_period_index(kesehatan_df))
+
+def bench_slice_period_trend(benchmark, kesehatan_df):
+    index = build_period_index(kesehatan_df)
+    kecamatan = kesehatan_df['Kecamatan'].unique()[:10]
+    trend = benchmark(slice_period_trend, index, 'Periode', None, kecamatan)
+    assert trend['Periode'].notna().all()
+
+# ===========================
+# PERIODE TERAKHIR
+# ===========================
+def bench_lookup_latest_period(benchmark, kesehatan_df):
+    latest_index = build_latest_period_index(build_period_index(kesehatan_df))
+    years = sorted(kesehatan_df['Tahun'].unique())
+    kecamatan = kesehatan_df['Kecamatan'].unique()[:10]
+    latest_year, latest_month = benchmark(lookup_latest_period, latest_index, years, kecamatan)
+    assert latest_month is not None
+
+def bench_latest_facilities_snapshot(benchmark, kesehatan_df):
+    facilities_index = build_facilities_index(kesehatan_df)
+    latest_index = build_latest_period_index(build_period_index(kesehatan_df))
+    kecamatan = list(kesehatan_df['Kecamatan'].unique())
+    latest_year, latest_month = lookup_latest_period(latest_index, kesehatan_df['Tahun'].unique(), kecamatan)
+    faskes_df, prevalence_df = benchmark(latest_facilities_snapshot, facilities_index, latest_year, latest_month, kecamatan)
+    assert faskes_df.equals(get_latest_facilities_data(kesehatan_df))
+
+def bench_build_faskes_analysis(benchmark, kesehatan_df):
+    facilities_index = build_facilities_index(kesehatan_df)
+    latest_index = build_latest_period_index(build_period_index(kesehatan_df))
+    kecamatan = list(kesehatan_df['Kecamatan'].unique())
+    latest_year, latest_month = lookup_latest_period(latest_index, kesehatan_df['Tahun'].unique(), kecamatan)
+    faskes_df, prevalence_df = latest_facilities_snapshot(facilities_index, latest_year, latest_month, kecamatan)
+
+    def analyze():
+        metrics, summary = build_faskes_analysis(prevalence_df, faskes_df)
+        return faskes_comparison_plot_data(metrics), summary
+
+    plot_df, summary = benchmark(analyze)
+    assert len(plot_df) == 2 * len(faskes_df) and summary is not None
@@ -0,0 +1,37 @@
+import pandas as pd
+
+from core.datastore import load_dataset
+from core.pendidikan import add_rasio_sekolah_penduduk, build_partitions, build_yearly_means
+
+PENDIDIKAN_PATH = "data/pendidikan/pendidikan_paud_sd_smp.csv"
+
+# ===========================
+# LOAD DATA
+# ===========================
+def bench_load_data_cached(benchmark):
+    # Isi load_data di dashboard_pendidikan: baca cache kolumnar lalu encode kategori
+    load_dataset(PENDIDIKAN_PATH)
+    df = benchmark(load_dataset, PENDIDIKAN_PATH)
+    assert not df.empty
+
+def bench_load_data_from_csv(benchmark, raw_dataset, clean_raw, tmp_path):
+    # Jalur ingest saat cache basi: baca CSV, bersihkan, encode kategori
+    csv_path = tmp_path / "pendidikan.csv"
+    raw_dataset(PENDIDIKAN_PATH).to_csv(csv_path, index=False)
+    df = benchmark(lambda: clean_raw(pd.read_csv(csv_path), PENDIDIKAN_PATH))
+    assert len(df) > 0
+
+# ===========================
+# PARTISI TAHUN x JENJANG
+# ===========================
+def bench_build_partitions(benchmark, clean_dataset):
+    df = clean_dataset(PENDIDIKAN_PATH)
+    partitions, yearly_means = benchmark(lambda: (build_partitions(df), build_yearly_means(df)))
+    assert len(partitions) == df.groupby(['tahun', 'jenjang'], observed=True).ngroups
+
+def bench_filter_with_mask(benchmark, clean_dataset):
+    # Jalur lama per rerun: mask tahun & jenjang, salin, lalu hitung rasio
+    df = clean_dataset(PENDIDIKAN_PATH)
+    tahun, jenjang = df['tahun'].max(), df['jenjang'].iloc[0]
+    filtered_df = benchmark(lambda: add_rasio_sekolah_penduduk(df[(df['tahun'] == tahun) & (df['jenjang'] == jenjang)].copy()))
+    assert build_partitions(df)[(int(tahun), str(jenjang))].equals(filtered_df)
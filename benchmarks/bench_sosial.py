@@ -0,0 +1,45 @@
+import pytest
+
+from core.aggregates import build_cubes
+from core.sosial import (
+    calculate_kpis,
+    prepare_bantuan_sosial_data_for_map,
+    prepare_disaster_data_for_map,
+    prepare_kb_performance_data_for_map,
+    prepare_peserta_kb_data_for_map,
+)
+
+# Pilihan tahun yang umum di sidebar dashboard_sosial
+YEAR_SELECTIONS = {
+    "semua": ["Semua Tahun"],
+    "2024": [2024],
+    "2022-2024": [2022, 2023, 2024],
+}
+
+# ===========================
+# CUBE & KPI
+# ===========================
+def bench_build_cubes(benchmark, sosial_data):
+    benchmark(build_cubes, sosial_data)
+
+@pytest.mark.parametrize("years", YEAR_SELECTIONS.values(), ids=YEAR_SELECTIONS.keys())
+def bench_calculate_kpis(benchmark, sosial_cubes, years):
+    kpis = benchmark(calculate_kpis, sosial_cubes, years)
+    assert kpis["peserta_kb"] > 0
+
+# ===========================
+# DATA PETA
+# ===========================
+@pytest.mark.parametrize("prepare_map_data", [
+    prepare_disaster_data_for_map,
+    prepare_bantuan_sosial_data_for_map,
+    prepare_peserta_kb_data_for_map,
+], ids=lambda func: func.__name__)
+@pytest.mark.parametrize("years", YEAR_SELECTIONS.values(), ids=YEAR_SELECTIONS.keys())
+def bench_prepare_map_data(benchmark, sosial_cubes, prepare_map_data, years):
+    map_data = benchmark(prepare_map_data, sosial_cubes, years)
+    assert map_data is not None and not map_data.empty
+
+def bench_prepare_kb_performance_data_for_map(benchmark, sosial_data):
+    map_data = benchmark(prepare_kb_performance_data_for_map, sosial_data)
+    assert map_data is not None and not map_data.empty
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from _data import KESEHATAN_PATH, ROOT_DIR, SCALES, SOSIAL_PATHS, clean_frame, dataset_name, read_raw
+from core.aggregates import build_cubes
+
+# ===========================
+# FIXTURES
+# ===========================
+@pytest.fixture(scope="session", autouse=True)
+def repo_cwd():
+    """Path data di repo bersifat relatif terhadap root repo"""
+    previous = os.getcwd()
+    os.chdir(ROOT_DIR)
+    yield
+    os.chdir(previous)
+
+@pytest.fixture(scope="session", params=SCALES, ids=lambda factor: f"x{factor}")
+def scale(request):
+    return request.param
+
+@pytest.fixture(scope="session")
+def raw_dataset(scale):
+    """CSV mentah yang sudah diperbesar: raw_dataset("data/...")"""
+    return lambda source_path: read_raw(source_path, scale)
+
+@pytest.fixture(scope="session")
+def clean_raw():
+    """Pembersih + encoding kategori ala core.datastore: clean_raw(raw_df, "data/...")"""
+    return clean_frame
+
+@pytest.fixture(scope="session")
+def clean_dataset(raw_dataset):
+    """Dataset bersih yang sudah diperbesar: clean_dataset("data/...")"""
+    return lambda source_path: clean_frame(raw_dataset(source_path), source_path)
+
+@pytest.fixture(scope="session")
+def kesehatan_df(clean_dataset):
+    return clean_dataset(KESEHATAN_PATH)
+
+@pytest.fixture(scope="session")
+def sosial_raw(raw_dataset):
+    return {dataset_name(path): raw_dataset(path) for path in SOSIAL_PATHS}
+
+@pytest.fixture(scope="session")
+def sosial_data(sosial_raw, clean_raw):
+    return {
+        dataset_name(path): clean_raw(sosial_raw[dataset_name(path)], path)
+        for path in SOSIAL_PATHS
+    }
+
+@pytest.fixture(scope="session")
+def sosial_cubes(sosial_data):
+    return build_cubes(sosial_data)
@@ -0,0 +1,262 @@
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+# ===========================
+# KONFIGURASI PROFILER
+# ===========================
+# Jalankan dari root repo:
+#   python benchmarks/render_profile.py                 # HEAD vs working tree
+#   python benchmarks/render_profile.py main HEAD --rounds 5 --report report.md
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Revisi khusus: working tree saat ini (termasuk perubahan yang belum di-commit)
+WORKTREE = "."
+
+APP_TIMEOUT = 300
+
+# Folder yang tidak di-track git tetapi dibutuhkan dashboard; ditautkan dari checkout saat ini
+UNTRACKED_INPUTS = ["data/geo"]
+
+# ===========================
+# SKENARIO INTERAKSI
+# ===========================
+def widget(elements, label):
+    """Cari widget berdasarkan label (dashboard belum memberi key ke semua widget)"""
+    return next(element for element in elements if element.label == label)
+
+def kesehatan_scenario(at):
+    """Toggle filter tahun dan kecamatan di sidebar"""
+    years = list(at.multiselect(key="multiselect_tahun").options)
+    kecamatan = list(at.multiselect(key="multiselect_kecamatan").options)
+    return [
+        ("tahun: lepas 'Pilih Semua'", lambda: at.checkbox(key="checkbox_tahun").uncheck()),
+        ("tahun: 2 terakhir", lambda: at.multiselect(key="multiselect_tahun").set_value(years[-2:])),
+        ("tahun: semua", lambda: at.checkbox(key="checkbox_tahun").check()),
+        ("kecamatan: lepas 'Pilih Semua'", lambda: at.checkbox(key="checkbox_kecamatan").uncheck()),
+        ("kecamatan: 5 pertama", lambda: at.multiselect(key="multiselect_kecamatan").set_value(kecamatan[:5])),
+        ("kecamatan: semua", lambda: at.checkbox(key="checkbox_kecamatan").check()),
+    ]
+
+def pendidikan_scenario(at):
+    """Ganti jenjang satu per satu lalu kembali ke jenjang awal"""
+    jenjang = widget(at.selectbox, "Pilih Jenjang")
+    options = list(jenjang.options)
+    steps = [
+        (f"jenjang: {option}", lambda option=option: widget(at.selectbox, "Pilih Jenjang").set_value(option))
+        for option in options[1:]
+    ]
+    steps.append((f"jenjang: {options[0]}", lambda: widget(at.selectbox, "Pilih Jenjang").set_value(options[0])))
+    return steps
+
+def sosial_scenario(at):
+    """Klik chip tahun satu per satu, lalu kembali ke 'Semua Tahun'"""
+    year_keys = sorted(button.key for button in at.button if button.key and button.key.startswith("year_"))
+    steps = [
+        (f"chip {key.split('_')[1]}", lambda key=key: at.button(key=key).click())
+        for key in year_keys[:2]
+    ]
+    steps.append(("chip Semua Tahun", lambda: at.button(key="all_years_main").click()))
+    return steps
+
+def profil_kecamatan_scenario(at):
+    """Ganti kecamatan beberapa kali lalu kembali ke kecamatan awal"""
+    options = list(at.selectbox(key="profil_kecamatan").options)
+    steps = [
+        (f"kecamatan: {option}", lambda option=option: at.selectbox(key="profil_kecamatan").set_value(option))
+        for option in options[1:4]
+    ]
+    steps.append((f"kecamatan: {options[0]}", lambda: at.selectbox(key="profil_kecamatan").set_value(options[0])))
+    return steps
+
+# Halaman -> fungsi yang menyusun langkah interaksi dari hasil render awal
+SCENARIOS = {
+    "dashboard_kesehatan.py": kesehatan_scenario,
+    "dashboard_pendidikan.py": pendidikan_scenario,
+    "dashboard_sosial.py": sosial_scenario,
+    "dashboard_profil_kecamatan.py": profil_kecamatan_scenario,
+}
+
+INITIAL_STEP = "render awal"
+
+# ===========================
+# PENGUKURAN (DI DALAM SATU REVISI)
+# ===========================
+def delta_bytes(node):
+    """Total ukuran protobuf semua elemen hasil satu rerun (perkiraan delta yang dikirim ke browser)"""
+    size = 0
+    proto = getattr(node, "proto", None)
+    if proto is not None and hasattr(proto, "ByteSize"):
+        size += proto.ByteSize()
+    children = getattr(node, "children", None)
+    if isinstance(children, dict):
+        size += sum(delta_bytes(child) for child in children.values())
+    return size
+
+def run_step(at, action, traced):
+    """Jalankan satu interaksi + rerun; return (ms, kenaikan memori puncak byte, delta byte)"""
+    if traced:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    if action is not None:
+        action()
+    at.run()
+    wall_ms = (time.perf_counter() - started) * 1000
+    peak = tracemalloc.get_traced_memory()[1] - baseline if traced else None
+    return wall_ms, peak, delta_bytes(at._tree)
+
+def run_scenario(page, traced=False):
+    """Satu sesi baru: render awal lalu semua langkah skenario; return {langkah: hasil}"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.abspath(page), default_timeout=APP_TIMEOUT)
+    results = {}
+    steps = [(INITIAL_STEP, None)]
+    while steps:
+        label, action = steps.pop(0)
+        results[label] = run_step(at, action, traced)
+        if at.exception:
+            raise RuntimeError(f"{label}: {at.exception[0].value}")
+        if label == INITIAL_STEP:
+            steps = SCENARIOS[page](at)
+    return results
+
+def measure(rounds):
+    """Ukur semua halaman di direktori kerja saat ini (root repo satu revisi)"""
+    warnings.filterwarnings("ignore")
+    report = {}
+    for page in SCENARIOS:
+        if not os.path.exists(page):
+            continue
+        try:
+            # Pemanasan: import, ingest cache kolumnar, dan cache Streamlit
+            run_scenario(page)
+            timings = [run_scenario(page) for _ in range(rounds)]
+            # Satu putaran terpisah dengan tracemalloc (memperlambat, jadi tidak dipakai untuk waktu)
+            tracemalloc.start()
+            try:
+                traced = run_scenario(page, traced=True)
+            finally:
+                tracemalloc.stop()
+        except Exception as e:
+            report[page] = {"error": str(e)}
+            continue
+
+        report[page] = {
+            step: {
+                "wall_ms": statistics.median(timing[step][0] for timing in timings),
+                "peak_mb": traced[step][1] / 2**20,
+                "delta_kb": traced[step][2] / 1024,
+            }
+            for step in traced
+        }
+    return report
+
+# ===========================
+# REVISI GIT
+# ===========================
+def git(*args, cwd=ROOT_DIR):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+def checkout(rev, target):
+    """Worktree terpisah untuk revisi `rev` di `target`; `.` berarti working tree saat ini"""
+    if rev == WORKTREE:
+        return ROOT_DIR
+    git("worktree", "add", "--detach", target, rev)
+    for relative in UNTRACKED_INPUTS:
+        source = os.path.join(ROOT_DIR, relative)
+        if os.path.exists(source) and not os.path.exists(os.path.join(target, relative)):
+            os.makedirs(os.path.dirname(os.path.join(target, relative)), exist_ok=True)
+            os.symlink(source, os.path.join(target, relative))
+    return target
+
+def profile_revision(rev, rounds, workdir, name):
+    """Ukur satu revisi di proses terpisah agar modul core/ tiap revisi tidak tercampur"""
+    repo_dir = checkout(rev, os.path.join(workdir, name))
+    out_path = os.path.join(workdir, f"{name}.json")
+    try:
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--measure", out_path, "--rounds", str(rounds)],
+            cwd=repo_dir, check=True,
+        )
+        with open(out_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    finally:
+        if repo_dir != ROOT_DIR:
+            git("worktree", "remove", "--force", repo_dir)
+
+# ===========================
+# LAPORAN
+# ===========================
+def format_change(base, head):
+    if base is None or head is None or base == 0:
+        return "-"
+    return f"{(head - base) / base * 100:+.1f}%"
+
+def format_value(value, digits):
+    return "-" if value is None else f"{value:,.{digits}f}"
+
+def comparison_report(base_rev, head_rev, base, head):
+    """Tabel markdown base vs head per (halaman, interaksi)"""
+    lines = [
+        f"# Render cost: `{base_rev}` vs `{head_rev}`",
+        "",
+        "| Halaman | Interaksi | Waktu base (ms) | Waktu head (ms) | Δ waktu | Kenaikan memori puncak base/head (MB) | Delta base/head (KB) |",
+        "|---|---|---:|---:|---:|---:|---:|",
+    ]
+    for page in SCENARIOS:
+        base_page, head_page = base.get(page, {}), head.get(page, {})
+        for side, data in (("base", base_page), ("head", head_page)):
+            if "error" in data:
+                lines.append(f"| {page} | gagal di {side}: {data['error']} | | | | | |")
+        steps = [step for step in head_page if step != "error"]
+        steps += [step for step in base_page if step != "error" and step not in steps]
+        for step in steps:
+            old, new = base_page.get(step, {}), head_page.get(step, {})
+            lines.append(
+                f"| {page} | {step} "
+                f"| {format_value(old.get('wall_ms'), 0)} | {format_value(new.get('wall_ms'), 0)} "
+                f"| {format_change(old.get('wall_ms'), new.get('wall_ms'))} "
+                f"| {format_value(old.get('peak_mb'), 1)} / {format_value(new.get('peak_mb'), 1)} "
+                f"| {format_value(old.get('delta_kb'), 1)} / {format_value(new.get('delta_kb'), 1)} |"
+            )
+    return "\n".join(lines) + "\n"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profil biaya render dashboard (Streamlit AppTest) antara dua revisi git")
+    parser.add_argument("base", nargs="?", default="HEAD", help="revisi pembanding (default HEAD)")
+    parser.add_argument("head", nargs="?", default=WORKTREE, help="revisi yang diuji; '.' = working tree (default)")
+    parser.add_argument("--rounds", type=int, default=3, help="jumlah putaran per halaman; waktu diambil mediannya (default 3)")
+    parser.add_argument("--report", help="simpan laporan markdown ke file ini")
+    parser.add_argument("--measure", metavar="OUT_JSON", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        # Mode internal: dipanggil profile_revision dengan cwd = root revisi yang diukur
+        sys.path.insert(0, os.getcwd())
+        with open(args.measure, "w", encoding="utf-8") as f:
+            json.dump(measure(args.rounds), f)
+        sys.exit(0)
+
+    workdir = tempfile.mkdtemp(prefix="render_profile_")
+    try:
+        base = profile_revision(args.base, args.rounds, workdir, "base")
+        head = profile_revision(args.head, args.rounds, workdir, "head")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+        git("worktree", "prune")
+
+    report = comparison_report(args.base, args.head, base, head)
+    print(report)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(report)
@@ -0,0 +1,202 @@
+import time
+
+# Titik nol first paint: sedini mungkin, sebelum import apa pun selain `time`
+PROCESS_STARTED = time.perf_counter()
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from render_profile import APP_TIMEOUT, ROOT_DIR, WORKTREE, checkout, git
+
+# ===========================
+# KONFIGURASI PROFILER STARTUP
+# ===========================
+# Jalankan dari root repo:
+#   python benchmarks/startup_profile.py                 # HEAD vs working tree
+#   python benchmarks/startup_profile.py main HEAD --rounds 5 --report startup.md
+#
+# Tiap putaran = proses Python baru dengan `-X importtime` yang merender satu halaman sekali (AppTest).
+# First paint = waktu dari awal proses sampai rerun pertama selesai (import + load data + render awal).
+PAGES = [
+    "home.py", "dashboard_kesehatan.py", "dashboard_pendidikan.py", "dashboard_sosial.py",
+    "dashboard_profil_kecamatan.py",
+]
+
+# Modul berat yang dicatat apakah ikut dimuat sampai first paint
+HEAVY_MODULES = [
+    "pandas", "pyarrow", "plotly.express", "folium", "streamlit_folium",
+    "matplotlib", "seaborn", "statsmodels",
+]
+
+# Jumlah paket top-level terlambat yang ditampilkan per halaman
+TOP_IMPORTS = 8
+
+# ===========================
+# PENGUKURAN (DI DALAM SATU PROSES)
+# ===========================
+def first_paint(page):
+    """Render awal satu halaman; return hasil ukur sebagai dict (dipanggil di proses -X importtime)"""
+    import warnings
+
+    from streamlit.testing.v1 import AppTest
+
+    warnings.filterwarnings("ignore")
+    at = AppTest.from_file(os.path.abspath(page), default_timeout=APP_TIMEOUT).run()
+    return {
+        "first_paint_ms": (time.perf_counter() - PROCESS_STARTED) * 1000,
+        "error": str(at.exception[0].value) if at.exception else None,
+        "heavy_loaded": [name for name in HEAVY_MODULES if name in sys.modules],
+    }
+
+def parse_importtime(stderr):
+    """Baris `import time: self | cumulative | nama` -> {paket top-level: ms kumulatif}"""
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Hanya import tingkat teratas; anak-anaknya sudah termasuk di angka kumulatif induknya
+        if name.startswith("  "):
+            continue
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(cumulative) / 1000
+    return packages
+
+def measure_page(page):
+    """Satu proses baru untuk satu halaman; return dict hasil ukur + waktu import per paket"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.abspath(__file__), "--first-paint", page],
+        capture_output=True, text=True, timeout=APP_TIMEOUT,
+    )
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "gagal"}
+    measured = json.loads(result.stdout.strip().splitlines()[-1])
+    measured["imports"] = parse_importtime(result.stderr)
+    return measured
+
+def measure(rounds):
+    """Ukur semua halaman di direktori kerja saat ini (root repo satu revisi)"""
+    report = {}
+    for page in PAGES:
+        if not os.path.exists(page):
+            continue
+        # Pemanasan: cache kolumnar data/ dan bytecode .pyc, agar yang diukur hanya cold start proses
+        measure_page(page)
+        runs = [measure_page(page) for _ in range(rounds)]
+        failed = next((run for run in runs if run.get("error")), None)
+        if failed is not None:
+            report[page] = {"error": failed["error"]}
+            continue
+
+        packages = {package for run in runs for package in run["imports"]}
+        report[page] = {
+            "first_paint_ms": statistics.median(run["first_paint_ms"] for run in runs),
+            "import_ms": statistics.median(sum(run["imports"].values()) for run in runs),
+            "imports": {
+                package: statistics.median(run["imports"].get(package, 0) for run in runs)
+                for package in packages
+            },
+            "heavy_loaded": runs[-1]["heavy_loaded"],
+        }
+    return report
+
+# ===========================
+# REVISI GIT
+# ===========================
+def profile_revision(rev, rounds, workdir, name):
+    """Ukur satu revisi dengan cwd = root revisi tersebut"""
+    repo_dir = checkout(rev, os.path.join(workdir, name))
+    out_path = os.path.join(workdir, f"{name}.json")
+    try:
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--measure", out_path, "--rounds", str(rounds)],
+            cwd=repo_dir, check=True,
+        )
+        with open(out_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    finally:
+        if repo_dir != ROOT_DIR:
+            git("worktree", "remove", "--force", repo_dir)
+
+# ===========================
+# LAPORAN
+# ===========================
+def format_change(base, head):
+    if base is None or head is None or base == 0:
+        return "-"
+    return f"{(head - base) / base * 100:+.1f}%"
+
+def format_value(value):
+    return "-" if value is None else f"{value:,.0f}"
+
+def comparison_report(base_rev, head_rev, base, head):
+    """Tabel markdown first paint base vs head per halaman + paket terlambat di head"""
+    lines = [
+        f"# Cold start: `{base_rev}` vs `{head_rev}`",
+        "",
+        "| Halaman | First paint base (ms) | First paint head (ms) | Δ | Import base/head (ms) | Modul berat di head |",
+        "|---|---:|---:|---:|---:|---|",
+    ]
+    for page in PAGES:
+        old, new = base.get(page, {}), head.get(page, {})
+        for side, data in (("base", old), ("head", new)):
+            if "error" in data:
+                lines.append(f"| {page} | gagal di {side}: {data['error']} | | | | |")
+        lines.append(
+            f"| {page} "
+            f"| {format_value(old.get('first_paint_ms'))} | {format_value(new.get('first_paint_ms'))} "
+            f"| {format_change(old.get('first_paint_ms'), new.get('first_paint_ms'))} "
+            f"| {format_value(old.get('import_ms'))} / {format_value(new.get('import_ms'))} "
+            f"| {', '.join(new.get('heavy_loaded', [])) or '-'} |"
+        )
+
+    lines += ["", f"## Import terlambat di `{head_rev}` (ms kumulatif, median)", ""]
+    for page in PAGES:
+        imports = head.get(page, {}).get("imports")
+        if not imports:
+            continue
+        slowest = sorted(imports.items(), key=lambda item: item[1], reverse=True)[:TOP_IMPORTS]
+        lines.append(f"- **{page}**: " + ", ".join(f"{package} {ms:,.0f}" for package, ms in slowest))
+    return "\n".join(lines) + "\n"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profil cold start dashboard (python -X importtime + first paint) antara dua revisi git")
+    parser.add_argument("base", nargs="?", default="HEAD", help="revisi pembanding (default HEAD)")
+    parser.add_argument("head", nargs="?", default=WORKTREE, help="revisi yang diuji; '.' = working tree (default)")
+    parser.add_argument("--rounds", type=int, default=3, help="jumlah proses per halaman; diambil mediannya (default 3)")
+    parser.add_argument("--report", help="simpan laporan markdown ke file ini")
+    parser.add_argument("--measure", metavar="OUT_JSON", help=argparse.SUPPRESS)
+    parser.add_argument("--first-paint", metavar="PAGE", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.first_paint:
+        # Mode internal: satu proses -X importtime per halaman, cwd = root revisi yang diukur
+        sys.path.insert(0, os.getcwd())
+        print(json.dumps(first_paint(args.first_paint)))
+        sys.exit(0)
+
+    if args.measure:
+        # Mode internal: dipanggil profile_revision dengan cwd = root revisi yang diukur
+        with open(args.measure, "w", encoding="utf-8") as f:
+            json.dump(measure(args.rounds), f)
+        sys.exit(0)
+
+    workdir = tempfile.mkdtemp(prefix="startup_profile_")
+    try:
+        base = profile_revision(args.base, args.rounds, workdir, "base")
+        head = profile_revision(args.head, args.rounds, workdir, "head")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+        git("worktree", "prune")
+
+    report = comparison_report(args.base, args.head, base, head)
+    print(report)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(report)
@@ -0,0 +1,50 @@
+from core.schema import columns
+
+# ===========================
+# KONFIGURASI CUBE AGREGAT
+# ===========================
+# Kolom baris mentah per sel cube, dipakai untuk menghitung rata-rata per baris asal
+ROW_COUNT_COL = "Jumlah_Baris"
+
+# Nama dataset (kunci load_sosial_data) -> (peran dimensi cube, peran ukuran yang dijumlahkan)
+CUBE_ROLES = {
+    "Bantuan Sosial": (["tahun", "kecamatan", "program"], ["penerima"]),
+    "Bencana Alam": (["tahun", "kecamatan"], ["bencana", "kerugian"]),
+    "Jenis Bencana": (["tahun", "jenis"], ["jumlah"]),
+    "Kekerasan Anak": (["tahun", "bulan", "gender"], ["kasus"]),
+    "Bentuk Kekerasan Perempuan": (["tahun", "bulan", "bentuk"], ["kasus"]),
+    "Usia Kekerasan Perempuan": (["tahun", "bulan", "usia"], ["kasus"]),
+    "Peserta Kb": (["tahun", "kecamatan", "kontrasepsi"], ["peserta"]),
+}
+
+# Peran di atas diterjemahkan ke nama kolom lewat core.schema
+CUBE_SPECS = {
+    name: (columns(name, *dims), columns(name, *measures))
+    for name, (dims, measures) in CUBE_ROLES.items()
+}
+
+# ===========================
+# BUILD & QUERY
+# ===========================
+def build_cube(df, dims, measures):
+    """Jumlahkan ukuran per kombinasi dimensi (sekali saat load)"""
+    grouped = df.groupby(dims, sort=True, observed=True)
+    cube = grouped[measures].sum()
+    cube[ROW_COUNT_COL] = grouped.size()
+    return cube
+
+def build_cubes(data):
+    """Bangun cube untuk setiap dataset di CUBE_SPECS yang berhasil dimuat"""
+    cubes = {}
+    for name, (dims, measures) in CUBE_SPECS.items():
+        df = data.get(name)
+        if df is None:
+            continue
+        cubes[name] = build_cube(df, dims, measures)
+    return cubes
+
+def slice_cube(cube, selected_years, by):
+    """Potong cube sesuai pilihan tahun lalu jumlahkan per dimensi `by`"""
+    if "Semua Tahun" not in selected_years:
+        cube = cube[cube.index.get_level_values("Tahun").isin(selected_years)]
+    return cube.groupby(level=list(by), sort=True, observed=True).sum().reset_index()
@@ -0,0 +1,358 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# ===========================
+# MAPPING JENIS BENCANA
+# ===========================
+JENIS_BENCANA_MAPPING = {
+    "Gempa_Bumi": "Gempa Bumi",
+    "Tsunami": "Tsunami",
+    "Banjir": "Banjir",
+    "Tanah_Longsor": "Tanah Longsor",
+    "Letusan_Gunung_Api": "Letusan Gunung Api",
+    "Kekeringan": "Kekeringan",
+    "Gelombang_Ekstrem_dan_Abrasi": "Gelombang Ekstrem dan Abrasi",
+    "Cuaca_Ekstrem_Angin_Puting_Beliung": "Cuaca Ekstrem Angin Puting Beliung",
+    "Kebakaran_Hutan_dan_Lahan": "Kebakaran Hutan dan Lahan",
+    "Kebakaran_Gedung_dan_Pemukiman": "Kebakaran Gedung dan Pemukiman",
+    "Epidemi_dan_Wabah_Penyakit": "Epidemi dan Wabah Penyakit",
+    "Gagal_Teknologi": "Gagal Teknologi",
+    "Konflik_Sosial": "Konflik Sosial",
+    "Angin_Kencang": "Angin Kencang",
+    "Kebakaran": "Kebakaran",
+    "Erupsi_Gunung_Api": "Erupsi Gunung Api",
+    "Pohon_Tumbang": "Pohon Tumbang"
+}
+
+# ===========================
+# KATEGORI KANONIK
+# ===========================
+MONTH_ORDER = [
+    'Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni',
+    'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember'
+]
+
+# Ejaan lain nama kecamatan (kunci kecamatan_key) -> nama kanonik master_kecamatan.
+# Beda spasi, tanda baca, kapitalisasi, dan awalan "Kec." sudah tertangani oleh kecamatan_key.
+KECAMATAN_ALIASES = {
+    "sumbermanjing": "Sumbermanjing Wetan",
+    "sumbermanjingwtn": "Sumbermanjing Wetan",
+    "singhasari": "Singosari",
+}
+
+def normalize_kecamatan(series):
+    """Samakan penulisan nama kecamatan (spasi & kapitalisasi)"""
+    return series.str.strip().str.title()
+
+def kecamatan_key(name):
+    """Kunci ejaan nama kecamatan: huruf kecil tanpa awalan "Kec."/"Kecamatan", spasi, dan tanda baca"""
+    key = re.sub(r"[^a-z0-9]", "", str(name).lower())
+    return re.sub(r"^kec(amatan)?", "", key)
+
+def canonical_kecamatan(series, names=None):
+    """Petakan setiap ejaan nama kecamatan ke nama kanonik di `names`; ejaan tak dikenal hanya dinormalisasi"""
+    normalized = normalize_kecamatan(series)
+    by_key = {kecamatan_key(name): name for name in (names if names is not None else [])}
+    # Cukup sekali per ejaan unik, bukan per baris
+    mapping = {}
+    for value in normalized.dropna().unique():
+        key = kecamatan_key(value)
+        mapping[value] = by_key.get(key) or KECAMATAN_ALIASES.get(key, value)
+    return normalized.map(mapping)
+
+def to_categorical(series, categories=None):
+    """Encode kolom teks sebagai Categorical; nilai di luar urutan kanonik ditambahkan di akhir (terurut)"""
+    observed = series.dropna().unique()
+    if categories is None:
+        ordered_categories = sorted(observed)
+    else:
+        known = set(categories)
+        ordered_categories = list(categories) + sorted(value for value in observed if value not in known)
+    return pd.Series(
+        pd.Categorical(series, categories=ordered_categories),
+        index=series.index,
+        name=series.name
+    )
+
+# ===========================
+# NUMBER PARSING
+# ===========================
+def convert_indonesian_number(value):
+    """Convert Indonesian number format to integer"""
+    if pd.isna(value) or value == '':
+        return 0
+
+    str_value = str(value).strip()
+
+    try:
+        if str_value.isdigit():
+            return int(str_value)
+
+        if '.' in str_value and ',' not in str_value:
+            parts = str_value.split('.')
+            if len(parts) >= 2 and all(part.isdigit() for part in parts):
+                if len(parts[0]) <= 3 and all(len(part) == 3 for part in parts[1:]):
+                    clean_number = str_value.replace('.', '')
+                    return int(clean_number)
+
+        return int(float(str_value))
+
+    except (ValueError, TypeError):
+        return 0
+
+# Pola yang ditangani langsung oleh parser vektor; sisanya jatuh ke convert_indonesian_number
+THOUSANDS_PATTERN = r'^[0-9]{1,3}(?:\.[0-9]{3}){1,5}$'
+FLOAT_PATTERN = r'^[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]{1,3})?$'
+SPECIAL_FLOAT_PATTERN = r'^[+-]?(?:inf|infinity|nan)$'
+INT64_LIMIT = 2.0 ** 63
+
+def convert_indonesian_number_series(series):
+    """Versi vektor dari convert_indonesian_number untuk satu kolom"""
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return series.fillna(0).astype('int64')
+
+    result = np.zeros(len(series), dtype='int64')
+
+    # Index posisi supaya setiap tahap bisa menulis langsung ke result
+    values = series.reset_index(drop=True)
+    text = values[values.notna()].astype(str).str.strip()
+
+    # Angka bulat biasa: "1234" (lebih dari 18 digit diproses lewat fallback)
+    all_digits = text.str.match(r'^[0-9]+$').to_numpy(dtype=bool)
+    is_int = all_digits & (text.str.len().to_numpy() <= 18)
+    result[text.index[is_int]] = text[is_int].astype('int64').to_numpy()
+    long_digits = text.index[all_digits & ~is_int]
+    text = text[~all_digits]
+
+    # Format ribuan Indonesia: "1.234.567"
+    is_thousands = text.str.match(THOUSANDS_PATTERN).to_numpy(dtype=bool)
+    result[text.index[is_thousands]] = text[is_thousands].str.replace('.', '', regex=False).astype('int64').to_numpy()
+    text = text[~is_thousands]
+
+    # Desimal biasa: "12.5", "-3", "1e3" -> dipotong ke arah nol seperti int(float(x))
+    is_float = np.array(text.str.match(FLOAT_PATTERN), dtype=bool)
+    float_values = text[is_float].astype('float64').to_numpy()
+    in_range = np.isfinite(float_values) & (np.abs(float_values) < INT64_LIMIT)
+    result[text.index[is_float][in_range]] = np.trunc(float_values[in_range]).astype('int64')
+    is_float[np.flatnonzero(is_float)[~in_range]] = False
+    text = text[~is_float]
+
+    # Teks ASCII tanpa digit sama sekali ("", "-", "abc") bernilai 0
+    no_digit = ~text.str.contains(r'[0-9]|[^\x00-\x7f]').to_numpy(dtype=bool)
+    special = text.str.lower().str.match(SPECIAL_FLOAT_PATTERN).to_numpy(dtype=bool)
+    pending = long_digits.append(text.index[~(no_digit & ~special)])
+
+    # Sisa nilai yang tidak umum diproses satu per satu agar hasil tetap identik
+    if len(pending):
+        leftovers = values[pending].map(convert_indonesian_number)
+        if leftovers.map(lambda x: abs(x) >= INT64_LIMIT).any():
+            result = result.astype(object)
+        result[pending] = leftovers.to_numpy()
+
+    return pd.Series(result, index=series.index, name=series.name)
+
+def extract_rupiah_value(value):
+    """Extract numeric value from Indonesian Rupiah format"""
+    if pd.isna(value) or value == '':
+        return 0
+
+    str_val = str(value).strip()
+
+    if str_val.lower() in ['rp0', '0', 'rp 0']:
+        return 0
+
+    str_val = str_val.replace('Rp', '').replace('rp', '').strip()
+
+    try:
+        if '.' in str_val and ',' not in str_val:
+            parts = str_val.split('.')
+            if len(parts) >= 2:
+                if len(parts[0]) <= 3 and all(len(part) == 3 for part in parts[1:]) and all(part.isdigit() for part in parts):
+                    clean_number = str_val.replace('.', '')
+                    return int(clean_number)
+
+        if ',' in str_val:
+            str_val = str_val.replace(',', '.')
+
+        return int(float(str_val))
+
+    except (ValueError, TypeError):
+        digits_only = ''.join(filter(str.isdigit, str_val))
+        if digits_only:
+            return int(digits_only)
+        return 0
+
+def extract_rupiah_value_series(series):
+    """Versi vektor dari extract_rupiah_value untuk satu kolom"""
+    result = np.zeros(len(series), dtype='int64')
+
+    values = series.reset_index(drop=True)
+    text = values[values.notna()].astype(str)
+
+    # Teks non-ASCII langsung ke fallback agar aturan isdigit() Python tetap berlaku
+    non_ascii = text.index[text.str.contains(r'[^\x00-\x7f]').to_numpy(dtype=bool)]
+    text = text[~text.index.isin(non_ascii)]
+    text = text.str.strip().str.replace('Rp', '', regex=False).str.replace('rp', '', regex=False).str.strip()
+
+    # Angka bulat tanpa pemisah: "0", "2500000". Versi skalar melewati float(), jadi hanya angka
+    # sampai 15 digit (pasti presisi di float64) yang boleh langsung jadi int; sisanya lewat fallback
+    all_digits = text.str.match(r'^[0-9]+$').to_numpy(dtype=bool)
+    is_int = all_digits & (text.str.len().to_numpy() <= 15)
+    result[text.index[is_int]] = text[is_int].astype('int64').to_numpy()
+    long_digits = text.index[all_digits & ~is_int]
+    text = text[~all_digits]
+
+    # Format ribuan Indonesia: "6.000.000"
+    is_thousands = text.str.match(THOUSANDS_PATTERN).to_numpy(dtype=bool)
+    result[text.index[is_thousands]] = text[is_thousands].str.replace('.', '', regex=False).astype('int64').to_numpy()
+    text = text[~is_thousands]
+
+    # Desimal dengan koma atau titik: "2,5", "12.5" -> dipotong ke arah nol
+    text = text.str.replace(',', '.', regex=False)
+    is_float = np.array(text.str.match(FLOAT_PATTERN), dtype=bool)
+    float_values = text[is_float].astype('float64').to_numpy()
+    in_range = np.isfinite(float_values) & (np.abs(float_values) < INT64_LIMIT)
+    result[text.index[is_float][in_range]] = np.trunc(float_values[in_range]).astype('int64')
+    is_float[np.flatnonzero(is_float)[~in_range]] = False
+    text = text[~is_float]
+
+    # Teks tanpa digit ("", "-", "Rp") bernilai 0
+    no_digit = ~text.str.contains(r'[0-9]').to_numpy(dtype=bool)
+    special = text.str.lower().str.match(SPECIAL_FLOAT_PATTERN).to_numpy(dtype=bool)
+    pending = non_ascii.append(long_digits).append(text.index[~(no_digit & ~special)])
+
+    # Sisa nilai yang tidak umum diproses satu per satu agar hasil tetap identik
+    if len(pending):
+        leftovers = values[pending].map(extract_rupiah_value)
+        if leftovers.map(lambda x: abs(x) >= INT64_LIMIT).any():
+            result = result.astype(object)
+        result[pending] = leftovers.to_numpy()
+
+    return pd.Series(result, index=series.index, name=series.name)
+
+def clean_numeric_columns(df, exclude_columns=None):
+    """Clean numeric columns but exclude specified columns"""
+    if exclude_columns is None:
+        exclude_columns = []
+
+    df_clean = df.copy()
+    numeric_patterns = ['jumlah', 'total', 'count', 'peserta', 'penerima', 'kasus', 'bencana']
+
+    for col in df_clean.columns:
+        if col in exclude_columns:
+            continue
+
+        if 'kerugian' in col.lower():
+            continue
+
+        col_lower = col.lower().strip()
+        if any(pattern in col_lower for pattern in numeric_patterns):
+            df_clean[col] = convert_indonesian_number_series(df_clean[col])
+        elif df_clean[col].dtype == 'object':
+            sample_vals = df_clean[col].dropna().head(5)
+            if len(sample_vals) > 0:
+                numeric_count = 0
+                for val in sample_vals:
+                    str_val = str(val).strip()
+                    if str_val.isdigit() or ('.' in str_val and len(str_val.replace('.', '').replace(' ', '')) > 0):
+                        try:
+                            convert_indonesian_number(val)
+                            numeric_count += 1
+                        except:
+                            pass
+
+                if numeric_count / len(sample_vals) > 0.6:
+                    df_clean[col] = convert_indonesian_number_series(df_clean[col])
+
+    return df_clean
+
+# ===========================
+# CLEANERS PER DATASET
+# ===========================
+def clean_kesehatan_stunting(df):
+    """Bersihkan data stunting (kolom Prevalensi Stunting)"""
+    df['Prevalensi Stunting Persen'] = df['Prevalensi Stunting'].str.replace('%', '').str.replace(' ', '').str.replace('%%', '').astype(float)
+    return df
+
+def clean_pendidikan(df):
+    """Bersihkan data pendidikan: rename kolom dan konversi numerik"""
+    column_mapping = {
+        'Tahun': 'tahun',
+        'Jenjang': 'jenjang',
+        'Kecamatan': 'kecamatan',
+        'APK (%)': 'apk',
+        'APM (%)': 'apm',
+        'Persentase Guru S1': 'persentase_guru_s1',
+        'Persentase Sekolah Terakreditasi': 'persentase_sekolah_akreditasi',
+        'Jumlah Siswa': 'jumlah_siswa',
+        'Jumlah Sekolah': 'jumlah_sekolah',
+        'Jumlah Penduduk Usia Sekolah': 'jumlah_penduduk_usia_sekolah'
+    }
+    df = df.rename(columns=column_mapping)
+
+    # Konversi kolom yang relevan ke tipe data numerik
+    numeric_cols = [
+        'apk', 'apm', 'persentase_guru_s1', 'persentase_sekolah_akreditasi',
+        'jumlah_siswa', 'jumlah_sekolah', 'jumlah_penduduk_usia_sekolah'
+    ]
+    for col in numeric_cols:
+        if col in df.columns:
+            if df[col].dtype == 'object':
+                df[col] = df[col].str.replace(',', '.', regex=False)
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    # Hapus baris dengan data kosong pada kolom-kolom inti
+    core_cols = ['apk', 'apm', 'persentase_guru_s1', 'persentase_sekolah_akreditasi']
+    df.dropna(subset=core_cols, inplace=True)
+    return df
+
+def clean_sosial(df):
+    """Bersihkan data sosial umum"""
+    df.columns = df.columns.str.strip()
+    return clean_numeric_columns(df)
+
+def clean_kb_performance(df):
+    """Bersihkan data performa KB dan tambahkan pertumbuhan numerik (Growth_Rate, dalam persen)"""
+    df_clean = clean_sosial(df)
+    if 'Growth_2024_vs_2023' in df_clean.columns:
+        growth = (
+            df_clean['Growth_2024_vs_2023'].astype(str)
+            .str.replace('%', '', regex=False)
+            .str.replace(',', '.', regex=False)
+            .str.strip()
+        )
+        df_clean['Growth_Rate'] = pd.to_numeric(growth, errors='coerce')
+    return df_clean
+
+def clean_jenis_bencana(df):
+    """Bersihkan data jenis bencana dan tambahkan nama tampilan"""
+    df.columns = df.columns.str.strip()
+    try:
+        df_clean = clean_numeric_columns(df, exclude_columns=['Jenis_Bencana'])
+
+        if 'Jenis_Bencana' in df_clean.columns:
+            df_clean['Jenis_Bencana'] = df_clean['Jenis_Bencana'].astype(str)
+            df_clean['Jenis_Bencana_Nama'] = df_clean['Jenis_Bencana'].map(JENIS_BENCANA_MAPPING)
+
+            mask = df_clean['Jenis_Bencana_Nama'].isna()
+            if mask.any():
+                df_clean.loc[mask, 'Jenis_Bencana_Nama'] = (
+                    df_clean.loc[mask, 'Jenis_Bencana']
+                    .str.replace('_', ' ')
+                    .str.title()
+                )
+
+    except Exception as e:
+        df_clean = clean_numeric_columns(df, exclude_columns=['Jenis_Bencana'])
+    return df_clean
+
+def clean_bencana_alam(df):
+    """Bersihkan data bencana alam dan konversi kolom kerugian"""
+    df.columns = df.columns.str.strip()
+    df_clean = clean_numeric_columns(df)
+    for col in df_clean.columns:
+        if 'kerugian' in col.lower():
+            df_clean[col + '_Numeric'] = extract_rupiah_value_series(df_clean[col])
+    return df_clean
@@ -0,0 +1,310 @@
+import contextlib
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from core import cleaning
+
+# ===========================
+# KONFIGURASI DATA STORE
+# ===========================
+# Path dataset di kode selalu berawalan "data/"; folder fisiknya bisa diganti lewat env
+# DASHBOARD_DATA_DIR (mis. data sintetis dari `python -m core.synthetic`)
+DEFAULT_DATA_DIR = "data"
+DATA_DIR = os.environ.get("DASHBOARD_DATA_DIR", DEFAULT_DATA_DIR)
+CACHE_DIR = os.path.join(DATA_DIR, ".cache")
+MANIFEST_PATH = os.path.join(CACHE_DIR, "manifest.json")
+MANIFEST_LOCK_PATH = MANIFEST_PATH + ".lock"
+
+# Semua CSV di bawah data/ beserta fungsi pembersihnya
+DATASETS = {
+    "data/kesehatan/kesehatan_stunting.csv": cleaning.clean_kesehatan_stunting,
+    "data/pendidikan/pendidikan_paud_sd_smp.csv": cleaning.clean_pendidikan,
+    "data/sosial/bantuan_sosial.csv": cleaning.clean_sosial,
+    "data/sosial/bencana_alam.csv": cleaning.clean_bencana_alam,
+    "data/sosial/bentuk_kekerasan_perempuan.csv": cleaning.clean_sosial,
+    "data/sosial/data_kb_performance.csv": cleaning.clean_kb_performance,
+    "data/sosial/data_kb_tren_metode.csv": cleaning.clean_sosial,
+    "data/sosial/jenis_bencana.csv": cleaning.clean_jenis_bencana,
+    "data/sosial/kekerasan_anak.csv": cleaning.clean_sosial,
+    "data/sosial/master_kecamatan.csv": cleaning.clean_sosial,
+    "data/sosial/master_tahun.csv": cleaning.clean_sosial,
+    "data/sosial/peserta_kb.csv": cleaning.clean_sosial,
+    "data/sosial/usia_kekerasan_perempuan.csv": cleaning.clean_sosial,
+}
+
+# Kolom teks yang di-encode sebagai Categorical saat load: kolom -> urutan kategori
+# ("kecamatan" = urutan master_kecamatan, "bulan" = urutan bulan, None = urut abjad)
+KECAMATAN_MASTER = "data/sosial/master_kecamatan.csv"
+CATEGORICAL_COLUMNS = {
+    "data/kesehatan/kesehatan_stunting.csv": {"Kecamatan": "kecamatan", "Bulan": "bulan"},
+    "data/pendidikan/pendidikan_paud_sd_smp.csv": {"kecamatan": "kecamatan", "jenjang": None},
+    "data/sosial/bantuan_sosial.csv": {"Kecamatan": "kecamatan", "Program_Type": None},
+    "data/sosial/bencana_alam.csv": {"Kecamatan": "kecamatan"},
+    "data/sosial/bentuk_kekerasan_perempuan.csv": {"Bulan": "bulan", "Bentuk_Kekerasan": None},
+    "data/sosial/data_kb_performance.csv": {"Kecamatan": "kecamatan"},
+    "data/sosial/jenis_bencana.csv": {"Jenis_Bencana_Nama": None},
+    "data/sosial/kekerasan_anak.csv": {"Bulan": "bulan", "Gender": None},
+    "data/sosial/master_kecamatan.csv": {"Kecamatan_Name": "kecamatan"},
+    "data/sosial/peserta_kb.csv": {"Kecamatan": "kecamatan", "Jenis_Kontrasepsi": None},
+    "data/sosial/usia_kekerasan_perempuan.csv": {"Bulan": "bulan", "Kelompok_Usia": None},
+}
+
+# ===========================
+# FINGERPRINT & MANIFEST
+# ===========================
+def file_sha256(path, size=None):
+    """Hitung hash SHA-256 isi file (atau hanya `size` byte pertamanya)"""
+    digest = hashlib.sha256()
+    remaining = size
+    with open(path, 'rb') as f:
+        while remaining is None or remaining > 0:
+            chunk = f.read(1 << 20 if remaining is None else min(1 << 20, remaining))
+            if not chunk:
+                break
+            digest.update(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+    return digest.hexdigest()
+
+def cleaner_version():
+    """Hash kode pembersih, agar cache ikut basi bila logika pembersihan berubah"""
+    return file_sha256(cleaning.__file__)
+
+def code_version():
+    """Hash semua modul core (pembersih, encoder, schema, cube, builder sektor), agar cache turunan dashboard ikut basi bila kodenya berubah"""
+    core_dir = os.path.dirname(os.path.abspath(__file__))
+    modules = sorted(name for name in os.listdir(core_dir) if name.endswith(".py"))
+    parts = [f"{name}:{file_sha256(os.path.join(core_dir, name))}" for name in modules]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+def load_manifest():
+    """Baca manifest cache (kosong jika belum ada atau rusak)"""
+    try:
+        with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def write_atomic(target, write, mode='wb'):
+    """Tulis lewat file sementara unik di folder target lalu os.replace, agar penulis bersamaan tidak bertabrakan"""
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp = tempfile.NamedTemporaryFile(mode, dir=os.path.dirname(target), suffix=".tmp", delete=False)
+    try:
+        with tmp:
+            write(tmp)
+        os.replace(tmp.name, target)
+    except BaseException:
+        if os.path.exists(tmp.name):
+            os.remove(tmp.name)
+        raise
+
+def save_manifest(manifest):
+    """Tulis manifest secara atomik (panggil di dalam manifest_lock)"""
+    write_atomic(MANIFEST_PATH, lambda f: json.dump(manifest, f, indent=2, sort_keys=True), mode='w')
+
+# Kedalaman kunci manifest per thread, agar manifest_lock bisa dipanggil bersarang
+_lock_state = threading.local()
+
+@contextlib.contextmanager
+def manifest_lock():
+    """Kunci file antar sesi/proses untuk read-modify-write manifest dan ingest cache"""
+    if getattr(_lock_state, "depth", 0):
+        _lock_state.depth += 1
+        try:
+            yield
+        finally:
+            _lock_state.depth -= 1
+        return
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(MANIFEST_LOCK_PATH, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        _lock_state.depth = 1
+        try:
+            yield
+        finally:
+            _lock_state.depth = 0
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def source_file(source_path):
+    """Lokasi fisik CSV untuk path dataset, mengikuti DATA_DIR"""
+    return os.path.join(DATA_DIR, os.path.relpath(source_path, DEFAULT_DATA_DIR))
+
+def cache_path(source_path):
+    """Lokasi file Arrow IPC untuk sebuah CSV sumber"""
+    rel_path = os.path.relpath(source_path, DEFAULT_DATA_DIR)
+    name = os.path.splitext(rel_path)[0].replace(os.sep, "__")
+    return os.path.join(CACHE_DIR, name + ".arrow")
+
+def is_fresh(source_path, entry, version):
+    """Cek apakah entry manifest masih sesuai dengan file sumber (mtime lalu hash)"""
+    if not entry or entry.get("cleaner") != version:
+        return False
+    if not os.path.exists(entry.get("cache", "")):
+        return False
+
+    stat = os.stat(source_path)
+    if entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+        return True
+
+    # mtime berubah: bandingkan isi file, bukan sekadar timestamp
+    if entry.get("sha256") == file_sha256(source_path):
+        entry["mtime_ns"] = stat.st_mtime_ns
+        entry["size"] = stat.st_size
+        return True
+    return False
+
+# ===========================
+# INGEST
+# ===========================
+def ingest_file(source_path, manifest, version, force=False):
+    """Bersihkan satu CSV dan tulis ke cache kolumnar; return True jika ditulis ulang"""
+    csv_path = source_file(source_path)
+    entry = manifest.get(source_path)
+    if not force and is_fresh(csv_path, entry, version):
+        return False
+
+    cleaner = DATASETS[source_path]
+    df = cleaner(pd.read_csv(csv_path))
+
+    target = cache_path(source_path)
+    # Tanpa kompresi supaya file bisa di-memory-map langsung
+    table = pa.Table.from_pandas(df)
+    write_atomic(target, lambda f: feather.write_feather(table, f, compression="uncompressed"))
+
+    stat = os.stat(csv_path)
+    manifest[source_path] = {
+        "cache": target,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": file_sha256(csv_path),
+        "cleaner": version,
+        "rows": len(df),
+    }
+    return True
+
+def ingest(force=False):
+    """Bangun cache kolumnar untuk semua CSV di DATASETS, lalu tabel fakta kecamatan x tahun dan indeks periode kesehatan"""
+    version = cleaner_version()
+    rebuilt = []
+    with manifest_lock():
+        manifest = load_manifest()
+        for source_path in DATASETS:
+            if not os.path.exists(source_file(source_path)):
+                continue
+            if ingest_file(source_path, manifest, version, force=force):
+                rebuilt.append(source_path)
+        save_manifest(manifest)
+
+    # Import lokal: core.kecamatan dan core.kesehatan sendiri bergantung pada modul ini
+    from core import kecamatan, kesehatan
+    if os.path.exists(source_file(KECAMATAN_MASTER)) and kecamatan.ingest_fact_table(force=force):
+        rebuilt.append(kecamatan.FACT_TABLE_KEY)
+    if os.path.exists(source_file(kesehatan.PERIOD_INDEX_SOURCE)) and kesehatan.ingest_period_index(force=force):
+        rebuilt.append(kesehatan.PERIOD_INDEX_KEY)
+    return rebuilt
+
+def read_cached(source_path):
+    """Baca hasil ingest sebuah CSV dari cache kolumnar (ingest dulu jika basi)"""
+    if source_path not in DATASETS:
+        raise KeyError(f"Dataset tidak terdaftar: {source_path}")
+    csv_path = source_file(source_path)
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(csv_path)
+
+    with manifest_lock():
+        manifest = load_manifest()
+        entry_before = dict(manifest.get(source_path) or {})
+        ingest_file(source_path, manifest, cleaner_version())
+        if manifest[source_path] != entry_before:
+            save_manifest(manifest)
+
+    table = feather.read_table(manifest[source_path]["cache"], memory_map=True)
+    return table.to_pandas()
+
+def dataset_fingerprint(*source_paths):
+    """Sidik jari isi dataset (hash CSV, master kecamatan, semua kode core) untuk kunci cache dashboard"""
+    version = cleaner_version()
+    parts = [code_version()]
+
+    paths = list(source_paths)
+    # Urutan kategori kecamatan ikut menentukan hasil load_dataset
+    if KECAMATAN_MASTER not in paths and any("kecamatan" in CATEGORICAL_COLUMNS.get(path, {}).values() for path in paths):
+        paths.append(KECAMATAN_MASTER)
+
+    with manifest_lock():
+        manifest = load_manifest()
+        changed = False
+        for source_path in paths:
+            if not os.path.exists(source_file(source_path)):
+                parts.append(f"{source_path}:missing")
+                continue
+            entry_before = dict(manifest.get(source_path) or {})
+            ingest_file(source_path, manifest, version)
+            changed = changed or manifest[source_path] != entry_before
+            parts.append(f"{source_path}:{manifest[source_path]['sha256']}")
+        if changed:
+            save_manifest(manifest)
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+# ===========================
+# KATEGORI
+# ===========================
+def kecamatan_order():
+    """Nama kecamatan kanonik sesuai urutan Kecamatan_ID di master_kecamatan"""
+    if not os.path.exists(source_file(KECAMATAN_MASTER)):
+        return None
+    master = read_cached(KECAMATAN_MASTER).sort_values("Kecamatan_ID")
+    return cleaning.normalize_kecamatan(master["Kecamatan_Name"]).tolist()
+
+def encode_categoricals(df, source_path):
+    """Ubah kolom di CATEGORICAL_COLUMNS menjadi Categorical dengan urutan kanonik"""
+    spec = CATEGORICAL_COLUMNS.get(source_path, {})
+    for col, order in spec.items():
+        if col not in df.columns:
+            continue
+        if order == "kecamatan":
+            order = kecamatan_order()
+            df[col] = cleaning.to_categorical(cleaning.canonical_kecamatan(df[col], order), order)
+        elif order == "bulan":
+            df[col] = cleaning.to_categorical(df[col], cleaning.MONTH_ORDER)
+        else:
+            df[col] = cleaning.to_categorical(df[col])
+    return df
+
+def load_dataset(source_path):
+    """Ambil dataset yang sudah dibersihkan dari cache, dengan kolom kategori ter-encode"""
+    return encode_categoricals(read_cached(source_path), source_path)
+
+if __name__ == "__main__":
+    rebuilt = ingest(force="--force" in sys.argv)
+    print(f"{len(rebuilt)} dataset ditulis ulang ke {CACHE_DIR}")
+    for path in rebuilt:
+        print(f"  - {path}")
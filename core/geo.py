@@ -0,0 +1,218 @@
+import functools
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from core import datastore
+
+# ===========================
+# KONFIGURASI GEOMETRI
+# ===========================
+GEOJSON_PATH = "data/geo/35.07_kecamatan.geojson"
+FEATURE_ID_KEY = "properties.nm_kecamatan"
+FEATURE_NAME_PROPERTY = FEATURE_ID_KEY.split(".", 1)[1]
+
+# Zoom awal peta choropleth di dashboard
+MAP_ZOOM = 8
+
+# (zoom maksimum, toleransi Douglas-Peucker dalam derajat); di atas zoom terakhir dipakai geometri asli.
+# Satu piksel di zoom 8 kira-kira 0.005 derajat, jadi toleransi di bawah itu tidak terlihat di layar.
+# Level dihitung saat pertama kali diminta, jadi saat ini hanya level untuk MAP_ZOOM yang pernah dibangun.
+ZOOM_TOLERANCES = (
+    (7, 0.005),
+    (9, 0.001),
+    (11, 0.0003),
+)
+
+# Presisi koordinat (5 desimal ~ 1 meter)
+COORD_DECIMALS = 5
+
+# Folder static Streamlit (server.enableStaticServing) dan URL publiknya.
+# Plotly.js mengambil GeoJSON dari URL sekali lalu menyimpannya di browser (window.PlotlyGeoAssets),
+# sehingga rerun berikutnya hanya mengirim nilai indikator.
+STATIC_DIR = "static"
+STATIC_URL = "app/static"
+STATIC_GEO_SUBDIR = "geo"
+
+# ===========================
+# DOUGLAS-PEUCKER
+# ===========================
+def simplify_line(points, tolerance):
+    """Sederhanakan satu garis (array N x 2) dengan algoritma Douglas-Peucker"""
+    n = len(points)
+    if n < 3 or tolerance <= 0:
+        return points
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+
+        a = points[start]
+        segment = points[end] - a
+        inner = points[start + 1:end] - a
+        length = np.hypot(segment[0], segment[1])
+        if length == 0:
+            # Ring tertutup: titik awal = titik akhir, pakai jarak ke titik tersebut
+            dist = np.hypot(inner[:, 0], inner[:, 1])
+        else:
+            dist = np.abs(segment[0] * inner[:, 1] - segment[1] * inner[:, 0]) / length
+
+        farthest = int(np.argmax(dist))
+        if dist[farthest] > tolerance:
+            split = start + 1 + farthest
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+
+    return points[keep]
+
+# ===========================
+# TOPOLOGI (ARC BERSAMA)
+# ===========================
+def open_ring(ring):
+    """Ring sebagai tuple titik terbulatkan, tanpa titik penutup dan tanpa titik berurutan yang sama"""
+    points = []
+    for point in ring:
+        point = (round(point[0], COORD_DECIMALS), round(point[1], COORD_DECIMALS))
+        if not points or points[-1] != point:
+            points.append(point)
+    if len(points) > 1 and points[0] == points[-1]:
+        points.pop()
+    return points
+
+def find_junctions(rings):
+    """Titik tempat batas bersama bercabang: pasangan tetangganya berbeda di ring lain (atau di ring yang sama)"""
+    neighbours = {}
+    junctions = set()
+    for ring in rings:
+        for i, point in enumerate(ring):
+            pair = frozenset((ring[i - 1], ring[(i + 1) % len(ring)]))
+            if neighbours.setdefault(point, pair) != pair:
+                junctions.add(point)
+    return junctions
+
+def split_ring(ring, junctions):
+    """Potong ring tertutup menjadi arc antar-junction (tuple titik, ujung arc = junction)"""
+    if len(ring) < 3:
+        return [tuple(ring + ring[:1])]
+    cuts = [i for i, point in enumerate(ring) if point in junctions]
+    if not cuts:
+        # Ring tanpa junction (pulau, atau lubang yang sama persis dengan polygon lain): mulai dari titik terkecil
+        # agar ring yang sama di feature lain menghasilkan arc yang sama
+        cuts = [ring.index(min(ring))]
+    start = cuts[0]
+    rotated = ring[start:] + ring[:start] + [ring[start]]
+    offsets = [i - start for i in cuts] + [len(ring)]
+    return [tuple(rotated[a:b + 1]) for a, b in zip(offsets, offsets[1:])]
+
+def arc_key(arc):
+    """Kunci arc yang sama untuk kedua arah penelusuran (ring tetangga menelusuri batas bersama terbalik)"""
+    return min(arc, arc[::-1])
+
+def assemble_ring(arcs, simplified):
+    """Gabungkan arc hasil penyederhanaan kembali menjadi ring GeoJSON tertutup"""
+    ring = []
+    for arc in arcs:
+        key = arc_key(arc)
+        points = simplified[key] if key == arc else simplified[key][::-1]
+        ring.extend(points if not ring else points[1:])
+    return [list(point) for point in ring]
+
+def polygons_of(geometry):
+    """Daftar polygon (daftar ring) dari Polygon / MultiPolygon; geometri lain -> None"""
+    if geometry is None:
+        return None
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry["type"] == "MultiPolygon":
+        return geometry["coordinates"]
+    return None
+
+def simplify_geojson(geojson, tolerance):
+    """Salinan FeatureCollection yang disederhanakan per arc: batas bersama dua kecamatan
+    disederhanakan sekali, sehingga kedua sisinya identik (tanpa celah atau tumpang tindih)"""
+    shapes = [polygons_of(feature.get("geometry")) for feature in geojson["features"]]
+    rings = [open_ring(ring) for polygons in shapes if polygons for polygon in polygons for ring in polygon]
+    junctions = find_junctions(rings)
+    ring_arcs = [split_ring(ring, junctions) for ring in rings]
+
+    simplified = {}
+    for arcs in ring_arcs:
+        for arc in arcs:
+            key = arc_key(arc)
+            if key not in simplified:
+                simplified[key] = [tuple(point) for point in simplify_line(np.asarray(key), tolerance).tolist()]
+
+    # Ring yang kolaps (< 4 titik) memakai arc aslinya, begitu juga ring tetangga yang berbagi arc tersebut
+    for arcs in ring_arcs:
+        if len(assemble_ring(arcs, simplified)) < 4:
+            for arc in arcs:
+                simplified[arc_key(arc)] = list(arc_key(arc))
+
+    new_rings = iter([assemble_ring(arcs, simplified) for arcs in ring_arcs])
+    features = []
+    for feature, polygons in zip(geojson["features"], shapes):
+        geometry = feature.get("geometry")
+        if polygons is not None:
+            coordinates = [[next(new_rings) for _ in polygon] for polygon in polygons]
+            geometry = {
+                "type": geometry["type"],
+                "coordinates": coordinates[0] if geometry["type"] == "Polygon" else coordinates,
+            }
+        features.append({**feature, "geometry": geometry})
+    return {**geojson, "features": features}
+
+# ===========================
+# GEOMETRY SERVICE
+# ===========================
+def tolerance_for_zoom(zoom):
+    """Pilih toleransi penyederhanaan yang sesuai untuk level zoom"""
+    for max_zoom, tolerance in ZOOM_TOLERANCES:
+        if zoom <= max_zoom:
+            return tolerance
+    return 0.0
+
+@functools.lru_cache(maxsize=4)
+def _load_source(path, mtime_ns):
+    """Baca GeoJSON asli sekali per versi file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+@functools.lru_cache(maxsize=8)
+def _load_level(path, mtime_ns, tolerance):
+    """Satu level penyederhanaan; hanya level untuk zoom yang benar-benar diminta yang dihitung"""
+    geojson = _load_source(path, mtime_ns)
+    return simplify_geojson(geojson, tolerance) if tolerance > 0 else geojson
+
+def get_geojson(zoom=MAP_ZOOM, path=GEOJSON_PATH):
+    """GeoJSON kecamatan untuk zoom tertentu (dimuat sekali per proses, jangan diubah)"""
+    return _load_level(path, os.stat(path).st_mtime_ns, tolerance_for_zoom(zoom))
+
+def feature_names(path=GEOJSON_PATH):
+    """Nama kecamatan tiap feature sesuai urutannya (posisi = indeks geometri, sama di semua level zoom)"""
+    geojson = _load_source(path, os.stat(path).st_mtime_ns)
+    return [feature.get("properties", {}).get(FEATURE_NAME_PROPERTY) for feature in geojson["features"]]
+
+@functools.lru_cache(maxsize=4)
+def _export_level(path, mtime_ns, tolerance, static_dir):
+    """Tulis satu level GeoJSON ke folder static; nama file memuat hash isi agar cache browser ikut berganti"""
+    payload = json.dumps(_load_level(path, mtime_ns, tolerance), separators=(",", ":")).encode("utf-8")
+    digest = hashlib.sha1(payload).hexdigest()[:12]
+    file_name = f"kecamatan_{digest}.json"
+
+    target = os.path.join(static_dir, STATIC_GEO_SUBDIR, file_name)
+    if not os.path.exists(target):
+        datastore.write_atomic(target, lambda f: f.write(payload))
+    return f"{STATIC_URL}/{STATIC_GEO_SUBDIR}/{file_name}"
+
+def get_geojson_source(zoom=MAP_ZOOM, static_serving=False, path=GEOJSON_PATH, static_dir=STATIC_DIR):
+    """URL GeoJSON statis bila static serving aktif, selain itu dict GeoJSON yang disematkan di figure"""
+    if not static_serving:
+        return get_geojson(zoom, path)
+    return _export_level(path, os.stat(path).st_mtime_ns, tolerance_for_zoom(zoom), static_dir)
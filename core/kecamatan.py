@@ -0,0 +1,227 @@
+import hashlib
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from core import datastore, geo
+from core.cleaning import canonical_kecamatan, normalize_kecamatan
+from core.kesehatan import get_month_mapping, period_key
+
+# ===========================
+# KONFIGURASI DIMENSI KECAMATAN
+# ===========================
+# Titik tengah (lat, lon) kecamatan untuk marker peta
+KECAMATAN_COORDS = {
+    'Dau': [-7.9167, 112.5833],
+    'Pujon': [-7.8667, 112.4833],
+    'Ngantang': [-7.7667, 112.4333],
+    'Kasembon': [-7.8167, 112.3833],
+    'Singosari': [-7.8833, 112.6667],
+    'Lawang': [-7.8333, 112.6833],
+    'Pakisaji': [-8.0667, 112.6167],
+    'Tajinan': [-8.1500, 112.5833],
+    'Tumpang': [-8.0167, 112.7333],
+    'Pakis': [-7.9333, 112.7167],
+    'Jabung': [-8.0833, 112.7833],
+    'Wajak': [-8.1167, 112.7333],
+    'Dampit': [-8.2167, 112.7500],
+    'Tirtoyudo': [-8.3333, 112.6833],
+    'Ampelgading': [-8.2833, 112.6167],
+    'Poncokusumo': [-8.0500, 112.7833],
+    'Wagir': [-8.0333, 112.5500],
+    'Karangploso': [-7.9167, 112.6000],
+    'Gondanglegi': [-8.1500, 112.6833],
+    'Kepanjen': [-8.1333, 112.5833],
+    'Sumberpucung': [-8.1000, 112.4833],
+    'Sumbermanjing Wetan': [-8.3500, 112.5833],
+    'Donomulyo': [-8.4000, 112.5000],
+    'Pagak': [-8.3667, 112.4500],
+    'Bantur': [-8.3167, 112.5167],
+    'Turen': [-8.1667, 112.6000],
+    'Kalipare': [-8.2000, 112.5500],
+    'Bululawang': [-8.0833, 112.6000],
+    'Ngajum': [-8.1167, 112.5167],
+    'Gedangan': [-8.0667, 112.7667],
+    'Kromengan': [-8.1833, 112.5667],
+    'Wonosari': [-8.2833, 112.5167],
+    'Pagelaran': [-8.3167, 112.4833]
+}
+
+# Kecamatan_ID untuk ejaan yang tidak ada di master, dan Geo_Index untuk kecamatan tanpa geometri
+UNKNOWN_ID = -1
+
+# ===========================
+# TABEL DIMENSI
+# ===========================
+def build_dimension(master, feature_names=None):
+    """Dimensi kecamatan: index Kecamatan_ID (int) -> nama kanonik, region, centroid, indeks feature GeoJSON"""
+    master = master.sort_values("Kecamatan_ID")
+    names = normalize_kecamatan(master["Kecamatan_Name"].astype(str))
+
+    dimension = pd.DataFrame(
+        {"Kecamatan": names.to_numpy(), "Region": master["Region"].astype(str).to_numpy()},
+        index=pd.Index(master["Kecamatan_ID"].to_numpy(dtype="int16"), name="Kecamatan_ID"),
+    )
+    dimension["Lat"] = dimension["Kecamatan"].map({name: lat for name, (lat, _) in KECAMATAN_COORDS.items()}).astype(float)
+    dimension["Lon"] = dimension["Kecamatan"].map({name: lon for name, (_, lon) in KECAMATAN_COORDS.items()}).astype(float)
+
+    # Ejaan nama di GeoJSON bisa berbeda dengan master; posisi feature = indeks geometri
+    geo_index = {}
+    if feature_names:
+        geo_names = canonical_kecamatan(pd.Series(feature_names, dtype=object), dimension["Kecamatan"])
+        for position, name in enumerate(geo_names):
+            geo_index.setdefault(name, position)
+    dimension["Geo_Index"] = dimension["Kecamatan"].map(geo_index).fillna(UNKNOWN_ID).astype("int32")
+    return dimension
+
+def load_dimension(geojson_path=geo.GEOJSON_PATH):
+    """Dimensi kecamatan dari master_kecamatan, plus indeks geometri bila GeoJSON tersedia"""
+    master = datastore.read_cached(datastore.KECAMATAN_MASTER)
+    feature_names = geo.feature_names(geojson_path) if os.path.exists(geojson_path) else None
+    return build_dimension(master, feature_names)
+
+def dimension_fingerprint(geojson_path=geo.GEOJSON_PATH):
+    """Sidik jari dimensi kecamatan: isi master_kecamatan, kode core, dan versi (mtime) file GeoJSON"""
+    geojson_version = os.stat(geojson_path).st_mtime_ns if os.path.exists(geojson_path) else "missing"
+    parts = [datastore.dataset_fingerprint(datastore.KECAMATAN_MASTER), f"{geojson_path}:{geojson_version}"]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+# ===========================
+# KUNCI INTEGER
+# ===========================
+def kecamatan_ids(series, dimension):
+    """Kecamatan_ID (int16) untuk kolom nama kecamatan; ejaan yang tidak dikenal -> UNKNOWN_ID"""
+    categorical = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype("category")
+    categories = pd.Series(categorical.cat.categories.astype(str), dtype=object)
+
+    # Cukup petakan kategori unik (±33 nama), lalu ambil per baris lewat kode kategori
+    lookup = pd.Series(dimension.index, index=dimension["Kecamatan"])
+    category_ids = canonical_kecamatan(categories, dimension["Kecamatan"]).map(lookup).fillna(UNKNOWN_ID)
+    # Kode -1 (NaN) mengambil elemen terakhir, yaitu UNKNOWN_ID
+    ids = np.append(category_ids.to_numpy(dtype="int16"), np.int16(UNKNOWN_ID))[categorical.cat.codes.to_numpy()]
+    return pd.Series(ids, index=series.index, name="Kecamatan_ID")
+
+# ===========================
+# TABEL FAKTA KECAMATAN x TAHUN
+# ===========================
+# Indikator pendidikan per jenjang yang dijadikan kolom (APK_PAUD, APM_SD, ...)
+PENDIDIKAN_JENJANG_MEASURES = {"apk": "APK", "apm": "APM"}
+
+# Kunci entry tabel fakta di manifest cache kolumnar (di samping entry per CSV)
+FACT_TABLE_KEY = "derived/fakta_kecamatan_tahun"
+
+def _fact_keys(df, dimension, kecamatan_col, tahun_col):
+    """Kunci integer (Kecamatan_ID, Tahun) per baris"""
+    return [kecamatan_ids(df[kecamatan_col], dimension), df[tahun_col].astype("int16").rename("Tahun")]
+
+def kesehatan_facts(df, dimension):
+    """Stunting pada periode pengukuran terakhir tiap tahun; prevalensi = stunting / diukur (tertimbang)"""
+    # Bulan di luar MONTH_ORDER (ejaan lain, NaN) tidak punya periode, sama seperti build_period_index
+    period = period_key(df["Tahun"], df["Bulan"].astype(str).map(get_month_mapping()))
+    known = period.notna()
+    df, period = df[known], period[known]
+    keys = _fact_keys(df, dimension, "Kecamatan", "Tahun")
+    latest = period == period.groupby(keys).transform("max")
+
+    facts = df[latest].groupby([key[latest] for key in keys]).agg(
+        Stunting=("Stunting", "sum"),
+        Jumlah_Diukur=("Jumlah Yang Diukur", "sum"),
+        # Kolom fasilitas per kecamatan berulang di setiap unit kerja
+        Jumlah_Puskesmas=("Jumlah Puskesmas", "max"),
+    )
+    facts.insert(2, "Prevalensi_Stunting", (facts["Stunting"] / facts["Jumlah_Diukur"] * 100).where(facts["Jumlah_Diukur"] > 0))
+    return facts
+
+def pendidikan_facts(df, dimension):
+    """APK/APM per jenjang sebagai kolom, plus jumlah sekolah semua jenjang"""
+    keys = _fact_keys(df, dimension, "kecamatan", "tahun")
+    per_jenjang = df.groupby(keys + [df["jenjang"]], observed=True)[list(PENDIDIKAN_JENJANG_MEASURES)].mean().unstack("jenjang")
+    per_jenjang.columns = [f"{PENDIDIKAN_JENJANG_MEASURES[measure]}_{jenjang}" for measure, jenjang in per_jenjang.columns]
+    sekolah = df.groupby(keys)["jumlah_sekolah"].sum().rename("Jumlah_Sekolah")
+    return per_jenjang.join(sekolah)
+
+def bantuan_sosial_facts(df, dimension):
+    """Total penerima bantuan sosial (semua program)"""
+    return df.groupby(_fact_keys(df, dimension, "Kecamatan", "Tahun"))["Jumlah_Penerima"].sum().to_frame("Total_Penerima")
+
+def bencana_facts(df, dimension):
+    """Jumlah kejadian bencana dan kerugiannya"""
+    return df.groupby(_fact_keys(df, dimension, "Kecamatan", "Tahun")).agg(
+        Total_Bencana=("Jumlah_Bencana", "sum"),
+        Kerugian_Rupiah=("Kerugian_Rupiah_Numeric", "sum"),
+    )
+
+def peserta_kb_facts(df, dimension):
+    """Total peserta KB (semua jenis kontrasepsi)"""
+    return df.groupby(_fact_keys(df, dimension, "Kecamatan", "Tahun"))["Jumlah_Peserta"].sum().to_frame("Total_Peserta_KB")
+
+# Dataset sumber -> fungsi yang meringkasnya ke grain (Kecamatan_ID, Tahun)
+FACT_SOURCES = {
+    "data/kesehatan/kesehatan_stunting.csv": kesehatan_facts,
+    "data/pendidikan/pendidikan_paud_sd_smp.csv": pendidikan_facts,
+    "data/sosial/bantuan_sosial.csv": bantuan_sosial_facts,
+    "data/sosial/bencana_alam.csv": bencana_facts,
+    "data/sosial/peserta_kb.csv": peserta_kb_facts,
+}
+
+def build_fact_table(datasets, dimension):
+    """Gabungkan semua sektor ke satu tabel: index (Kecamatan_ID, Tahun) terurut, satu kolom per indikator"""
+    parts = [builder(datasets[path], dimension) for path, builder in FACT_SOURCES.items() if path in datasets]
+    facts = pd.concat(parts, axis=1, join="outer").sort_index()
+    facts.index = facts.index.set_names(["Kecamatan_ID", "Tahun"])
+    return facts[facts.index.get_level_values("Kecamatan_ID") != UNKNOWN_ID]
+
+def slice_profile(facts, kecamatan_id):
+    """Semua tahun dan indikator satu kecamatan (satu slice index terurut, tanpa memindai data baris)"""
+    try:
+        return facts.xs(kecamatan_id, level="Kecamatan_ID")
+    except KeyError:
+        return facts.iloc[0:0].droplevel("Kecamatan_ID")
+
+# ===========================
+# CACHE TABEL FAKTA
+# ===========================
+def fact_table_path():
+    """Lokasi file Arrow IPC tabel fakta di cache kolumnar"""
+    return os.path.join(datastore.CACHE_DIR, "fakta_kecamatan_tahun.arrow")
+
+def fact_table_fingerprint():
+    """Sidik jari tabel fakta: isi semua dataset sumber (termasuk master kecamatan) dan kode core, termasuk builder ini"""
+    return datastore.dataset_fingerprint(*FACT_SOURCES)
+
+def ingest_fact_table(force=False):
+    """Bangun ulang tabel fakta di cache bila sumber/kode berubah; return True jika ditulis ulang"""
+    fingerprint = fact_table_fingerprint()
+    target = fact_table_path()
+    # Satu penulis sekaligus: sesi lain menunggu lalu melihat entry yang sudah segar
+    with datastore.manifest_lock():
+        entry = datastore.load_manifest().get(FACT_TABLE_KEY) or {}
+        if not force and entry.get("fingerprint") == fingerprint and os.path.exists(target):
+            return False
+
+        datasets = {
+            path: datastore.load_dataset(path)
+            for path in FACT_SOURCES
+            if os.path.exists(datastore.source_file(path))
+        }
+        table = pa.Table.from_pandas(build_fact_table(datasets, load_dimension()))
+        datastore.write_atomic(target, lambda f: feather.write_feather(table, f, compression="uncompressed"))
+
+        # Baca ulang manifest: load_dataset di atas bisa saja memperbarui entry CSV
+        manifest = datastore.load_manifest()
+        manifest[FACT_TABLE_KEY] = {"cache": target, "fingerprint": fingerprint, "rows": table.num_rows}
+        datastore.save_manifest(manifest)
+    return True
+
+def load_fact_table():
+    """Tabel fakta (Kecamatan_ID, Tahun) dari cache kolumnar (ingest dulu jika basi)"""
+    ingest_fact_table()
+    return feather.read_table(fact_table_path(), memory_map=True).to_pandas()
+
+if __name__ == "__main__":
+    rebuilt = ingest_fact_table(force="--force" in sys.argv)
+    print(f"Tabel fakta {'ditulis ulang' if rebuilt else 'masih segar'}: {fact_table_path()}")
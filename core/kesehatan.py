@@ -0,0 +1,324 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from core import datastore
+from core.cleaning import MONTH_ORDER
+
+# ===========================
+# PERIODE & FASILITAS KESEHATAN
+# ===========================
+# Fungsi murni (tanpa Streamlit) yang dipakai dashboard_kesehatan dan benchmark
+def get_latest_period(df_to_check):
+    """Mencari tahun dan bulan terakhir dari dataframe yang diberikan."""
+    if df_to_check.empty:
+        return None, None
+
+    latest_year = df_to_check['Tahun'].max()
+    latest_year_data = df_to_check[df_to_check['Tahun'] == latest_year]
+    available_months = latest_year_data['Bulan'].unique()
+
+    latest_month = None
+    for month in reversed(MONTH_ORDER):
+        if month in available_months:
+            latest_month = month
+            break
+    
+    return latest_year, latest_month
+
+def get_month_mapping():
+    """Return mapping bulan ke angka untuk sorting"""
+    return {
+        'Januari': 1, 'Februari': 2, 'Maret': 3, 'April': 4, 
+        'Mei': 5, 'Juni': 6, 'Juli': 7, 'Agustus': 8, 
+        'September': 9, 'Oktober': 10, 'November': 11, 'Desember': 12
+    }
+
+def create_sorted_period_data(df):
+    """Buat data periode yang sudah diurutkan dengan benar"""
+    month_mapping = get_month_mapping()
+    bulan = df['Bulan'].astype(str)
+    df['Month_Num'] = bulan.map(month_mapping)
+    df['Periode'] = df['Tahun'].astype(str) + '-' + bulan
+    
+    return df.sort_values(['Tahun', 'Month_Num']).reset_index(drop=True)
+
+# ===========================
+# INDEKS PERIODE (PRA-AGREGASI TREN)
+# ===========================
+# Ukuran aditif per (Kecamatan, Period_Key); rata-rata & simpangan baku diturunkan saat slicing
+PERIOD_MEASURES = ['Prevalensi_Sum', 'Prevalensi_SumSq', 'Prevalensi_Count', 'Stunting', 'Jumlah Yang Diukur']
+
+def period_key(tahun, month_num):
+    """Kunci periode integer yang urut secara kronologis"""
+    return tahun * 12 + (month_num - 1)
+
+def build_period_index(df):
+    """Agregat per (Kecamatan, Period_Key) dari data baris; dibangun sekali saat load"""
+    month_num = df['Bulan'].astype(str).map(get_month_mapping())
+    prevalensi = df['Prevalensi Stunting Persen']
+    rows = pd.DataFrame({
+        'Kecamatan': df['Kecamatan'],
+        'Period_Key': period_key(df['Tahun'], month_num),
+        'Prevalensi_Sum': prevalensi,
+        'Prevalensi_SumSq': prevalensi ** 2,
+        'Prevalensi_Count': prevalensi.notna().astype('int64'),
+        'Stunting': df['Stunting'],
+        'Jumlah Yang Diukur': df['Jumlah Yang Diukur'],
+    }).dropna(subset=['Period_Key'])
+    rows['Period_Key'] = rows['Period_Key'].astype('int64')
+    return rows.groupby(['Kecamatan', 'Period_Key'], observed=True, sort=True)[PERIOD_MEASURES].sum()
+
+def append_period_rows(index, new_rows):
+    """Tambahkan baris baru (mis. satu bulan baru) ke indeks; hanya sel (kecamatan, periode) terdampak yang berubah"""
+    return index.add(build_period_index(new_rows), fill_value=0).astype(index.dtypes.to_dict())
+
+# ===========================
+# CACHE INDEKS PERIODE
+# ===========================
+# Dataset sumber indeks periode dan kunci entry-nya di manifest cache kolumnar
+PERIOD_INDEX_SOURCE = "data/kesehatan/kesehatan_stunting.csv"
+PERIOD_INDEX_KEY = "derived/indeks_periode_kesehatan"
+
+def period_index_path():
+    """Lokasi file Arrow IPC indeks periode di cache kolumnar"""
+    return os.path.join(datastore.CACHE_DIR, "indeks_periode_kesehatan.arrow")
+
+def is_append_only(csv_path, entry):
+    """Cek apakah CSV hanya bertambah baris sejak indeks terakhir (byte lama tidak berubah dan diakhiri newline)"""
+    size = entry.get("source_size", 0)
+    if size <= 0 or os.path.getsize(csv_path) <= size:
+        return False
+    with open(csv_path, 'rb') as f:
+        f.seek(size - 1)
+        if f.read(1) != b"\n":
+            return False
+    return datastore.file_sha256(csv_path, size) == entry.get("source_sha256")
+
+def ingest_period_index(force=False):
+    """Perbarui indeks periode di cache; CSV yang hanya bertambah baris cukup menambahkan baris barunya.
+    Return jumlah baris yang diagregasi (0 = indeks masih segar)"""
+    csv_path = datastore.source_file(PERIOD_INDEX_SOURCE)
+    target = period_index_path()
+    # Encoding kategori kecamatan & kode core ikut menentukan isi indeks
+    base = datastore.dataset_fingerprint(datastore.KECAMATAN_MASTER)
+    with datastore.manifest_lock():
+        entry = datastore.load_manifest().get(PERIOD_INDEX_KEY) or {}
+        df = datastore.load_dataset(PERIOD_INDEX_SOURCE)
+        source = datastore.load_manifest()[PERIOD_INDEX_SOURCE]
+        cached = not force and entry.get("base") == base and os.path.exists(target)
+        if cached and entry.get("source_sha256") == source["sha256"]:
+            return 0
+
+        index = None
+        if cached and is_append_only(csv_path, entry) and len(df) >= entry["rows"]:
+            previous = feather.read_table(target).to_pandas()
+            # Kecamatan baru di luar master mengubah kategori; saat itu indeks dibangun ulang
+            if previous.index.levels[0].categories.equals(df['Kecamatan'].cat.categories):
+                # Hanya baris setelah baris terakhir yang sudah diindeks; sel lain tidak dihitung ulang
+                new_rows = df.iloc[entry["rows"]:]
+                index = append_period_rows(previous, new_rows)
+        if index is None:
+            new_rows = df
+            index = build_period_index(df)
+        table = pa.Table.from_pandas(index)
+        datastore.write_atomic(target, lambda f: feather.write_feather(table, f, compression="uncompressed"))
+
+        manifest = datastore.load_manifest()
+        manifest[PERIOD_INDEX_KEY] = {
+            "cache": target,
+            "base": base,
+            "source_sha256": source["sha256"],
+            "source_size": source["size"],
+            "rows": len(df),
+        }
+        datastore.save_manifest(manifest)
+    return len(new_rows)
+
+def read_period_index():
+    """Indeks periode dari cache kolumnar (diperbarui dulu jika CSV berubah)"""
+    ingest_period_index()
+    return feather.read_table(period_index_path(), memory_map=True).to_pandas()
+
+def period_labels(keys):
+    """Kolom Tahun, Bulan, Periode, Month_Num untuk kunci periode"""
+    keys = pd.Series(keys, dtype='int64')
+    tahun = keys // 12
+    month_num = keys % 12 + 1
+    bulan = (month_num - 1).map(dict(enumerate(MONTH_ORDER)))
+    return pd.DataFrame({
+        'Tahun': tahun,
+        'Bulan': bulan,
+        'Periode': tahun.astype(str) + '-' + bulan,
+        'Month_Num': month_num,
+    })
+
+def slice_period_trend(index, by, years=None, kecamatan=None):
+    """Tren dari indeks periode: `by` = 'Tahun' atau 'Periode'; filter tahun/kecamatan opsional"""
+    keys = index.index.get_level_values('Period_Key')
+    mask = pd.Series(True, index=index.index)
+    if years is not None:
+        mask &= (keys // 12).isin(list(years))
+    if kecamatan is not None:
+        mask &= index.index.get_level_values('Kecamatan').isin(list(kecamatan))
+    selected = index[mask.to_numpy()]
+
+    group_keys = selected.index.get_level_values('Period_Key')
+    if by == 'Tahun':
+        group_keys = group_keys // 12
+    totals = selected.groupby(group_keys, sort=True).sum()
+
+    count = totals['Prevalensi_Count']
+    mean = totals['Prevalensi_Sum'] / count
+    variance = ((totals['Prevalensi_SumSq'] - count * mean ** 2) / (count - 1)).where(count > 1).clip(lower=0)
+    trend = pd.DataFrame({
+        'Prevalensi_Mean': mean.where(count > 0),
+        'Prevalensi_Std': variance ** 0.5,
+        'Total_Stunting': totals['Stunting'],
+        'Total_Diukur': totals['Jumlah Yang Diukur'],
+    }).reset_index(drop=True)
+
+    if by == 'Tahun':
+        labels = pd.DataFrame({'Tahun': totals.index.to_numpy()})
+    else:
+        labels = period_labels(totals.index.to_numpy())
+    return pd.concat([labels, trend], axis=1)
+
+# ===========================
+# INDEKS PERIODE TERAKHIR & SNAPSHOT FASILITAS
+# ===========================
+PREVALENSI_COL = 'Prevalensi Stunting Persen'
+# Kolom yang dihitung per kecamatan (ambil nilai unik)
+FACILITY_COLS_PER_KECAMATAN = ['Jumlah Rumah Sakit', 'Jumlah Puskesmas', 'Jumlah Puskesmas Pembantu']
+# Kolom yang dihitung per unit kerja (dijumlahkan)
+FACILITY_COLS_PER_UNIT = ['Jumlah Klinik', 'Pos Kesehatan', 'Jumlah Pondak Bersalin Desa (Polindes)']
+
+def build_latest_period_index(period_index):
+    """Period_Key terakhir per (Kecamatan, Tahun) dari indeks periode"""
+    keys = period_index.index.to_frame(index=False)
+    keys['Tahun'] = keys['Period_Key'] // 12
+    return keys.groupby(['Kecamatan', 'Tahun'], observed=True, sort=True)['Period_Key'].max()
+
+def lookup_latest_period(latest_index, years, kecamatan):
+    """(tahun, bulan) terakhir untuk subset filter tanpa memindai data baris; setara get_latest_period"""
+    mask = (
+        latest_index.index.get_level_values('Kecamatan').isin(list(kecamatan))
+        & latest_index.index.get_level_values('Tahun').isin(list(years))
+    )
+    if not mask.any():
+        return None, None
+    key = int(latest_index[mask].max())
+    return key // 12, MONTH_ORDER[key % 12]
+
+def build_facilities_index(df):
+    """Fasilitas dan rata-rata prevalensi per (Kecamatan, Period_Key), aturan sama dengan get_latest_facilities_data"""
+    keyed = df.assign(Period_Key=period_key(df['Tahun'], df['Bulan'].astype(str).map(get_month_mapping())))
+    keyed = keyed.dropna(subset=['Period_Key']).astype({'Period_Key': 'int64'})
+    keys = ['Kecamatan', 'Period_Key']
+    per_kecamatan_cols = [col for col in FACILITY_COLS_PER_KECAMATAN if col in df.columns]
+    per_unit_kerja_cols = [col for col in FACILITY_COLS_PER_UNIT if col in df.columns]
+
+    grouped = keyed.groupby(keys, observed=True, sort=True)
+    per_unit = grouped[per_unit_kerja_cols].sum()
+    per_kecamatan = keyed.drop_duplicates(subset=keys).set_index(keys)[per_kecamatan_cols].reindex(per_unit.index)
+    prevalensi = grouped[PREVALENSI_COL].mean()
+    return pd.concat([per_kecamatan, per_unit, prevalensi], axis=1)
+
+def latest_facilities_snapshot(facilities_index, latest_year, latest_month, kecamatan):
+    """(faskes per kecamatan, prevalensi per kecamatan) pada periode terakhir subset filter"""
+    if latest_year is None or latest_month is None:
+        return pd.DataFrame(), pd.DataFrame(columns=['Kecamatan', PREVALENSI_COL])
+
+    key = period_key(latest_year, get_month_mapping()[latest_month])
+    at_key = facilities_index.xs(key, level='Period_Key')
+    at_key = at_key[at_key.index.isin(list(kecamatan))].reset_index()
+    return at_key.drop(columns=[PREVALENSI_COL]), at_key[['Kecamatan', PREVALENSI_COL]]
+
+# ===========================
+# ANALISIS STUNTING VS FASILITAS KESEHATAN
+# ===========================
+TOTAL_FASKES_COL = 'Total Faskes'
+# Kuadran kuantil: fasilitas >= P70 & prevalensi <= P30, dan sebaliknya
+HIGH_FASKES_LOW_PREV_COL = 'Faskes Tinggi Prevalensi Rendah'
+LOW_FASKES_HIGH_PREV_COL = 'Faskes Rendah Prevalensi Tinggi'
+
+# Label metrik grafik side-by-side -> kolom tabel metrik
+FASKES_COMPARISON_METRICS = {
+    'Persentase Stunting (%)': PREVALENSI_COL,
+    'Jumlah Fasilitas Kesehatan': TOTAL_FASKES_COL,
+}
+
+def build_faskes_analysis(prevalensi_df, faskes_df):
+    """Tabel metrik per kecamatan (urut prevalensi tertinggi) dan ringkasannya; ringkasan None jika < 2 kecamatan"""
+    if faskes_df.empty:
+        return pd.DataFrame(), None
+
+    metrics = pd.merge(prevalensi_df, faskes_df, on='Kecamatan', how='inner')
+    facility_cols = [col for col in faskes_df.columns if col != 'Kecamatan']
+    metrics[TOTAL_FASKES_COL] = metrics[facility_cols].sum(axis=1)
+
+    total_faskes = metrics[TOTAL_FASKES_COL]
+    prevalensi = metrics[PREVALENSI_COL]
+    metrics[HIGH_FASKES_LOW_PREV_COL] = (total_faskes >= total_faskes.quantile(0.7)) & (prevalensi <= prevalensi.quantile(0.3))
+    metrics[LOW_FASKES_HIGH_PREV_COL] = (total_faskes <= total_faskes.quantile(0.3)) & (prevalensi >= prevalensi.quantile(0.7))
+
+    summary = None
+    if len(metrics) > 1:
+        best = metrics[metrics[HIGH_FASKES_LOW_PREV_COL]].sort_values(PREVALENSI_COL)
+        challenge = metrics[metrics[LOW_FASKES_HIGH_PREV_COL]].sort_values(PREVALENSI_COL, ascending=False)
+        summary = {
+            'correlation': prevalensi.corr(total_faskes),
+            'best': best.iloc[0] if not best.empty else metrics.nsmallest(1, PREVALENSI_COL).iloc[0],
+            'challenge': challenge.iloc[0] if not challenge.empty else metrics.nlargest(1, PREVALENSI_COL).iloc[0],
+            'avg_faskes': total_faskes.mean(),
+            'high_faskes_low_prev': len(best),
+            'low_faskes_high_prev': len(challenge),
+        }
+    return metrics.sort_values(PREVALENSI_COL, ascending=False), summary
+
+def faskes_comparison_plot_data(metrics):
+    """Data panjang (Kecamatan, Metrik, Nilai) untuk grafik side-by-side, urutan kecamatan mengikuti tabel"""
+    wide = metrics[['Kecamatan', *FASKES_COMPARISON_METRICS.values()]]
+    wide = wide.rename(columns={col: label for label, col in FASKES_COMPARISON_METRICS.items()})
+    wide['Kecamatan'] = wide['Kecamatan'].astype(str)
+    return wide.melt(id_vars='Kecamatan', var_name='Metrik', value_name='Nilai')
+
+def get_latest_facilities_data(data):
+    """Ambil data fasilitas dari periode terakhir"""
+    if data.empty:
+        return pd.DataFrame()
+
+    latest_year = data['Tahun'].max()
+    latest_year_data = data[data['Tahun'] == latest_year]
+    
+    latest_month = None
+    for month in reversed(MONTH_ORDER):
+        if month in latest_year_data['Bulan'].unique():
+            latest_month = month
+            break
+    
+    if not latest_month:
+        return pd.DataFrame()
+
+    latest_period_df = latest_year_data[latest_year_data['Bulan'] == latest_month]
+
+    # Kolom yang dihitung per kecamatan (ambil nilai unik)
+    per_kecamatan_cols = ['Jumlah Rumah Sakit', 'Jumlah Puskesmas', 'Jumlah Puskesmas Pembantu']
+    # Kolom yang dihitung per unit kerja (dijumlahkan)
+    per_unit_kerja_cols = ['Jumlah Klinik', 'Pos Kesehatan', 'Jumlah Pondak Bersalin Desa (Polindes)']
+
+    # Filter kolom yang benar-benar ada di dataframe
+    per_kecamatan_cols = [col for col in per_kecamatan_cols if col in latest_period_df.columns]
+    per_unit_kerja_cols = [col for col in per_unit_kerja_cols if col in latest_period_df.columns]
+
+    # Proses faskes per kecamatan
+    faskes_kec_df = latest_period_df[['Kecamatan'] + per_kecamatan_cols].drop_duplicates(subset=['Kecamatan']).reset_index(drop=True)
+
+    # Proses faskes per unit kerja
+    faskes_unit_df = latest_period_df.groupby('Kecamatan', observed=True)[per_unit_kerja_cols].sum().reset_index()
+
+    # Gabungkan keduanya
+    final_faskes_df = pd.merge(faskes_kec_df, faskes_unit_df, on='Kecamatan', how='outer').fillna(0)
+    return final_faskes_df
@@ -0,0 +1,28 @@
+import importlib
+
+# ===========================
+# KONFIGURASI LAZY IMPORT
+# ===========================
+# Alias -> nama modul berat yang hanya dibutuhkan sebagian halaman/section.
+# Dipakai sebagai atribut modul ini (mis. lazy.folium.Map); import baru terjadi saat atribut pertama kali diakses,
+# jadi halaman atau tab yang tidak memakainya tidak ikut menanggung waktu import-nya.
+LAZY_MODULES = {
+    "folium": "folium",                      # peta marker dashboard sosial
+    "folium_plugins": "folium.plugins",      # FastMarkerCluster
+    "streamlit_folium": "streamlit_folium",  # st_folium (ikut meng-import folium)
+}
+
+# Sengaja tidak memakai importlib.util.LazyLoader: modul proxy di sys.modules akan langsung dimuat oleh
+# file watcher Streamlit, yang memeriksa __file__/__spec__ semua modul setelah setiap rerun.
+
+# ===========================
+# AKSES MODUL
+# ===========================
+def __getattr__(alias):
+    """Import modul berat saat atributnya pertama kali diakses (PEP 562)"""
+    if alias not in LAZY_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {alias!r}")
+    module = importlib.import_module(LAZY_MODULES[alias])
+    # Simpan sebagai atribut biasa agar akses berikutnya tidak lewat __getattr__ lagi
+    globals()[alias] = module
+    return module
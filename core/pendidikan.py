@@ -0,0 +1,27 @@
+# ===========================
+# PARTISI TAHUN x JENJANG
+# ===========================
+# Fungsi murni (tanpa Streamlit) yang dipakai dashboard_pendidikan dan benchmark
+def add_rasio_sekolah_penduduk(df):
+    """Tambah kolom rasio sekolah per 1000 penduduk usia sekolah (NaN jika penduduk 0)"""
+    if 'jumlah_sekolah' in df.columns and 'jumlah_penduduk_usia_sekolah' in df.columns:
+        # Menghindari pembagian dengan nol
+        non_zero_mask = df['jumlah_penduduk_usia_sekolah'] != 0
+        df.loc[non_zero_mask, 'rasio_sekolah_penduduk'] = \
+            (df.loc[non_zero_mask, 'jumlah_sekolah'] / df.loc[non_zero_mask, 'jumlah_penduduk_usia_sekolah']) * 1000
+    return df
+
+def build_partitions(df):
+    """Dict (tahun, jenjang) -> baris data beserta rasio turunan; dibangun sekali saat load"""
+    df = add_rasio_sekolah_penduduk(df.copy())
+    return {
+        (int(tahun), str(jenjang)): partition
+        for (tahun, jenjang), partition in df.groupby(['tahun', 'jenjang'], observed=True, sort=True)
+    }
+
+def build_yearly_means(df):
+    """Dict jenjang -> rata-rata APK dan APM per tahun (grafik perkembangan)"""
+    return {
+        str(jenjang): partition.groupby('tahun')[['apk', 'apm']].mean().reset_index()
+        for jenjang, partition in df.groupby('jenjang', observed=True, sort=True)
+    }
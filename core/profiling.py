@@ -0,0 +1,145 @@
+import contextlib
+import datetime
+import json
+import os
+import sys
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+# ===========================
+# KONFIGURASI PROFILING
+# ===========================
+# Aktif jika env DASHBOARD_PROFILE=1 (semua sesi) atau URL memuat ?profile=1 (satu sesi)
+PROFILE_ENV = "DASHBOARD_PROFILE"
+PROFILE_QUERY_PARAM = "profile"
+TRUTHY = ("1", "true", "yes", "on")
+
+# Satu baris JSON per rerun
+PROFILE_LOG_ENV = "DASHBOARD_PROFILE_LOG"
+DEFAULT_LOG_PATH = os.path.join("logs", "profile.jsonl")
+
+# Tahap yang dipakai dashboard: load, filter, groupby, figure, render (st.plotly_chart / st_folium)
+RUN_STATE_KEY = "_profile_run"
+_log_lock = threading.Lock()
+
+# ===========================
+# PENGUKURAN
+# ===========================
+def is_enabled():
+    """Cek env DASHBOARD_PROFILE atau query param ?profile=1"""
+    if os.environ.get(PROFILE_ENV, "").lower() in TRUTHY:
+        return True
+    return str(st.query_params.get(PROFILE_QUERY_PARAM, "")).lower() in TRUTHY
+
+def start_run(page):
+    """Mulai pengukuran satu rerun (dipanggil di awal script dashboard)"""
+    if not is_enabled():
+        st.session_state.pop(RUN_STATE_KEY, None)
+        return
+    now = time.perf_counter()
+    st.session_state[RUN_STATE_KEY] = {"page": page, "started": now, "mark": now, "depth": 0, "sections": []}
+
+def _record(run, label, kind, started, ended):
+    run["sections"].append({
+        "label": label,
+        "kind": kind,
+        "depth": run["depth"],
+        "ms": round((ended - started) * 1000, 3),
+    })
+
+def lap(label, kind):
+    """Catat waktu sejak titik ukur sebelumnya sebagai (label, kind); untuk script datar tanpa blok"""
+    run = st.session_state.get(RUN_STATE_KEY)
+    if run is None:
+        return
+    now = time.perf_counter()
+    _record(run, label, kind, run["mark"], now)
+    run["mark"] = now
+
+@contextlib.contextmanager
+def section(label, kind):
+    """Ukur satu blok kode sebagai (label, kind); tanpa biaya saat profiling tidak aktif"""
+    run = st.session_state.get(RUN_STATE_KEY)
+    if run is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    run["depth"] += 1
+    try:
+        yield
+    finally:
+        run["depth"] -= 1
+        now = time.perf_counter()
+        _record(run, label, kind, started, now)
+        run["mark"] = now
+
+def finish_run():
+    """Tutup rerun: tampilkan panel di sidebar dan tulis satu baris ke log JSON-lines"""
+    run = st.session_state.pop(RUN_STATE_KEY, None)
+    if run is None:
+        return
+
+    total_ms = round((time.perf_counter() - run["started"]) * 1000, 3)
+    write_log(run, total_ms)
+    render_panel(run, total_ms)
+
+# ===========================
+# OUTPUT
+# ===========================
+def log_path():
+    """Lokasi file log profiling"""
+    return os.environ.get(PROFILE_LOG_ENV, DEFAULT_LOG_PATH)
+
+def write_log(run, total_ms):
+    """Tambahkan satu baris JSON untuk rerun ini"""
+    record = {
+        "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="milliseconds"),
+        "page": run["page"],
+        "total_ms": total_ms,
+        "sections": run["sections"],
+    }
+    path = log_path()
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with _log_lock:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+def render_panel(run, total_ms):
+    """Panel sidebar: bagian paling lambat di rerun ini"""
+    with st.sidebar:
+        with st.expander(f"⏱️ Profiling rerun: {total_ms:,.0f} ms", expanded=True):
+            if not run["sections"]:
+                st.caption("Belum ada bagian yang diukur.")
+                return
+            timings = pd.DataFrame(run["sections"])
+            timings = (
+                timings.groupby(["label", "kind"], sort=False)["ms"].sum()
+                .reset_index()
+                .sort_values("ms", ascending=False)
+            )
+            timings.columns = ["Bagian", "Tahap", "ms"]
+            st.dataframe(timings, hide_index=True, use_container_width=True)
+            st.caption(f"Log: `{log_path()}`")
+
+def summarize_log(path):
+    """Ringkas log profiling: p50/p95/maks per (halaman, bagian, tahap), urut dari p95 terbesar"""
+    rows = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            for item in record["sections"]:
+                rows.append((record["page"], item["label"], item["kind"], item["ms"]))
+
+    timings = pd.DataFrame(rows, columns=["page", "label", "kind", "ms"])
+    summary = timings.groupby(["page", "label", "kind"])["ms"].describe(percentiles=[0.5, 0.95])
+    summary = summary[["count", "50%", "95%", "max"]].rename(columns={"50%": "p50", "95%": "p95"})
+    return summary.sort_values("p95", ascending=False)
+
+if __name__ == "__main__":
+    summary = summarize_log(sys.argv[1] if len(sys.argv) > 1 else log_path())
+    print(summary.round(1).to_string())
@@ -0,0 +1,97 @@
+import pandas as pd
+
+# ===========================
+# REGISTRY PERAN KOLOM
+# ===========================
+class SchemaError(ValueError):
+    """Dataset tidak sesuai dengan schema yang terdaftar"""
+
+# Nama dataset (kunci load_sosial_data) -> peran kolom.
+# "dimensions": kolom pengelompokan (kecamatan, tahun, bulan, kategori)
+# "measures": kolom numerik yang dijumlahkan / dianalisis
+SCHEMAS = {
+    "Bantuan Sosial": {
+        "dimensions": {"kecamatan": "Kecamatan", "tahun": "Tahun", "program": "Program_Type"},
+        "measures": {"penerima": "Jumlah_Penerima"},
+    },
+    "Bencana Alam": {
+        "dimensions": {"kecamatan": "Kecamatan", "tahun": "Tahun"},
+        "measures": {"bencana": "Jumlah_Bencana", "kerugian": "Kerugian_Rupiah_Numeric"},
+    },
+    "Bentuk Kekerasan Perempuan": {
+        "dimensions": {"tahun": "Tahun", "bulan": "Bulan", "bentuk": "Bentuk_Kekerasan"},
+        "measures": {"kasus": "Jumlah_Kasus"},
+    },
+    "Data Kb Performance": {
+        "dimensions": {"kecamatan": "Kecamatan", "level": "Performance_Level", "growth_label": "Growth_2024_vs_2023"},
+        "measures": {"peserta_2023": "2023", "peserta_2024": "2024", "growth": "Growth_Rate"},
+    },
+    "Data Kb Tren Metode": {
+        "dimensions": {"tahun": "Tahun"},
+        "measures": {"total": "Total_Peserta"},
+    },
+    "Jenis Bencana": {
+        "dimensions": {"tahun": "Tahun", "jenis": "Jenis_Bencana_Nama"},
+        "measures": {"jumlah": "Jumlah"},
+    },
+    "Kekerasan Anak": {
+        "dimensions": {"tahun": "Tahun", "bulan": "Bulan", "gender": "Gender"},
+        "measures": {"kasus": "Jumlah_Kasus"},
+    },
+    "Master Kecamatan": {
+        "dimensions": {"kecamatan_id": "Kecamatan_ID", "kecamatan": "Kecamatan_Name", "region": "Region"},
+        "measures": {},
+    },
+    "Master Tahun": {
+        "dimensions": {"tahun": "Tahun"},
+        "measures": {},
+    },
+    "Peserta Kb": {
+        "dimensions": {"kecamatan": "Kecamatan", "tahun": "Tahun", "kontrasepsi": "Jenis_Kontrasepsi"},
+        "measures": {"peserta": "Jumlah_Peserta"},
+    },
+    "Usia Kekerasan Perempuan": {
+        "dimensions": {"tahun": "Tahun", "bulan": "Bulan", "usia": "Kelompok_Usia"},
+        "measures": {"kasus": "Jumlah_Kasus"},
+    },
+}
+
+# ===========================
+# VALIDASI & AKSES
+# ===========================
+def validate_dataset(name, df):
+    """Pastikan semua kolom schema ada dan kolom ukuran bertipe numerik (dipanggil sekali saat load)"""
+    schema = SCHEMAS.get(name)
+    if schema is None:
+        raise SchemaError(f"Dataset '{name}' belum terdaftar di core.schema.SCHEMAS")
+
+    roles = {**schema["dimensions"], **schema["measures"]}
+    missing = {role: col for role, col in roles.items() if col not in df.columns}
+    if missing:
+        raise SchemaError(
+            f"Dataset '{name}' tidak memiliki kolom {sorted(missing.values())} "
+            f"(peran {sorted(missing)}); kolom tersedia: {list(df.columns)}"
+        )
+
+    not_numeric = [col for col in schema["measures"].values() if not pd.api.types.is_numeric_dtype(df[col])]
+    if not_numeric:
+        raise SchemaError(f"Kolom ukuran {not_numeric} pada dataset '{name}' tidak bertipe numerik")
+    return df
+
+def column(name, role):
+    """Nama kolom untuk peran tertentu pada sebuah dataset"""
+    schema = SCHEMAS[name]
+    if role in schema["dimensions"]:
+        return schema["dimensions"][role]
+    if role in schema["measures"]:
+        return schema["measures"][role]
+    raise SchemaError(f"Peran '{role}' tidak terdaftar untuk dataset '{name}'")
+
+def columns(name, *roles):
+    """Nama kolom untuk beberapa peran sekaligus, sesuai urutan argumen"""
+    return [column(name, role) for role in roles]
+
+def has_role(name, role):
+    """Cek apakah dataset punya kolom dengan peran tertentu"""
+    schema = SCHEMAS.get(name, {})
+    return role in schema.get("dimensions", {}) or role in schema.get("measures", {})
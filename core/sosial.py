@@ -0,0 +1,76 @@
+from core.aggregates import slice_cube
+from core.schema import column, columns
+
+# ===========================
+# QUERY CUBE
+# ===========================
+# Fungsi murni (tanpa Streamlit) di atas cube dari core.aggregates.build_cubes;
+# dashboard_sosial membungkusnya dengan st.cache_data, benchmark memanggilnya langsung.
+# Nama kolom selalu lewat core.schema: schema yang tidak cocok memunculkan SchemaError, bukan data kosong.
+def query_cubes(cubes, name, selected_years, by):
+    """Slice cube `name` untuk pilihan tahun; None jika dataset tidak dimuat"""
+    if name not in cubes:
+        return None
+    return slice_cube(cubes[name], selected_years, by)
+
+# ===========================
+# KPI CALCULATION
+# ===========================
+# Kunci KPI -> (dataset, peran dimensi slice, peran ukuran yang dijumlahkan)
+KPI_SPECS = {
+    'total_penerima_bantuan': ('Bantuan Sosial', 'tahun', 'penerima'),
+    'total_bencana': ('Jenis Bencana', 'jenis', 'jumlah'),
+    'kekerasan_anak': ('Kekerasan Anak', 'tahun', 'kasus'),
+    'kekerasan_perempuan': ('Bentuk Kekerasan Perempuan', 'tahun', 'kasus'),
+    'peserta_kb': ('Peserta Kb', 'kontrasepsi', 'peserta'),
+}
+
+def calculate_kpis(cubes, selected_years):
+    """Calculate KPI values"""
+    kpis = {}
+    # Total per dataset diambil dari slice cube yang sama dengan chart-nya
+    for key, (name, by_role, measure_role) in KPI_SPECS.items():
+        sliced = query_cubes(cubes, name, selected_years, (column(name, by_role),))
+        if sliced is not None:
+            kpis[key] = int(sliced[column(name, measure_role)].sum())
+    return kpis
+
+# ===========================
+# MAP DATA PREPARATION FUNCTIONS - DIPERBAIKI
+# ===========================
+def kecamatan_totals(cubes, name, selected_years, measure_role, label):
+    """Total satu ukuran per kecamatan sebagai kolom (Kecamatan, label); None jika dataset tidak dimuat"""
+    kecamatan_col, measure_col = columns(name, 'kecamatan', measure_role)
+    map_data = query_cubes(cubes, name, selected_years, (kecamatan_col,))
+    if map_data is None:
+        return None
+
+    map_data = map_data[[kecamatan_col, measure_col]].copy()
+    map_data.columns = ['Kecamatan', label]
+    return map_data
+
+def prepare_disaster_data_for_map(cubes, selected_years):
+    """Prepare disaster data for mapping"""
+    return kecamatan_totals(cubes, 'Bencana Alam', selected_years, 'bencana', 'Total_Bencana')
+
+def prepare_bantuan_sosial_data_for_map(cubes, selected_years):
+    """Prepare bantuan sosial data for mapping"""
+    return kecamatan_totals(cubes, 'Bantuan Sosial', selected_years, 'penerima', 'Total_Penerima')
+
+def prepare_kb_performance_data_for_map(data):
+    """Prepare KB performance data for mapping - DIPERBAIKI"""
+    if 'Data Kb Performance' not in data:
+        return None
+
+    # Growth_Rate sudah numerik sejak ingest (core.cleaning.clean_kb_performance)
+    kecamatan_col, growth_col = columns('Data Kb Performance', 'kecamatan', 'growth')
+    df = data['Data Kb Performance']
+
+    map_data = df[[kecamatan_col, growth_col]].copy()
+    map_data.columns = ['Kecamatan', 'Growth_Rate']
+    map_data = map_data.dropna()
+    return map_data
+
+def prepare_peserta_kb_data_for_map(cubes, selected_years):
+    """Prepare peserta KB data for mapping"""
+    return kecamatan_totals(cubes, 'Peserta Kb', selected_years, 'peserta', 'Total_Peserta')
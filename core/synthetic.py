@@ -0,0 +1,333 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from core import datastore
+from core.cleaning import MONTH_ORDER, extract_rupiah_value_series
+
+# ===========================
+# KONFIGURASI DATA SINTETIS
+# ===========================
+# Variasi multiplikatif (lognormal) antar tahun dan antar unit terhadap nilai template
+NOISE_SIGMA = 0.15
+
+# Konsentrasi Dirichlet saat membagi angka kecamatan ke unit desa (makin besar makin merata)
+UNIT_ALPHA = 4.0
+
+# Kerugian bencana di data asli dicatat dalam kelipatan Rp500.000
+KERUGIAN_STEP = 500_000
+
+# Fasilitas yang dicatat per kecamatan (disalin ke setiap unit) dan per unit kerja (dibagi)
+FASKES_KECAMATAN_COLS = ['Jumlah Rumah Sakit', 'Jumlah Puskesmas', 'Jumlah Puskesmas Pembantu']
+FASKES_UNIT_COLS = ['Jumlah Klinik', 'Jumlah Pondak Bersalin Desa (Polindes)', 'Pos Kesehatan']
+
+# ===========================
+# HELPER ACAK
+# ===========================
+def jitter_counts(values, rng, sigma=NOISE_SIGMA):
+    """Hitungan baru di sekitar nilai template: Poisson dengan rata-rata berderau lognormal"""
+    values = np.asarray(values, dtype=float)
+    return rng.poisson(values * rng.lognormal(0.0, sigma, size=values.shape)).astype('int64')
+
+def jitter_share(numerator, denominator, rng, sigma=NOISE_SIGMA / 2):
+    """Proporsi template (0-1) dengan sedikit derau, untuk ditarik ulang secara binomial"""
+    share = (np.asarray(numerator, dtype=float) / np.maximum(np.asarray(denominator, dtype=float), 1))
+    share = share * rng.lognormal(0.0, sigma, size=share.shape)
+    return np.clip(share, 0.0, 1.0)
+
+def split_counts(totals, weights, rng, minimum=0):
+    """Bagi total per baris ke unit secara multinomial; setiap unit mendapat minimal `minimum`"""
+    totals = np.asarray(totals, dtype='int64')
+    spare = np.maximum(totals - minimum * weights.shape[1], 0)
+    return rng.multinomial(spare, weights) + minimum
+
+def split_rows(df, units, rng, count_cols, minimum=None):
+    """Pecah tiap baris kecamatan menjadi `units` baris level desa; kolom hitungan dibagi, kolom lain disalin"""
+    if units <= 1:
+        return df.reset_index(drop=True)
+
+    minimum = minimum or {}
+    weights = rng.dirichlet(np.full(units, UNIT_ALPHA), size=len(df))
+    result = df.loc[df.index.repeat(units)].reset_index(drop=True)
+    for col in count_cols:
+        result[col] = split_counts(df[col].to_numpy(), weights, rng, minimum.get(col, 0)).ravel()
+    return result
+
+# ===========================
+# HELPER PERIODE
+# ===========================
+def target_years(template_years, from_year=None):
+    """Tahun yang dibangkitkan: dari `from_year` (atau tahun pertama template) sampai tahun terakhir template"""
+    first, last = int(min(template_years)), int(max(template_years))
+    return list(range(from_year if from_year is not None else first, last + 1))
+
+def expand_years(template, from_year=None, year_col="Tahun"):
+    """Susun baris template untuk setiap tahun target; tahun di luar rentang template meniru tahun terdekat"""
+    first, last = template[year_col].min(), template[year_col].max()
+    frames = []
+    for year in target_years(template[year_col], from_year):
+        source_year = min(max(year, first), last)
+        frame = template[template[year_col] == source_year].copy()
+        frame[year_col] = year
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+def expand_months(df, month_col="Bulan"):
+    """Lengkapi menjadi data bulanan; tiap bulan meniru bulan template terdekat"""
+    available = [MONTH_ORDER.index(month) for month in df[month_col].unique() if month in MONTH_ORDER]
+    frames = []
+    for i, month in enumerate(MONTH_ORDER):
+        source_month = MONTH_ORDER[min(available, key=lambda a: abs(a - i))]
+        frame = df[df[month_col] == source_month].copy()
+        frame[month_col] = month
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+def sort_periods(df, year_col="Tahun", month_col="Bulan"):
+    """Urutkan per tahun lalu bulan (Total di akhir), seperti urutan file asli"""
+    month_rank = df[month_col].map({month: i for i, month in enumerate(MONTH_ORDER)}).fillna(len(MONTH_ORDER))
+    order = np.lexsort((month_rank.to_numpy(), df[year_col].to_numpy()))
+    return df.iloc[order].reset_index(drop=True)
+
+def format_rupiah(values):
+    """Format angka sebagai teks Rupiah seperti di CSV asli (Rp6.000.000)"""
+    return ["Rp" + f"{int(value):,}".replace(",", ".") for value in values]
+
+# ===========================
+# GENERATOR PER DATASET
+# ===========================
+def synth_kesehatan_stunting(template, settings, rng):
+    """Stunting per unit kerja (dipecah ke level desa), opsional bulanan"""
+    df = expand_years(template, settings["from_year"])
+    if settings["monthly"]:
+        df = expand_months(df)
+    df = sort_periods(df)
+
+    stunting_share = jitter_share(df['Stunting'], df['Jumlah Yang Diukur'], rng)
+    sangat_pendek_share = jitter_share(df['Sangat Pendek'], df['Stunting'], rng)
+    df['Jumlah Yang Diukur'] = jitter_counts(df['Jumlah Yang Diukur'], rng)
+    for col in FASKES_UNIT_COLS:
+        df[col] = jitter_counts(df[col], rng)
+    df['_stunting_share'] = stunting_share
+    df['_sangat_pendek_share'] = sangat_pendek_share
+
+    units = settings["units"]
+    df = split_rows(df, units, rng, ['Jumlah Yang Diukur'] + FASKES_UNIT_COLS, minimum={'Jumlah Yang Diukur': 1})
+    if units > 1:
+        unit_no = np.tile(np.arange(1, units + 1), len(df) // units)
+        df['Unit Kerja (Puskesmas)'] = df['Unit Kerja (Puskesmas)'] + [f" - Desa {no:02d}" for no in unit_no]
+
+    df['Stunting'] = rng.binomial(df['Jumlah Yang Diukur'].to_numpy(), df['_stunting_share'].to_numpy())
+    df['Sangat Pendek'] = rng.binomial(df['Stunting'].to_numpy(), df['_sangat_pendek_share'].to_numpy())
+    df['Pendek'] = df['Stunting'] - df['Sangat Pendek']
+    prevalensi = (df['Stunting'] / df['Jumlah Yang Diukur'] * 100).round(1)
+    df['Prevalensi Stunting'] = prevalensi.astype(str) + ' %'
+    df['Tanggal'] = '01/01/' + df['Tahun'].astype(str)
+    df['No'] = np.arange(1, len(df) + 1)
+    return df[template.columns]
+
+def synth_pendidikan(template, settings, rng):
+    """Pendidikan per kecamatan x jenjang (dipecah ke level desa); persentase dihitung ulang dari hitungannya"""
+    df = expand_years(template, settings["from_year"])
+
+    shares = {
+        'Jumlah Siswa Usia Sekolah': jitter_share(df['Jumlah Siswa Usia Sekolah'], df['Total Siswa'], rng),
+        'Jumlah Guru S1/D4': jitter_share(df['Jumlah Guru S1/D4'], df['Total Guru'], rng),
+        'Jumlah Sekolah Terakreditasi': jitter_share(df['Jumlah Sekolah Terakreditasi'], df['Jumlah Sekolah'], rng),
+    }
+    count_cols = ['Jumlah Penduduk Usia Sekolah', 'Total Siswa', 'Total Guru', 'Jumlah Sekolah']
+    for col in count_cols:
+        df[col] = jitter_counts(df[col], rng)
+    for col, share in shares.items():
+        df['_' + col] = share
+
+    # Penyebut minimal 1 per unit agar persentase tidak kosong (baris kosong dibuang saat ingest)
+    df = split_rows(df, settings["units"], rng, count_cols, minimum={col: 1 for col in count_cols})
+    df['Jumlah Siswa Usia Sekolah'] = rng.binomial(df['Total Siswa'].to_numpy(), df['_Jumlah Siswa Usia Sekolah'].to_numpy())
+    df['Jumlah Guru S1/D4'] = rng.binomial(df['Total Guru'].to_numpy(), df['_Jumlah Guru S1/D4'].to_numpy())
+    df['Jumlah Sekolah Terakreditasi'] = rng.binomial(df['Jumlah Sekolah'].to_numpy(), df['_Jumlah Sekolah Terakreditasi'].to_numpy())
+
+    df['APK (%)'] = (df['Total Siswa'] / df['Jumlah Penduduk Usia Sekolah'] * 100).round(2)
+    df['APM (%)'] = (df['Jumlah Siswa Usia Sekolah'] / df['Jumlah Penduduk Usia Sekolah'] * 100).round(2)
+    df['Persentase Guru S1'] = (df['Jumlah Guru S1/D4'] / df['Total Guru'] * 100).round(2)
+    df['Persentase Sekolah Terakreditasi'] = (df['Jumlah Sekolah Terakreditasi'] / df['Jumlah Sekolah'] * 100).round(2)
+    df['No'] = np.arange(1, len(df) + 1)
+    return df[template.columns]
+
+def synth_kecamatan_counts(count_col):
+    """Generator untuk data per kecamatan x tahun x kategori dengan satu kolom hitungan"""
+    def synth(template, settings, rng):
+        df = expand_years(template, settings["from_year"])
+        df[count_col] = jitter_counts(df[count_col], rng)
+        return split_rows(df, settings["units"], rng, [count_col])[template.columns]
+    synth.__doc__ = f"Data per kecamatan ({count_col}), dipecah ke level desa"
+    return synth
+
+def synth_bencana_alam(template, settings, rng):
+    """Bencana per kecamatan; kerugian dibagi ke unit lalu dibulatkan ke kelipatan Rp500.000"""
+    df = expand_years(template, settings["from_year"])
+    count_cols = ['Jumlah_Bencana', 'Hancur', 'Rusak']
+    for col in count_cols:
+        df[col] = jitter_counts(df[col], rng)
+
+    kerugian = extract_rupiah_value_series(df['Kerugian_Rupiah']).to_numpy(dtype=float)
+    kerugian = kerugian * rng.lognormal(0.0, NOISE_SIGMA, size=len(df))
+    steps = np.rint(kerugian / KERUGIAN_STEP).astype('int64')
+    # Seperti data asli: tanpa kejadian berarti tanpa kerugian
+    steps[df['Jumlah_Bencana'].to_numpy() == 0] = 0
+
+    units = settings["units"]
+    df = split_rows(df, units, rng, count_cols)
+    if units > 1:
+        # Kerugian dibagi mengikuti jumlah kejadian tiap unit
+        bencana = df['Jumlah_Bencana'].to_numpy(dtype=float).reshape(-1, units)
+        totals = bencana.sum(axis=1, keepdims=True)
+        weights = np.where(totals > 0, bencana / np.maximum(totals, 1), 1.0 / units)
+        steps = rng.multinomial(steps, weights).ravel()
+    df['Kerugian_Rupiah'] = format_rupiah(steps * KERUGIAN_STEP)
+    return df[template.columns]
+
+def synth_yearly_counts(count_col):
+    """Generator untuk data tingkat kabupaten per tahun x kategori (tidak dipecah per desa)"""
+    def synth(template, settings, rng):
+        df = expand_years(template, settings["from_year"])
+        df[count_col] = jitter_counts(df[count_col], rng)
+        return df[template.columns]
+    synth.__doc__ = f"Data tingkat kabupaten ({count_col}) per tahun"
+    return synth
+
+def synth_monthly_cases(category_col):
+    """Generator kasus kekerasan bulanan; baris Bulan = Total dihitung ulang dari 12 bulan"""
+    def synth(template, settings, rng):
+        df = expand_years(template, settings["from_year"])
+        monthly = df[df['Bulan'] != 'Total'].copy()
+        monthly['Jumlah_Kasus'] = jitter_counts(monthly['Jumlah_Kasus'], rng)
+
+        if (df['Bulan'] == 'Total').any():
+            totals = monthly.groupby(['Tahun', category_col], sort=False)['Jumlah_Kasus'].sum().reset_index()
+            totals['Bulan'] = 'Total'
+            monthly = pd.concat([monthly, totals], ignore_index=True)
+
+        # Urutan file asli: per tahun, per kategori, Januari..Desember lalu Total
+        category_rank = monthly[category_col].map({value: i for i, value in enumerate(template[category_col].unique())})
+        month_rank = monthly['Bulan'].map({month: i for i, month in enumerate(MONTH_ORDER)}).fillna(len(MONTH_ORDER))
+        order = np.lexsort((month_rank.to_numpy(), category_rank.to_numpy(), monthly['Tahun'].to_numpy()))
+        return monthly.iloc[order].reset_index(drop=True)[template.columns]
+    synth.__doc__ = f"Kasus kekerasan bulanan per {category_col}"
+    return synth
+
+def synth_kb_performance(template, settings, rng):
+    """Ringkasan peserta KB per kecamatan (satu baris per kecamatan; kolom tahun tetap seperti template)"""
+    df = template.copy()
+    year_cols = [col for col in df.columns if col.isdigit()]
+    for col in year_cols:
+        df[col] = jitter_counts(df[col], rng)
+
+    last, previous = year_cols[-1], year_cols[-2]
+    growth = (df[last] - df[previous]) / df[previous].clip(lower=1) * 100
+    df['Growth_2024_vs_2023'] = [f"{value:.2f}%".replace('.', ',') for value in growth]
+    df['Performance_Level'] = np.select([growth > 0, growth < -10], ['Good', 'Poor'], default='Declining')
+    return df[template.columns]
+
+def synth_kb_tren_metode(template, settings, rng):
+    """Peserta KB per tahun per metode; Total_Peserta = jumlah semua metode"""
+    df = expand_years(template, settings["from_year"])
+    method_cols = [col for col in df.columns if col not in ('Tahun', 'Total_Peserta')]
+    for col in method_cols:
+        df[col] = jitter_counts(df[col], rng)
+    df['Total_Peserta'] = df[method_cols].sum(axis=1)
+    return df[template.columns]
+
+def synth_master_kecamatan(template, settings, rng):
+    """Master kecamatan disalin apa adanya (nama dan urutan kanonik)"""
+    return template.copy()
+
+def synth_master_tahun(template, settings, rng):
+    """Daftar tahun sesuai rentang data sintetis"""
+    return pd.DataFrame({'Tahun': target_years(template['Tahun'], settings["from_year"])})
+
+# Path dataset (sama dengan core.datastore.DATASETS) -> generator
+SYNTHETIC_GENERATORS = {
+    "data/kesehatan/kesehatan_stunting.csv": synth_kesehatan_stunting,
+    "data/pendidikan/pendidikan_paud_sd_smp.csv": synth_pendidikan,
+    "data/sosial/bantuan_sosial.csv": synth_kecamatan_counts('Jumlah_Penerima'),
+    "data/sosial/bencana_alam.csv": synth_bencana_alam,
+    "data/sosial/bentuk_kekerasan_perempuan.csv": synth_monthly_cases('Bentuk_Kekerasan'),
+    "data/sosial/data_kb_performance.csv": synth_kb_performance,
+    "data/sosial/data_kb_tren_metode.csv": synth_kb_tren_metode,
+    "data/sosial/jenis_bencana.csv": synth_yearly_counts('Jumlah'),
+    "data/sosial/kekerasan_anak.csv": synth_monthly_cases('Gender'),
+    "data/sosial/master_kecamatan.csv": synth_master_kecamatan,
+    "data/sosial/master_tahun.csv": synth_master_tahun,
+    "data/sosial/peserta_kb.csv": synth_kecamatan_counts('Jumlah_Peserta'),
+    "data/sosial/usia_kekerasan_perempuan.csv": synth_monthly_cases('Kelompok_Usia'),
+}
+
+# ===========================
+# GENERATE
+# ===========================
+# Folder data bawaan repo (template generator); tidak boleh ditimpa data sintetis
+REPO_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), datastore.DEFAULT_DATA_DIR)
+
+def output_paths(out_dir):
+    """Path dataset -> lokasi CSV sintetis di `out_dir`"""
+    return {
+        source_path: os.path.join(out_dir, os.path.relpath(source_path, datastore.DEFAULT_DATA_DIR))
+        for source_path in datastore.DATASETS
+    }
+
+def check_out_dir(out_dir, force=False):
+    """Tolak folder data bawaan repo, dan file yang sudah ada kecuali `force`"""
+    protected = {os.path.realpath(REPO_DATA_DIR), os.path.realpath(datastore.DEFAULT_DATA_DIR)}
+    if os.path.realpath(out_dir) in protected:
+        raise ValueError(f"'{out_dir}' adalah folder data bawaan repo; pilih folder lain untuk data sintetis")
+
+    existing = [target for target in output_paths(out_dir).values() if os.path.exists(target)]
+    if existing and not force:
+        raise FileExistsError(
+            f"{len(existing)} file sudah ada di '{out_dir}' (mis. {existing[0]}); gunakan --force untuk menimpa"
+        )
+
+def generate(out_dir, units=10, from_year=None, monthly=False, seed=0, force=False):
+    """Tulis versi sintetis semua CSV di data/ ke `out_dir` (struktur folder dan kolom sama); return jumlah baris per file"""
+    missing = sorted(set(datastore.DATASETS) - set(SYNTHETIC_GENERATORS))
+    if missing:
+        raise KeyError(f"Belum ada generator sintetis untuk: {missing}")
+    # Dicek sebelum menulis apa pun, agar tidak ada folder yang tertimpa sebagian
+    check_out_dir(out_dir, force)
+
+    rng = np.random.default_rng(seed)
+    settings = {"units": units, "from_year": from_year, "monthly": monthly}
+    rows = {}
+    for source_path, target in output_paths(out_dir).items():
+        # Template selalu CSV bawaan repo, bukan folder DASHBOARD_DATA_DIR
+        template = pd.read_csv(source_path)
+        df = SYNTHETIC_GENERATORS[source_path](template, settings, rng)
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        df.to_csv(target, index=False)
+        rows[source_path] = len(df)
+    return rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bangkitkan data sintetis berskema sama dengan data/ untuk uji skala")
+    parser.add_argument("out_dir", help="folder tujuan, dipakai lewat DASHBOARD_DATA_DIR=<out_dir>")
+    parser.add_argument("--units", type=int, default=10, help="jumlah unit desa per baris kecamatan (default 10)")
+    parser.add_argument("--from-year", type=int, default=None, help="tahun awal; tahun sebelum data asli meniru tahun terdekat")
+    parser.add_argument("--monthly", action="store_true", help="data stunting bulanan (data asli hanya Februari & Agustus)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--force", action="store_true", help="timpa CSV yang sudah ada di out_dir (folder data/ repo tetap ditolak)")
+    args = parser.parse_args()
+
+    try:
+        check_out_dir(args.out_dir, args.force)
+    except (ValueError, FileExistsError) as e:
+        parser.error(str(e))
+    rows = generate(
+        args.out_dir, units=args.units, from_year=args.from_year, monthly=args.monthly, seed=args.seed, force=args.force,
+    )
+    for source_path, count in rows.items():
+        print(f"{count:>10,} baris  {source_path}")
+    print(f"{sum(rows.values()):,} baris ditulis ke {args.out_dir}")
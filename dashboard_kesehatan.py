@@ -1,10 +1,20 @@
-import json
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import numpy as np
+from core.datastore import dataset_fingerprint, load_dataset
+from core.geo import FEATURE_ID_KEY, MAP_ZOOM, get_geojson_source
+from core.kesehatan import (
+    build_faskes_analysis,
+    build_facilities_index,
+    build_latest_period_index,
+    latest_facilities_snapshot,
+    faskes_comparison_plot_data,
+    lookup_latest_period,
+    read_period_index,
+    slice_period_trend,
+)
+from core import profiling
 
 # Konfigurasi halaman
 st.set_page_config(
@@ -14,57 +24,56 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Load data
-@st.cache_data
-def load_data():
-    df = pd.read_csv("data/kesehatan/kesehatan_stunting.csv")
-    # Membersihkan kolom Prevalensi Stunting
-    df['Prevalensi Stunting Persen'] = df['Prevalensi Stunting'].str.replace('%', '').str.replace(' ', '').str.replace('%%', '').astype(float)
-    return df
+# Profiling opsional (DASHBOARD_PROFILE=1 atau ?profile=1)
+profiling.start_run("kesehatan")
 
-df = load_data()
+# Load data
+DATA_PATH = "data/kesehatan/kesehatan_stunting.csv"
 
-geojson_kec_path = "data/geo/35.07_kecamatan.geojson"
-with open(geojson_kec_path, 'r', encoding='utf-8') as f:
-    geojson_kec = json.load(f)
+@st.cache_data(persist="disk")
+def load_cleaned_data(fingerprint):
+    # Data sudah dibersihkan (termasuk Prevalensi Stunting Persen) di cache kolumnar;
+    # hasil akhirnya juga disimpan di disk oleh Streamlit sehingga bertahan saat server restart
+    return load_dataset(DATA_PATH)
 
-# =================== UTILITY FUNCTIONS ===================
-def get_latest_period(df_to_check):
-    """Mencari tahun dan bulan terakhir dari dataframe yang diberikan."""
-    if df_to_check.empty:
-        return None, None
+@st.cache_data
+def load_period_index(fingerprint):
+    # Agregat per (kecamatan, periode) untuk tab tren, disimpan di cache kolumnar; CSV yang hanya
+    # bertambah baris cukup mengagregasi baris barunya (fingerprint = kunci cache)
+    return read_period_index()
 
-    month_order = ['Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni', 
-                   'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember']
-    
-    latest_year = df_to_check['Tahun'].max()
-    latest_year_data = df_to_check[df_to_check['Tahun'] == latest_year]
-    available_months = latest_year_data['Bulan'].unique()
-
-    latest_month = None
-    for month in reversed(month_order):
-        if month in available_months:
-            latest_month = month
-            break
-    
-    return latest_year, latest_month
-
-def get_month_mapping():
-    """Return mapping bulan ke angka untuk sorting"""
-    return {
-        'Januari': 1, 'Februari': 2, 'Maret': 3, 'April': 4, 
-        'Mei': 5, 'Juni': 6, 'Juli': 7, 'Agustus': 8, 
-        'September': 9, 'Oktober': 10, 'November': 11, 'Desember': 12
-    }
-
-def create_sorted_period_data(df):
-    """Buat data periode yang sudah diurutkan dengan benar"""
-    month_mapping = get_month_mapping()
-    df['Month_Num'] = df['Bulan'].map(month_mapping)
-    df['Periode'] = df['Tahun'].astype(str) + '-' + df['Bulan']
-    
-    return df.sort_values(['Tahun', 'Month_Num']).reset_index(drop=True)
+@st.cache_data
+def load_latest_indexes(fingerprint):
+    # Periode terakhir per (kecamatan, tahun) dan snapshot fasilitas per (kecamatan, periode)
+    return build_latest_period_index(load_period_index(fingerprint)), build_facilities_index(load_cleaned_data(fingerprint))
+
+@st.cache_data(max_entries=64)
+def get_latest_snapshot(fingerprint, latest_year, latest_month, kecamatan_key):
+    # Snapshot fasilitas & prevalensi periode terakhir, di-memo per (versi data, kombinasi filter)
+    _, facilities_index = load_latest_indexes(fingerprint)
+    return latest_facilities_snapshot(facilities_index, latest_year, latest_month, kecamatan_key)
+
+@st.cache_data(max_entries=64)
+def get_faskes_analysis(fingerprint, latest_year, latest_month, years_key, kecamatan_key):
+    # Tabel metrik per kecamatan + data grafik + ringkasan section fasilitas, di-memo per (versi data, kombinasi filter)
+    faskes_df, prevalensi_df = get_latest_snapshot(fingerprint, latest_year, latest_month, kecamatan_key)
+    if latest_month is None:
+        data = load_cleaned_data(fingerprint)
+        subset = data[data['Tahun'].isin(years_key) & data['Kecamatan'].isin(kecamatan_key)]
+        prevalensi_df = subset.groupby('Kecamatan', observed=True).agg({'Prevalensi Stunting Persen': 'mean'}).reset_index()
+    metrics, summary = build_faskes_analysis(prevalensi_df, faskes_df)
+    plot_df = faskes_comparison_plot_data(metrics) if summary else None
+    return metrics, plot_df, summary
+
+# Fingerprint = hash isi CSV & kode core, dihitung sekali per rerun; semua cache turunan
+# ikut dikunci dengannya sehingga data baru otomatis memakai entri cache baru
+data_fingerprint = dataset_fingerprint(DATA_PATH)
+df = load_cleaned_data(data_fingerprint)
+period_index = load_period_index(data_fingerprint)
+latest_index, _ = load_latest_indexes(data_fingerprint)
+profiling.lap("Load data", "load")
 
+# =================== UTILITY FUNCTIONS ===================
 def analyze_prevalence_category(prevalensi):
     """Klasifikasi prevalensi stunting"""
     if prevalensi < 5:
@@ -76,47 +85,6 @@ def analyze_prevalence_category(prevalensi):
     else:
         return "Sangat Tinggi (> 20%)"
 
-def get_latest_facilities_data(data):
-    """Ambil data fasilitas dari periode terakhir"""
-    if data.empty:
-        return pd.DataFrame()
-
-    month_order = ['Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni', 
-                   'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember']
-    
-    latest_year = data['Tahun'].max()
-    latest_year_data = data[data['Tahun'] == latest_year]
-    
-    latest_month = None
-    for month in reversed(month_order):
-        if month in latest_year_data['Bulan'].unique():
-            latest_month = month
-            break
-    
-    if not latest_month:
-        return pd.DataFrame()
-
-    latest_period_df = latest_year_data[latest_year_data['Bulan'] == latest_month]
-
-    # Kolom yang dihitung per kecamatan (ambil nilai unik)
-    per_kecamatan_cols = ['Jumlah Rumah Sakit', 'Jumlah Puskesmas', 'Jumlah Puskesmas Pembantu']
-    # Kolom yang dihitung per unit kerja (dijumlahkan)
-    per_unit_kerja_cols = ['Jumlah Klinik', 'Pos Kesehatan', 'Jumlah Pondak Bersalin Desa (Polindes)']
-
-    # Filter kolom yang benar-benar ada di dataframe
-    per_kecamatan_cols = [col for col in per_kecamatan_cols if col in latest_period_df.columns]
-    per_unit_kerja_cols = [col for col in per_unit_kerja_cols if col in latest_period_df.columns]
-
-    # Proses faskes per kecamatan
-    faskes_kec_df = latest_period_df[['Kecamatan'] + per_kecamatan_cols].drop_duplicates(subset=['Kecamatan']).reset_index(drop=True)
-
-    # Proses faskes per unit kerja
-    faskes_unit_df = latest_period_df.groupby('Kecamatan')[per_unit_kerja_cols].sum().reset_index()
-
-    # Gabungkan keduanya
-    final_faskes_df = pd.merge(faskes_kec_df, faskes_unit_df, on='Kecamatan', how='outer').fillna(0)
-    return final_faskes_df
-
 def create_trend_analysis(trend_data, period_type="tahun"):
     """Generate analisis tren berdasarkan data"""
     if len(trend_data) <= 1:
@@ -168,6 +136,39 @@ def create_map_analysis(selected_indicator_label, max_kecamatan, max_value, min_
     else:
         return f"**Sebaran {selected_indicator_label}**: Jumlah tertinggi terdapat di **{max_kecamatan}** ({max_value:.0f} unit) dan terendah di **{min_kecamatan}** ({min_value:.0f} unit). Rata-rata adalah {mean_value:.1f} unit per kecamatan dengan {above_avg} kecamatan berada di atas rata-rata dan {below_avg} kecamatan di bawah rata-rata."
 
+@st.cache_data
+def create_choropleth_map(map_display_df, selected_indicator, selected_indicator_label, title):
+    """Choropleth per kecamatan; geometri dikirim lewat URL statis sekali per sesi bila tersedia"""
+    fig_map = px.choropleth_mapbox(
+        map_display_df,
+        geojson=get_geojson_source(MAP_ZOOM, st.get_option("server.enableStaticServing")),
+        locations="Kecamatan",
+        featureidkey=FEATURE_ID_KEY,
+        color=selected_indicator,
+        color_continuous_scale="Viridis",
+        mapbox_style="carto-positron",
+        zoom=MAP_ZOOM,
+        center={"lat": -8.1, "lon": 112.6},
+        opacity=0.7,
+        labels={selected_indicator: selected_indicator_label},
+        hover_name="Kecamatan",
+    )
+
+    # Tentukan format hovertemplate untuk menampilkan nilai dengan benar
+    if "Prevalensi Stunting (%)" in selected_indicator_label:
+        template_value = '%{z:.2f}%'
+    else:
+        template_value = '%{z:,.0f}' # Gunakan koma untuk ribuan pada data non-persen
+
+    fig_map.update_traces(hovertemplate=f'<b>%{{location}}</b><br>{selected_indicator_label}: {template_value}<extra></extra>')
+
+    fig_map.update_layout(
+        margin={"r":0,"t":40,"l":0,"b":0},
+        title=title,
+        uirevision="peta_sebaran"  # pertahankan zoom/pan saat hanya nilai indikator yang berubah
+    )
+    return fig_map
+
 # =================== SIDEBAR FILTERS ===================
 with st.sidebar:
     st.header("🔍 Filter Data")
@@ -261,6 +262,7 @@ filtered_df = df[
     (df['Tahun'].isin(selected_year)) &
     (df['Kecamatan'].isin(selected_kecamatan))
 ]
+profiling.lap("Filter sidebar", "filter")
 
 # Title dan Header
 st.title("📊 Dashboard Analisis Data Stunting")
@@ -269,6 +271,7 @@ st.markdown("Dashboard komprehensif untuk analisis data stunting di berbagai kec
 # Cek apakah ada data setelah filtering
 if filtered_df.empty:
     st.error("Tidak ada data yang sesuai dengan filter yang dipilih. Silakan ubah filter di sidebar.")
+    profiling.finish_run()
     st.stop()
 
 # Info filter aktif
@@ -277,21 +280,20 @@ st.markdown("---")
 # =================== METRICS UTAMA ===================
 st.header("📋 Ringkasan Utama")
 
-latest_year, latest_month = get_latest_period(filtered_df)
+latest_year, latest_month = lookup_latest_period(latest_index, selected_year, selected_kecamatan)
+
+# Fasilitas & prevalensi periode terakhir untuk metrik, peta, dan analisis korelasi
+faskes_df, prevalence_latest_df = get_latest_snapshot(data_fingerprint, latest_year, latest_month, tuple(selected_kecamatan))
 
 # Data stunting dari semua periode yang difilter
 total_stunting = filtered_df['Stunting'].sum()
 total_diukur = filtered_df['Jumlah Yang Diukur'].sum()
 avg_prevalensi = filtered_df['Prevalensi Stunting Persen'].mean()
 
-# Data fasilitas dari periode terakhir saja - AMBIL KECAMATAN UNIK SAJA
+# Data fasilitas dari periode terakhir saja - snapshot sudah satu baris per kecamatan
 if latest_year and latest_month:
-    latest_data = filtered_df[
-        (filtered_df['Tahun'] == latest_year) & 
-        (filtered_df['Bulan'] == latest_month)
-    ].drop_duplicates(subset=['Kecamatan'])
-    total_puskesmas = latest_data['Jumlah Puskesmas'].sum()
-    total_rs = latest_data['Jumlah Rumah Sakit'].sum()
+    total_puskesmas = faskes_df['Jumlah Puskesmas'].sum()
+    total_rs = faskes_df['Jumlah Rumah Sakit'].sum()
 else:
     total_puskesmas, total_rs = 0, 0
 
@@ -320,8 +322,7 @@ with col5:
 
 st.markdown("---")
 
-# Siapkan data fasilitas kesehatan untuk peta dan analisis korelasi
-faskes_df = get_latest_facilities_data(filtered_df)
+profiling.lap("Ringkasan Utama", "groupby")
 
 st.header("🗺️ Peta Sebaran")
 
@@ -341,15 +342,7 @@ selected_indicator_label = st.selectbox("Pilih indikator untuk ditampilkan:", li
 selected_indicator = available_indicators[selected_indicator_label]
 
 # Data untuk peta
-if 'latest_year' in locals() and 'latest_month' in locals() and not faskes_df.empty:
-    latest_period_data = filtered_df[
-        (filtered_df['Tahun'] == latest_year) & 
-        (filtered_df['Bulan'] == latest_month)
-    ]
-    prevalence_latest_df = latest_period_data.groupby('Kecamatan').agg({
-        'Prevalensi Stunting Persen': 'mean'
-    }).reset_index()
-
+if not faskes_df.empty:
     map_data_source = pd.merge(faskes_df, prevalence_latest_df, on="Kecamatan", how="left")
 else:
     map_data_source = pd.DataFrame()
@@ -357,34 +350,15 @@ else:
 if not map_data_source.empty and selected_indicator in map_data_source.columns:
     map_display_df = map_data_source[['Kecamatan', selected_indicator]].dropna()
 
-    fig_map = px.choropleth_mapbox(
+    fig_map = create_choropleth_map(
         map_display_df,
-        geojson=geojson_kec,
-        locations="Kecamatan",
-        featureidkey="properties.nm_kecamatan",
-        color=selected_indicator,
-        color_continuous_scale="Viridis",
-        mapbox_style="carto-positron",
-        zoom=8,
-        center={"lat": -8.1, "lon": 112.6},
-        opacity=0.7,
-        labels={selected_indicator: selected_indicator_label},
-        hover_name="Kecamatan",
+        selected_indicator,
+        selected_indicator_label,
+        f"Sebaran {selected_indicator_label} per Kecamatan (Data: {latest_month} {latest_year})"
     )
-
-    # Tentukan format hovertemplate untuk menampilkan nilai dengan benar
-    if "Prevalensi Stunting (%)" in selected_indicator_label:
-        template_value = '%{z:.2f}%'
-    else:
-        template_value = '%{z:,.0f}' # Gunakan koma untuk ribuan pada data non-persen
-
-    fig_map.update_traces(hovertemplate=f'<b>%{{location}}</b><br>{selected_indicator_label}: {template_value}<extra></extra>')
-
-    fig_map.update_layout(
-        margin={"r":0,"t":40,"l":0,"b":0},
-        title=f"Sebaran {selected_indicator_label} per Kecamatan (Data: {latest_month} {latest_year})"
-    )
-    st.plotly_chart(fig_map, use_container_width=True)
+    profiling.lap("Peta Sebaran", "figure")
+    with profiling.section("Peta Sebaran", "render"):
+        st.plotly_chart(fig_map, use_container_width=True)
     
     # Analisis menggunakan fungsi utility
     max_value = map_display_df[selected_indicator].max()
@@ -423,13 +397,7 @@ with tab1:
     
     if trend_type_general == "Per Tahun":
         # Tren Tahunan (menggunakan filtered_df dari sidebar)
-        yearly_trend = filtered_df.groupby('Tahun').agg({
-            'Prevalensi Stunting Persen': ['mean', 'std'],
-            'Stunting': 'sum',
-            'Jumlah Yang Diukur': 'sum'
-        }).reset_index()
-        
-        yearly_trend.columns = ['Tahun', 'Prevalensi_Mean', 'Prevalensi_Std', 'Total_Stunting', 'Total_Diukur']
+        yearly_trend = slice_period_trend(period_index, 'Tahun', selected_year, selected_kecamatan)
         yearly_trend['Prevalensi_Std'] = yearly_trend['Prevalensi_Std'].fillna(0)
         
         fig_trend = go.Figure()
@@ -453,7 +421,9 @@ with tab1:
             hovermode='x unified'
         )
         
-        st.plotly_chart(fig_trend, use_container_width=True)
+        profiling.lap("Tren Tahunan", "figure")
+        with profiling.section("Tren Tahunan", "render"):
+            st.plotly_chart(fig_trend, use_container_width=True)
         
         # Analisis tren tahunan
         if len(yearly_trend) > 1:
@@ -473,18 +443,9 @@ with tab1:
             st.info("Data hanya tersedia untuk satu tahun.")
     
     else:  # Per Periode
-        # Sorting periode yang benar
-        filtered_df_sorted = create_sorted_period_data(filtered_df.copy())
-        
-        period_trend = filtered_df_sorted.groupby(['Tahun', 'Bulan', 'Periode', 'Month_Num']).agg({
-            'Prevalensi Stunting Persen': ['mean', 'std'],
-            'Stunting': 'sum',
-            'Jumlah Yang Diukur': 'sum'
-        }).reset_index()
-        
-        period_trend.columns = ['Tahun', 'Bulan', 'Periode', 'Month_Num', 'Prevalensi_Mean', 'Prevalensi_Std', 'Total_Stunting', 'Total_Diukur']
+        # Indeks periode sudah terurut kronologis (Period_Key)
+        period_trend = slice_period_trend(period_index, 'Periode', selected_year, selected_kecamatan)
         period_trend['Prevalensi_Std'] = period_trend['Prevalensi_Std'].fillna(0)
-        period_trend = period_trend.sort_values(['Tahun', 'Month_Num']).reset_index(drop=True)
         
         fig_trend = go.Figure()
         
@@ -511,7 +472,9 @@ with tab1:
             )
         )
         
-        st.plotly_chart(fig_trend, use_container_width=True)
+        profiling.lap("Tren Tahunan", "figure")
+        with profiling.section("Tren Tahunan", "render"):
+            st.plotly_chart(fig_trend, use_container_width=True)
         
         # Analisis tren periodik
         if len(period_trend) > 1:
@@ -530,6 +493,13 @@ with tab1:
         else:
             st.info("Data hanya tersedia untuk satu periode.")
 
+# Nama kolom tren kecamatan tunggal mengikuti kolom data asli
+SINGLE_TREND_COLUMNS = {
+    'Prevalensi_Mean': 'Prevalensi Stunting Persen',
+    'Total_Stunting': 'Stunting',
+    'Total_Diukur': 'Jumlah Yang Diukur',
+}
+
 with tab2:
     
     # Filter lokal untuk tab kecamatan (hanya periode dan 1 kecamatan)
@@ -562,11 +532,9 @@ with tab2:
         
         if trend_type_kec == "Per Tahun":
             # Tren tahunan untuk kecamatan tunggal
-            yearly_single_trend = single_kec_df.groupby('Tahun').agg({
-                'Prevalensi Stunting Persen': 'mean',
-                'Stunting': 'sum',
-                'Jumlah Yang Diukur': 'sum'
-            }).reset_index()
+            yearly_single_trend = slice_period_trend(
+                period_index, 'Tahun', kecamatan=[selected_kecamatan_single]
+            ).rename(columns=SINGLE_TREND_COLUMNS)
             
             fig_single = go.Figure()
             
@@ -589,7 +557,9 @@ with tab2:
                 hovermode='x unified'
             )
             
-            st.plotly_chart(fig_single, use_container_width=True)
+            profiling.lap("Tren per Kecamatan", "figure")
+            with profiling.section("Tren per Kecamatan", "render"):
+                st.plotly_chart(fig_single, use_container_width=True)
             
             # Analisis tren untuk kecamatan tunggal
             if len(yearly_single_trend) > 1:
@@ -626,16 +596,10 @@ with tab2:
                 st.info("Data hanya tersedia untuk satu tahun.")
         
         else:  # Per Periode
-            # Sorting periode yang benar untuk kecamatan tunggal
-            single_kec_df_sorted = create_sorted_period_data(single_kec_df.copy())
-            
-            period_single_trend = single_kec_df_sorted.groupby(['Tahun', 'Bulan', 'Periode', 'Month_Num']).agg({
-                'Prevalensi Stunting Persen': 'mean',
-                'Stunting': 'sum',
-                'Jumlah Yang Diukur': 'sum'
-            }).reset_index()
-            
-            period_single_trend = period_single_trend.sort_values(['Tahun', 'Month_Num']).reset_index(drop=True)
+            # Tren periode kecamatan tunggal (terurut kronologis dari indeks periode)
+            period_single_trend = slice_period_trend(
+                period_index, 'Periode', kecamatan=[selected_kecamatan_single]
+            ).rename(columns=SINGLE_TREND_COLUMNS)
             
             fig_single_period = go.Figure()
             
@@ -662,7 +626,9 @@ with tab2:
                 )
             )
             
-            st.plotly_chart(fig_single_period, use_container_width=True)
+            profiling.lap("Tren per Kecamatan", "figure")
+            with profiling.section("Tren per Kecamatan", "render"):
+                st.plotly_chart(fig_single_period, use_container_width=True)
             
             # Analisis tren periodik untuk kecamatan tunggal
             if len(period_single_trend) > 1:
@@ -683,7 +649,7 @@ with tab2:
                     st.metric("Rentang Variasi", f"{range_period_single:.1f}%", "Antar Periode")
                 
                 # Analisis pola musiman untuk kecamatan tunggal
-                monthly_avg_single = period_single_trend.groupby('Bulan')['Prevalensi Stunting Persen'].mean()
+                monthly_avg_single = period_single_trend.groupby('Bulan', observed=True)['Prevalensi Stunting Persen'].mean()
                 month_order = ['Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni', 
                                'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember']
                 monthly_avg_single = monthly_avg_single.reindex([month for month in month_order if month in monthly_avg_single.index])
@@ -707,7 +673,7 @@ st.markdown("---")
 st.header("🗺️ Perbandingan Antar Wilayah")
 
 # Data untuk distribusi diambil dari periode terakhir untuk konsistensi dengan peta dan korelasi
-if 'latest_year' in locals() and 'latest_month' in locals() and latest_month is not None:
+if latest_month is not None:
     distribution_df = filtered_df[
         (filtered_df['Tahun'] == latest_year) & 
         (filtered_df['Bulan'] == latest_month)
@@ -721,7 +687,7 @@ col1, col2 = st.columns(2)
 
 with col1:
     # Kecamatan dengan prevalensi tertinggi
-    top_kecamatan = distribution_df.groupby('Kecamatan').agg({
+    top_kecamatan = distribution_df.groupby('Kecamatan', observed=True).agg({
         'Prevalensi Stunting Persen': 'mean',
         'Stunting': 'sum'
     }).reset_index().sort_values('Prevalensi Stunting Persen', ascending=False).head(10)
@@ -738,10 +704,12 @@ with col1:
     )
     fig_top.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
     fig_top.update_layout(height=500)
-    st.plotly_chart(fig_top, use_container_width=True)
+    profiling.lap("Perbandingan Antar Wilayah", "figure")
+    with profiling.section("Perbandingan Antar Wilayah", "render"):
+        st.plotly_chart(fig_top, use_container_width=True)
 
 with col2:
-    bottom_kecamatan = distribution_df.groupby('Kecamatan').agg({
+    bottom_kecamatan = distribution_df.groupby('Kecamatan', observed=True).agg({
         'Prevalensi Stunting Persen': 'mean',
         'Stunting': 'sum'
     }).reset_index().sort_values('Prevalensi Stunting Persen', ascending=True).head(10)
@@ -758,7 +726,9 @@ with col2:
     )
     fig_bottom.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
     fig_bottom.update_layout(height=500)
-    st.plotly_chart(fig_bottom, use_container_width=True)
+    profiling.lap("Perbandingan Antar Wilayah", "figure")
+    with profiling.section("Perbandingan Antar Wilayah", "render"):
+        st.plotly_chart(fig_bottom, use_container_width=True)
 
 # Analisis distribusi menggunakan data yang sudah dihitung
 highest_kec = top_kecamatan.iloc[0]['Kecamatan']
@@ -773,7 +743,7 @@ gap = highest_prev - lowest_prev
 
 st.info(f"**Variasi Antar Wilayah**: Terdapat perbedaan {gap:.1f}% antara kecamatan dengan angka stunting tertinggi (**{highest_kec}**: {highest_prev:.1f}% atau {highest_cases:,} kasus) dan terendah (**{lowest_kec}**: {lowest_prev:.1f}% atau {lowest_cases:,} kasus). Hal ini menunjukkan adanya variasi kondisi stunting antar wilayah.")
 
-avg_prevalensi_kecamatan = distribution_df.groupby('Kecamatan')['Prevalensi Stunting Persen'].mean().reset_index()
+avg_prevalensi_kecamatan = distribution_df.groupby('Kecamatan', observed=True)['Prevalensi Stunting Persen'].mean().reset_index()
 
 # Gunakan fungsi utility untuk klasifikasi
 avg_prevalensi_kecamatan['Kategori'] = avg_prevalensi_kecamatan['Prevalensi Stunting Persen'].apply(analyze_prevalence_category)
@@ -788,12 +758,15 @@ with col1:
         values=kategori_counts.values,
         names=kategori_counts.index,
     )
-    st.plotly_chart(fig_pie, use_container_width=True)
+    profiling.lap("Perbandingan Antar Wilayah", "figure")
+    with profiling.section("Perbandingan Antar Wilayah", "render"):
+        st.plotly_chart(fig_pie, use_container_width=True)
 
 with col2:
     st.markdown("<h3 style='font-size: 18px; font-weight: bold;'>Daftar Kecamatan per Kategori</h3>", unsafe_allow_html=True)
     for kategori in kategori_counts.index:
-        kecamatan_list = avg_prevalensi_kecamatan[avg_prevalensi_kecamatan['Kategori'] == kategori]['Kecamatan'].tolist()
+        # Urut alfabetis seperti sebelumnya; urutan kategori Categorical mengikuti kode master kecamatan
+        kecamatan_list = sorted(avg_prevalensi_kecamatan[avg_prevalensi_kecamatan['Kategori'] == kategori]['Kecamatan'].astype(str))
         st.write(f"**{kategori}**: {', '.join(kecamatan_list[:15])}" + ("..." if len(kecamatan_list) > 15 else ""))
 
 # Analisis kategori
@@ -827,7 +800,7 @@ with col_header2:
     )
 
 if filtered_df['Tahun'].nunique() > 1:
-    perubahan_df = filtered_df.groupby(['Kecamatan', 'Tahun'])['Prevalensi Stunting Persen'].mean().reset_index()
+    perubahan_df = filtered_df.groupby(['Kecamatan', 'Tahun'], observed=True)['Prevalensi Stunting Persen'].mean().reset_index()
     tahun_awal, tahun_akhir = perubahan_df['Tahun'].min(), perubahan_df['Tahun'].max()
 
     perubahan_pivot = perubahan_df.pivot(index='Kecamatan', columns='Tahun', values='Prevalensi Stunting Persen').reset_index()
@@ -862,7 +835,9 @@ if filtered_df['Tahun'].nunique() > 1:
             )
             fig_change.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
             fig_change.update_layout(height=400, yaxis={'categoryorder': 'total ascending'})
-            st.plotly_chart(fig_change, use_container_width=True)
+            profiling.lap("Ranking Perubahan", "figure")
+            with profiling.section("Ranking Perubahan", "render"):
+                st.plotly_chart(fig_change, use_container_width=True)
 
         with col2:
             display_data = sorted_data[['Kecamatan', tahun_awal, tahun_akhir, 'Perubahan', 'Perubahan_Persen']].copy()
@@ -930,45 +905,15 @@ st.markdown("---")
 # =================== ANALISIS KORELASI & KOMPOSISI ===================
 st.header("🔬 Hubungan Stunting dengan Fasilitas Kesehatan")
 
-if 'latest_year' in locals() and 'latest_month' in locals() and latest_month is not None:
-    latest_period_data_for_corr = filtered_df[
-        (filtered_df['Tahun'] == latest_year) & 
-        (filtered_df['Bulan'] == latest_month)
-    ]
-    prevalensi_df = latest_period_data_for_corr.groupby('Kecamatan').agg({
-        'Prevalensi Stunting Persen': 'mean'
-    }).reset_index()
-else:
-    prevalensi_df = filtered_df.groupby('Kecamatan').agg({'Prevalensi Stunting Persen': 'mean'}).reset_index()
+if latest_month is None:
     st.info("Analisis menggunakan rata-rata dari seluruh periode yang dipilih.")
 
-# Merge data prevalensi dan fasilitas
-analysis_df = pd.merge(prevalensi_df, faskes_df, on='Kecamatan', how='inner')
-
-if not analysis_df.empty and len(analysis_df) > 1:
-    # Hitung total fasilitas kesehatan per kecamatan
-    facility_cols = [col for col in faskes_df.columns if col != 'Kecamatan']
-    analysis_df['Total Faskes'] = analysis_df[facility_cols].sum(axis=1)
-
-    # Urutkan berdasarkan prevalensi dari tinggi ke rendah
-    display_kecamatan = analysis_df.sort_values('Prevalensi Stunting Persen', ascending=False)
-
-    # Reshape data untuk visualisasi side-by-side
-    plot_data = []
-    for _, row in display_kecamatan.iterrows():
-        plot_data.append({
-            'Kecamatan': row['Kecamatan'],
-            'Metrik': 'Persentase Stunting (%)',
-            'Nilai': row['Prevalensi Stunting Persen']
-        })
-        plot_data.append({
-            'Kecamatan': row['Kecamatan'],
-            'Metrik': 'Jumlah Fasilitas Kesehatan',
-            'Nilai': row['Total Faskes']
-        })
-    
-    plot_df = pd.DataFrame(plot_data)
-    
+# Satu tabel metrik per kecamatan (cache per filter) untuk grafik, metrik, dan insight
+analysis_df, plot_df, faskes_summary = get_faskes_analysis(
+    data_fingerprint, latest_year, latest_month, tuple(selected_year), tuple(selected_kecamatan)
+)
+
+if faskes_summary is not None:
     # Buat grafik side-by-side per kecamatan
     fig_faskes_comp = px.bar(
         plot_df,
@@ -976,7 +921,7 @@ if not analysis_df.empty and len(analysis_df) > 1:
         y='Nilai',
         color='Metrik',
         barmode='group',
-        title=f'Perbandingan Stunting vs Fasilitas Kesehatan - {len(display_kecamatan)} Kecamatan',
+        title=f'Perbandingan Stunting vs Fasilitas Kesehatan - {len(analysis_df)} Kecamatan',
         text='Nilai',
         color_discrete_map={
             'Persentase Stunting (%)': '#FF6B6B',
@@ -992,21 +937,12 @@ if not analysis_df.empty and len(analysis_df) > 1:
         xaxis={'tickangle': 45}
     )
     
-    st.plotly_chart(fig_faskes_comp, use_container_width=True)
+    profiling.lap("Hubungan Stunting dengan Fasilitas", "figure")
+    with profiling.section("Hubungan Stunting dengan Fasilitas", "render"):
+        st.plotly_chart(fig_faskes_comp, use_container_width=True)
 
     # Analisis korelasi
-    correlation = analysis_df['Prevalensi Stunting Persen'].corr(analysis_df['Total Faskes'])
-    
-    # Identifikasi kecamatan untuk metrics
-    faskes_rendah_prev_tinggi = analysis_df[
-        (analysis_df['Total Faskes'] <= analysis_df['Total Faskes'].quantile(0.3)) & 
-        (analysis_df['Prevalensi Stunting Persen'] >= analysis_df['Prevalensi Stunting Persen'].quantile(0.7))
-    ].sort_values('Prevalensi Stunting Persen', ascending=False)
-        
-    faskes_tinggi_prev_rendah = analysis_df[
-        (analysis_df['Total Faskes'] >= analysis_df['Total Faskes'].quantile(0.7)) & 
-        (analysis_df['Prevalensi Stunting Persen'] <= analysis_df['Prevalensi Stunting Persen'].quantile(0.3))
-    ].sort_values('Prevalensi Stunting Persen')
+    correlation = faskes_summary['correlation']
     
     col1, col2, col3 = st.columns(3)
     
@@ -1020,37 +956,22 @@ if not analysis_df.empty and len(analysis_df) > 1:
         st.metric("Korelasi", f"{correlation:.2f}", delta=delta_text)
     
     with col2:
-        if not faskes_tinggi_prev_rendah.empty:
-            best_kecamatan = faskes_tinggi_prev_rendah.iloc[0]['Kecamatan']
-            best_prevalensi = faskes_tinggi_prev_rendah.iloc[0]['Prevalensi Stunting Persen']
-            best_faskes = faskes_tinggi_prev_rendah.iloc[0]['Total Faskes']
-            delta_text = f"{best_faskes:.0f} faskes, {best_prevalensi:.1f}% stunting"
-        else:
-            best_row = analysis_df.nsmallest(1, 'Prevalensi Stunting Persen').iloc[0]
-            best_kecamatan = best_row['Kecamatan']
-            delta_text = f"{best_row['Total Faskes']:.0f} faskes, {best_row['Prevalensi Stunting Persen']:.1f}% stunting"
-        
-        st.metric("Kondisi Terbaik", best_kecamatan, delta=delta_text)
+        best_row = faskes_summary['best']
+        delta_text = f"{best_row['Total Faskes']:.0f} faskes, {best_row['Prevalensi Stunting Persen']:.1f}% stunting"
+        st.metric("Kondisi Terbaik", best_row['Kecamatan'], delta=delta_text)
     
     with col3:
-        if not faskes_rendah_prev_tinggi.empty:
-            challenge_kecamatan = faskes_rendah_prev_tinggi.iloc[0]['Kecamatan']
-            challenge_prevalensi = faskes_rendah_prev_tinggi.iloc[0]['Prevalensi Stunting Persen']
-            challenge_faskes = faskes_rendah_prev_tinggi.iloc[0]['Total Faskes']
-            delta_text = f"{challenge_faskes:.0f} faskes, {challenge_prevalensi:.1f}% stunting"
-        else:
-            challenge_row = analysis_df.nlargest(1, 'Prevalensi Stunting Persen').iloc[0]
-            challenge_kecamatan = challenge_row['Kecamatan']
-            delta_text = f"{challenge_row['Total Faskes']:.0f} faskes, {challenge_row['Prevalensi Stunting Persen']:.1f}% stunting"
-        
-        st.metric("Perlu Perhatian", challenge_kecamatan, delta=delta_text)
+        challenge_row = faskes_summary['challenge']
+        delta_text = f"{challenge_row['Total Faskes']:.0f} faskes, {challenge_row['Prevalensi Stunting Persen']:.1f}% stunting"
+        st.metric("Perlu Perhatian", challenge_row['Kecamatan'], delta=delta_text)
 
     # Analisis menggunakan fungsi utility
-    avg_faskes = analysis_df['Total Faskes'].mean()
-    high_faskes_low_prev = len(faskes_tinggi_prev_rendah)
-    low_faskes_high_prev = len(faskes_rendah_prev_tinggi)
-    
-    st.info(create_correlation_analysis(correlation, avg_faskes, high_faskes_low_prev, low_faskes_high_prev))
+    st.info(create_correlation_analysis(
+        correlation,
+        faskes_summary['avg_faskes'],
+        faskes_summary['high_faskes_low_prev'],
+        faskes_summary['low_faskes_high_prev'],
+    ))
 
 st.markdown("---")
 
@@ -1084,7 +1005,9 @@ fig_comp.update_layout(
     yaxis_title='Jumlah Kasus', 
     height=500
 )
-st.plotly_chart(fig_comp, use_container_width=True)
+profiling.lap("Komposisi Stunting", "figure")
+with profiling.section("Komposisi Stunting", "render"):
+    st.plotly_chart(fig_comp, use_container_width=True)
 
 # Analisis komposisi
 total_pendek = composition_df['Pendek'].sum()
@@ -1108,3 +1031,5 @@ else:
     st.info(f"**Komposisi Stunting**: Dari total {total_stunting_comp:,} kasus stunting, {pct_sangat_pendek:.0f}% ({total_sangat_pendek:,} kasus) termasuk kategori 'Sangat Pendek' yang memerlukan penanganan intensif, sementara {100-pct_sangat_pendek:.0f}% ({total_pendek:,} kasus) masuk kategori 'Pendek' yang dapat ditangani dengan intervensi preventif.")
 
 st.markdown("---")
+
+profiling.finish_run()
@@ -2,9 +2,10 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import seaborn as sns
-import matplotlib.pyplot as plt
-import json
+from core.datastore import dataset_fingerprint, load_dataset
+from core.geo import FEATURE_ID_KEY, MAP_ZOOM, get_geojson_source
+from core.pendidikan import build_partitions, build_yearly_means
+from core import profiling
 
 # ====================
 # PAGE CONFIGURATION
@@ -16,57 +17,77 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Profiling opsional (DASHBOARD_PROFILE=1 atau ?profile=1)
+profiling.start_run("pendidikan")
+
 # ====================
 # LOAD DATA
 # ====================
-@st.cache_data
-def load_data(path: str) -> pd.DataFrame:
+@st.cache_data(persist="disk")
+def load_cleaned_data(path: str, fingerprint: str) -> pd.DataFrame:
     try:
-        df = pd.read_csv(path)
-        column_mapping = {
-            'Tahun': 'tahun',
-            'Jenjang': 'jenjang',
-            'Kecamatan': 'kecamatan',
-            'APK (%)': 'apk',
-            'APM (%)': 'apm',
-            'Persentase Guru S1': 'persentase_guru_s1',
-            'Persentase Sekolah Terakreditasi': 'persentase_sekolah_akreditasi',
-            'Jumlah Siswa': 'jumlah_siswa',
-            'Jumlah Sekolah': 'jumlah_sekolah',
-            'Jumlah Penduduk Usia Sekolah': 'jumlah_penduduk_usia_sekolah'
-        }
-        df = df.rename(columns=column_mapping)
-
-        # Konversi kolom yang relevan ke tipe data numerik
-        numeric_cols = [
-            'apk', 'apm', 'persentase_guru_s1', 'persentase_sekolah_akreditasi',
-            'jumlah_siswa', 'jumlah_sekolah', 'jumlah_penduduk_usia_sekolah'
-        ]
-        for col in numeric_cols:
-            if col in df.columns:
-                if df[col].dtype == 'object':
-                    df[col] = df[col].str.replace(',', '.', regex=False)
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        # Hapus baris dengan data kosong pada kolom-kolom inti
-        core_cols = ['apk', 'apm', 'persentase_guru_s1', 'persentase_sekolah_akreditasi']
-        df.dropna(subset=core_cols, inplace=True)
-        return df
+        # Rename kolom, konversi numerik, dan dropna sudah dilakukan saat ingest
+        return load_dataset(path)
     except FileNotFoundError:
         st.error(f"File tidak ditemukan: {path}.")
         return pd.DataFrame()
 
+@st.cache_data
+def load_partitions(path: str, fingerprint: str):
+    # Partisi (tahun, jenjang) dengan rasio turunan + rata-rata tahunan per jenjang, dibangun sekali per versi data
+    df = load_cleaned_data(path, fingerprint)
+    return build_partitions(df), build_yearly_means(df)
+
+@st.cache_data
+def get_partition(path: str, fingerprint: str, tahun: int, jenjang: str) -> pd.DataFrame:
+    # Lookup per pilihan sidebar; hanya partisi kecil ini yang disalin dari cache
+    partitions, _ = load_partitions(path, fingerprint)
+    return partitions.get((int(tahun), str(jenjang)), pd.DataFrame())
+
+@st.cache_data
+def get_yearly_means(path: str, fingerprint: str, jenjang: str) -> pd.DataFrame:
+    _, yearly_means = load_partitions(path, fingerprint)
+    return yearly_means.get(str(jenjang), pd.DataFrame(columns=['tahun', 'apk', 'apm']))
+
+CORRELATION_COLS = ['apk', 'apm', 'persentase_guru_s1', 'persentase_sekolah_akreditasi']
+
+@st.cache_data
+def create_correlation_heatmap(path: str, fingerprint: str, tahun: int, jenjang: str):
+    # Heatmap korelasi Plotly per (versi data, tahun, jenjang); tidak ada figure matplotlib yang perlu ditutup
+    corr = get_partition(path, fingerprint, tahun, jenjang)[CORRELATION_COLS].corr()
+    fig = px.imshow(corr, text_auto=".2f", color_continuous_scale="Blues", aspect="auto")
+    fig.update_layout(height=400, margin={"r": 0, "t": 10, "l": 0, "b": 0})
+    return fig
+
 file_path = "data/pendidikan/pendidikan_paud_sd_smp.csv"
-df = load_data(file_path)
+# Fingerprint = hash isi CSV & kode core, dihitung sekali per rerun; cache disk Streamlit bertahan
+# saat restart dan semua cache turunan ikut dikunci dengannya
+data_fingerprint = dataset_fingerprint(file_path)
+df = load_cleaned_data(file_path, data_fingerprint)
+profiling.lap("Load data", "load")
 if df.empty:
+    profiling.finish_run()
     st.stop()
 
-# ====================
-# LOAD GEOJSON
-# ====================
-geojson_kec_path = "data/geo/35.07_kecamatan.geojson"
-with open(geojson_kec_path, 'r', encoding='utf-8') as f:
-    geojson_kec = json.load(f)
+@st.cache_data
+def create_choropleth_map(map_df: pd.DataFrame, indicator: str, indicator_label: str):
+    # Geometri kecamatan disederhanakan sesuai zoom peta dan, bila static serving aktif,
+    # dikirim sebagai URL sehingga browser hanya mengunduhnya sekali per sesi
+    fig = px.choropleth_mapbox(
+        map_df,
+        geojson=get_geojson_source(MAP_ZOOM, st.get_option("server.enableStaticServing")),
+        locations="kecamatan",
+        featureidkey=FEATURE_ID_KEY,
+        color=indicator,
+        color_continuous_scale="Viridis",
+        mapbox_style="carto-positron",
+        zoom=MAP_ZOOM,
+        center={"lat": -8.1, "lon": 112.6},
+        opacity=0.7,
+        labels={indicator: indicator_label}
+    )
+    fig.update_layout(margin={"r":0,"t":0,"l":0,"b":0}, uirevision="peta_interaktif")
+    return fig
 
 # ====================
 # SIDEBAR FILTERS
@@ -76,20 +97,14 @@ years = sorted(df['tahun'].unique())
 jenjangs = sorted(df['jenjang'].unique())
 selected_year = st.sidebar.selectbox("Pilih Tahun", years)
 selected_jenjang = st.sidebar.selectbox("Pilih Jenjang", jenjangs)
-filtered_df = df[(df['tahun'] == selected_year) & (df['jenjang'] == selected_jenjang)]
+# Partisi sudah berisi rasio_sekolah_penduduk (dihitung sekali saat load)
+filtered_df = get_partition(file_path, data_fingerprint, selected_year, selected_jenjang)
+profiling.lap("Filter sidebar", "filter")
 if filtered_df.empty:
     st.warning(f"Tidak ada data untuk Tahun {selected_year}, Jenjang {selected_jenjang}.")
+    profiling.finish_run()
     st.stop()
 
-# Buat kolom rasio baru jika data tersedia
-filtered_df = filtered_df.copy() # Menghindari SettingWithCopyWarning
-if 'jumlah_sekolah' in filtered_df.columns and 'jumlah_penduduk_usia_sekolah' in filtered_df.columns:
-    # Menghindari pembagian dengan nol
-    non_zero_mask = filtered_df['jumlah_penduduk_usia_sekolah'] != 0
-    filtered_df.loc[non_zero_mask, 'rasio_sekolah_penduduk'] = \
-        (filtered_df.loc[non_zero_mask, 'jumlah_sekolah'] / filtered_df.loc[non_zero_mask, 'jumlah_penduduk_usia_sekolah']) * 1000
-
-
 # ====================
 # SCORECARDS
 # ====================
@@ -127,26 +142,16 @@ available_indicators = {label: col for label, col in all_indicator_options.items
 
 if not available_indicators:
     st.warning("Tidak ada data yang dapat ditampilkan di peta untuk filter yang dipilih.")
+    profiling.finish_run()
     st.stop()
 
 selected_indicator_label = st.selectbox("Pilih Indikator Peta", list(available_indicators.keys()))
 selected_indicator = available_indicators[selected_indicator_label]
 
-fig_map = px.choropleth_mapbox(
-    filtered_df,
-    geojson=geojson_kec,
-    locations="kecamatan",
-    featureidkey="properties.nm_kecamatan",
-    color=selected_indicator,
-    color_continuous_scale="Viridis",
-    mapbox_style="carto-positron",
-    zoom=8,
-    center={"lat": -8.1, "lon": 112.6},
-    opacity=0.7,
-    labels={selected_indicator: selected_indicator_label}
-)
-fig_map.update_layout(margin={"r":0,"t":0,"l":0,"b":0})
-st.plotly_chart(fig_map, use_container_width=True)
+fig_map = create_choropleth_map(filtered_df, selected_indicator, selected_indicator_label)
+profiling.lap("Peta Interaktif", "figure")
+with profiling.section("Peta Interaktif", "render"):
+    st.plotly_chart(fig_map, use_container_width=True)
 
 
 # ====================
@@ -156,10 +161,12 @@ st.markdown("---")
 st.markdown("### 📊 Visualisasi Data")
 # Line Chart Perkembangan APK/APM
 st.subheader("Perkembangan APK dan APM dari Tahun ke Tahun")
-time_df = df[df['jenjang'] == selected_jenjang].groupby('tahun')[['apk', 'apm']].mean().reset_index()
+time_df = get_yearly_means(file_path, data_fingerprint, selected_jenjang)
 fig_line = px.line(time_df, x='tahun', y=['apk', 'apm'], markers=True)
 fig_line.update_yaxes(title="Persentase")
-st.plotly_chart(fig_line, use_container_width=True)
+profiling.lap("Perkembangan APK/APM", "figure")
+with profiling.section("Perkembangan APK/APM", "render"):
+    st.plotly_chart(fig_line, use_container_width=True)
 
 # Bar Chart APK & APM per Kecamatan
 st.subheader("Perbandingan APK & APM per Kecamatan")
@@ -167,7 +174,9 @@ fig_bar = go.Figure()
 fig_bar.add_trace(go.Bar(x=filtered_df['kecamatan'], y=filtered_df['apk'], name='APK'))
 fig_bar.add_trace(go.Bar(x=filtered_df['kecamatan'], y=filtered_df['apm'], name='APM'))
 fig_bar.update_layout(barmode='group', xaxis_title="Kecamatan", yaxis_title="Persentase")
-st.plotly_chart(fig_bar, use_container_width=True)
+profiling.lap("APK & APM per Kecamatan", "figure")
+with profiling.section("APK & APM per Kecamatan", "render"):
+    st.plotly_chart(fig_bar, use_container_width=True)
 
 
 # ====================
@@ -186,23 +195,27 @@ with col2:
     
 # Heatmap Korelasi
 st.subheader("🔗 Korelasi Antar Indikator")
-corr = filtered_df[['apk', 'apm', 'persentase_guru_s1', 'persentase_sekolah_akreditasi']].corr()
-fig_corr, ax = plt.subplots(figsize=(6,4))
-sns.heatmap(corr, annot=True, cmap="Blues", ax=ax)
-st.pyplot(fig_corr)
+fig_corr = create_correlation_heatmap(file_path, data_fingerprint, selected_year, selected_jenjang)
+profiling.lap("Korelasi Antar Indikator", "figure")
+with profiling.section("Korelasi Antar Indikator", "render"):
+    st.plotly_chart(fig_corr, use_container_width=True)
 
 # Treemap Komposisi
 st.subheader("🌳 Treemap Kontribusi APK per Kecamatan")
 fig_tree = px.treemap(filtered_df, path=['kecamatan'], values='apk', color='apm',
                       color_continuous_scale='Viridis',
                       title="Proporsi APK & APM per Kecamatan")
-st.plotly_chart(fig_tree, use_container_width=True)
+profiling.lap("Treemap Kontribusi APK", "figure")
+with profiling.section("Treemap Kontribusi APK", "render"):
+    st.plotly_chart(fig_tree, use_container_width=True)
 
 # Boxplot Distribusi
 st.subheader("📦 Distribusi APK dan APM")
 fig_box = px.box(filtered_df.melt(id_vars="kecamatan", value_vars=["apk","apm"]),
                  x="variable", y="value", points="all", color="variable")
-st.plotly_chart(fig_box, use_container_width=True)
+profiling.lap("Distribusi APK dan APM", "figure")
+with profiling.section("Distribusi APK dan APM", "render"):
+    st.plotly_chart(fig_box, use_container_width=True)
 
 
 
@@ -213,14 +226,18 @@ fig_gap.add_trace(go.Bar(x=filtered_df['kecamatan'], y=filtered_df['apm'], name=
 fig_gap.add_trace(go.Scatter(x=filtered_df['kecamatan'], y=[100]*len(filtered_df),
                              mode="lines", name="Target 100%", line=dict(dash="dash", color="red")))
 fig_gap.update_layout(yaxis_title="APM (%)")
-st.plotly_chart(fig_gap, use_container_width=True)
+profiling.lap("Gap Analysis APM", "figure")
+with profiling.section("Gap Analysis APM", "render"):
+    st.plotly_chart(fig_gap, use_container_width=True)
 
 # Scatter Plot
 st.subheader("📈 Hubungan % Guru S1 vs APM")
 fig_scatter = px.scatter(filtered_df, x="persentase_guru_s1", y="apm",
                          size="apk", color="kecamatan", hover_name="kecamatan",
                          labels={"persentase_guru_s1":"% Guru S1","apm":"APM"})
-st.plotly_chart(fig_scatter, use_container_width=True)
+profiling.lap("Guru S1 vs APM", "figure")
+with profiling.section("Guru S1 vs APM", "render"):
+    st.plotly_chart(fig_scatter, use_container_width=True)
 
 # Time-Series per Kecamatan
 st.subheader("⏳ Tren APK/APM per Kecamatan")
@@ -228,7 +245,9 @@ selected_kec = st.selectbox("Pilih Kecamatan", df['kecamatan'].unique())
 kec_df = df[(df['kecamatan'] == selected_kec) & (df['jenjang'] == selected_jenjang)]
 fig_kec = px.line(kec_df, x="tahun", y=["apk","apm"], markers=True,
                   title=f"Tren APK & APM - {selected_kec}")
-st.plotly_chart(fig_kec, use_container_width=True)
+profiling.lap("Tren per Kecamatan", "figure")
+with profiling.section("Tren per Kecamatan", "render"):
+    st.plotly_chart(fig_kec, use_container_width=True)
 
 # # Insight Otomatis
 # st.subheader("💡 Insight Otomatis")
@@ -248,3 +267,6 @@ st.dataframe(
         .sort_values(by='apk', ascending=False),
     use_container_width=True
 )
+profiling.lap("Data Detail per Kecamatan", "render")
+
+profiling.finish_run()
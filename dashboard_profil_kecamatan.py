@@ -0,0 +1,162 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from core.kecamatan import dimension_fingerprint, fact_table_fingerprint, load_dimension, load_fact_table, slice_profile
+from core import profiling
+
+# ====================
+# PAGE CONFIGURATION
+# ====================
+st.set_page_config(
+    page_title="Profil Kecamatan Kabupaten Malang",
+    page_icon="📍",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Profiling opsional (DASHBOARD_PROFILE=1 atau ?profile=1)
+profiling.start_run("profil_kecamatan")
+
+# ====================
+# KONFIGURASI INDIKATOR
+# ====================
+# Kolom tabel fakta -> (sektor, label, format nilai, warna delta; "inverse" = naik berarti memburuk)
+FACT_MEASURES = {
+    "Prevalensi_Stunting": ("Kesehatan", "Prevalensi Stunting", "{:.2f}%", "inverse"),
+    "Stunting": ("Kesehatan", "Balita Stunting", "{:,.0f}", "inverse"),
+    "Jumlah_Diukur": ("Kesehatan", "Balita Diukur", "{:,.0f}", "normal"),
+    "Jumlah_Puskesmas": ("Kesehatan", "Puskesmas", "{:,.0f}", "normal"),
+    "APK_PAUD": ("Pendidikan", "APK PAUD", "{:.2f}%", "normal"),
+    "APK_SD": ("Pendidikan", "APK SD", "{:.2f}%", "normal"),
+    "APK_SMP": ("Pendidikan", "APK SMP", "{:.2f}%", "normal"),
+    "Jumlah_Sekolah": ("Pendidikan", "Jumlah Sekolah", "{:,.0f}", "normal"),
+    "APM_PAUD": ("Pendidikan", "APM PAUD", "{:.2f}%", "normal"),
+    "APM_SD": ("Pendidikan", "APM SD", "{:.2f}%", "normal"),
+    "APM_SMP": ("Pendidikan", "APM SMP", "{:.2f}%", "normal"),
+    "Total_Penerima": ("Sosial", "Penerima Bansos", "{:,.0f}", "normal"),
+    "Total_Peserta_KB": ("Sosial", "Peserta KB", "{:,.0f}", "normal"),
+    "Total_Bencana": ("Sosial", "Kejadian Bencana", "{:,.0f}", "inverse"),
+    "Kerugian_Rupiah": ("Sosial", "Kerugian Bencana", "Rp{:,.0f}", "inverse"),
+}
+
+# Sektor -> (icon, kolom yang digambar bersama di grafik tren)
+FACT_SECTORS = {
+    "Kesehatan": ("🏥", ["Prevalensi_Stunting"]),
+    "Pendidikan": ("🎓", ["APK_PAUD", "APK_SD", "APK_SMP", "APM_PAUD", "APM_SD", "APM_SMP"]),
+    "Sosial": ("👥", ["Total_Penerima", "Total_Peserta_KB"]),
+}
+
+METRICS_PER_ROW = 4
+
+# ====================
+# LOAD DATA
+# ====================
+@st.cache_data(persist="disk")
+def load_cached_facts(fingerprint: str) -> pd.DataFrame:
+    # Tabel fakta (Kecamatan_ID, Tahun) dibangun sekali di cache kolumnar; hasilnya juga disimpan di disk Streamlit
+    return load_fact_table()
+
+@st.cache_data
+def load_kecamatan_dimension(fingerprint: str) -> pd.DataFrame:
+    # Kunci = isi master_kecamatan, kode core, dan versi GeoJSON (indeks geometri)
+    return load_dimension()
+
+@st.cache_data(max_entries=64)
+def get_profile(fingerprint: str, kecamatan_id: int) -> pd.DataFrame:
+    # Ketiga sektor untuk satu kecamatan = satu slice index, bukan tiga kali load data baris
+    return slice_profile(load_cached_facts(fingerprint), kecamatan_id)
+
+@st.cache_data(max_entries=64)
+def create_trend_chart(fingerprint: str, kecamatan_id: int, sector: str):
+    # Grafik tren satu sektor, di-memo per (versi data, kecamatan, sektor); None jika sektor belum punya data
+    profile = get_profile(fingerprint, kecamatan_id)
+    trend = profile[[col for col in FACT_SECTORS[sector][1] if col in profile.columns]].dropna(how="all")
+    if trend.empty:
+        return None
+    trend = trend.rename(columns={col: FACT_MEASURES[col][1] for col in trend.columns}).reset_index()
+    fig = px.line(trend, x="Tahun", y=list(trend.columns[1:]), markers=True)
+    fig.update_layout(legend_title_text="Indikator", yaxis_title=None, height=350)
+    fig.update_xaxes(dtick=1)
+    return fig
+
+def format_measure(col, value, signed=False):
+    if pd.isna(value):
+        return "-"
+    text = FACT_MEASURES[col][2].format(abs(value) if signed else value)
+    # Tanda di depan (mis. "-Rp5,000,000") agar st.metric mewarnai delta dengan benar
+    return ("-" if value < 0 else "+") + text if signed else text
+
+# ====================
+# SIDEBAR FILTERS
+# ====================
+# Fingerprint = hash isi semua CSV sumber, master kecamatan, dan kode core, dihitung sekali per rerun;
+# semua cache turunan ikut dikunci dengannya
+facts_fingerprint = fact_table_fingerprint()
+dimension = load_kecamatan_dimension(dimension_fingerprint())
+profiling.lap("Load data", "load")
+
+st.sidebar.header("📌 Filter Data")
+# Nama kanonik -> Kecamatan_ID; semua lookup berikutnya memakai kunci integer
+kecamatan_ids = dict(zip(dimension["Kecamatan"], dimension.index.tolist()))
+selected_kecamatan = st.sidebar.selectbox("Pilih Kecamatan", list(kecamatan_ids), key="profil_kecamatan")
+selected_id = kecamatan_ids[selected_kecamatan]
+profile = get_profile(facts_fingerprint, selected_id)
+if profile.empty:
+    st.warning(f"Tidak ada data untuk Kecamatan {selected_kecamatan}.")
+    profiling.finish_run()
+    st.stop()
+
+years = sorted(profile.index.tolist(), reverse=True)
+selected_year = st.sidebar.selectbox("Pilih Tahun", years)
+profiling.lap("Filter sidebar", "filter")
+
+# ====================
+# HEADER
+# ====================
+kecamatan = dimension.loc[selected_id]
+st.markdown(f"## 📍 Profil Kecamatan {kecamatan['Kecamatan']}")
+st.markdown(f"### Tahun {selected_year} - Wilayah {kecamatan['Region']}")
+st.caption(
+    "Data kesehatan memakai periode pengukuran terakhir tiap tahun; "
+    "perubahan dibandingkan dengan tahun sebelumnya."
+)
+
+current = profile.loc[selected_year]
+previous = profile.loc[selected_year - 1] if selected_year - 1 in profile.index else None
+
+# ====================
+# INDIKATOR PER SEKTOR
+# ====================
+for sector, (icon, _) in FACT_SECTORS.items():
+    st.markdown("---")
+    st.subheader(f"{icon} {sector}")
+
+    sector_cols = [col for col, (col_sector, *_) in FACT_MEASURES.items() if col_sector == sector and col in profile.columns]
+    for start in range(0, len(sector_cols), METRICS_PER_ROW):
+        columns = st.columns(METRICS_PER_ROW)
+        for column, col in zip(columns, sector_cols[start:start + METRICS_PER_ROW]):
+            _, label, _, delta_color = FACT_MEASURES[col]
+            delta = None
+            if previous is not None and pd.notna(current[col]) and pd.notna(previous[col]):
+                delta = format_measure(col, current[col] - previous[col], signed=True)
+            with column:
+                st.metric(label, format_measure(col, current[col]), delta, delta_color=delta_color)
+
+    fig = create_trend_chart(facts_fingerprint, selected_id, sector)
+    if fig is None:
+        st.info(f"Data {sector.lower()} belum tersedia untuk kecamatan ini.")
+        continue
+    profiling.lap(f"Tren {sector}", "figure")
+    with profiling.section(f"Tren {sector}", "render"):
+        st.plotly_chart(fig, use_container_width=True)
+
+# ====================
+# TABEL DETAIL DATA
+# ====================
+st.markdown("---")
+st.markdown("### 📑 Data Detail per Tahun")
+detail = profile.rename(columns={col: FACT_MEASURES[col][1] for col in profile.columns if col in FACT_MEASURES})
+st.dataframe(detail.sort_index(ascending=False), use_container_width=True)
+profiling.lap("Data Detail per Tahun", "render")
+
+profiling.finish_run()
@@ -3,11 +3,21 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
-import re
-import folium
-from streamlit_folium import st_folium
+import numpy as np
 import json
-import os
+from core import lazy, profiling
+from core.aggregates import ROW_COUNT_COL, build_cubes
+from core.datastore import dataset_fingerprint, load_dataset
+from core.kecamatan import kecamatan_ids, load_dimension
+from core.schema import SchemaError, column, columns, has_role, validate_dataset
+from core.sosial import (
+    calculate_kpis,
+    prepare_bantuan_sosial_data_for_map,
+    prepare_disaster_data_for_map,
+    prepare_kb_performance_data_for_map,
+    prepare_peserta_kb_data_for_map,
+    query_cubes,
+)
 
 # Konfigurasi halaman
 st.set_page_config(
@@ -430,291 +440,98 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ===========================
-# MAPPING JENIS BENCANA
-# ===========================
-JENIS_BENCANA_MAPPING = {
-    "Gempa_Bumi": "Gempa Bumi",
-    "Tsunami": "Tsunami", 
-    "Banjir": "Banjir",
-    "Tanah_Longsor": "Tanah Longsor",
-    "Letusan_Gunung_Api": "Letusan Gunung Api",
-    "Kekeringan": "Kekeringan",
-    "Gelombang_Ekstrem_dan_Abrasi": "Gelombang Ekstrem dan Abrasi",
-    "Cuaca_Ekstrem_Angin_Puting_Beliung": "Cuaca Ekstrem Angin Puting Beliung",
-    "Kebakaran_Hutan_dan_Lahan": "Kebakaran Hutan dan Lahan",
-    "Kebakaran_Gedung_dan_Pemukiman": "Kebakaran Gedung dan Pemukiman",
-    "Epidemi_dan_Wabah_Penyakit": "Epidemi dan Wabah Penyakit",
-    "Gagal_Teknologi": "Gagal Teknologi",
-    "Konflik_Sosial": "Konflik Sosial",
-    "Angin_Kencang": "Angin Kencang",
-    "Kebakaran": "Kebakaran",
-    "Erupsi_Gunung_Api": "Erupsi Gunung Api",
-    "Pohon_Tumbang": "Pohon Tumbang"
-}
-
-# ===========================
-# UTILITY FUNCTIONS
-# ===========================
-def convert_indonesian_number(value):
-    """Convert Indonesian number format to integer"""
-    if pd.isna(value) or value == '':
-        return 0
-    
-    str_value = str(value).strip()
-    
-    try:
-        if str_value.isdigit():
-            return int(str_value)
-        
-        if '.' in str_value and ',' not in str_value:
-            parts = str_value.split('.')
-            if len(parts) >= 2 and all(part.isdigit() for part in parts):
-                if len(parts[0]) <= 3 and all(len(part) == 3 for part in parts[1:]):
-                    clean_number = str_value.replace('.', '')
-                    return int(clean_number)
-        
-        return int(float(str_value))
-        
-    except (ValueError, TypeError):
-        return 0
-
-def extract_rupiah_value(value):
-    """Extract numeric value from Indonesian Rupiah format"""
-    if pd.isna(value) or value == '':
-        return 0
-    
-    str_val = str(value).strip()
-    
-    if str_val.lower() in ['rp0', '0', 'rp 0']:
-        return 0
-    
-    str_val = str_val.replace('Rp', '').replace('rp', '').strip()
-    
-    try:
-        if '.' in str_val and ',' not in str_val:
-            parts = str_val.split('.')
-            if len(parts) >= 2:
-                if len(parts[0]) <= 3 and all(len(part) == 3 for part in parts[1:]) and all(part.isdigit() for part in parts):
-                    clean_number = str_val.replace('.', '')
-                    return int(clean_number)
-        
-        if ',' in str_val:
-            str_val = str_val.replace(',', '.')
-        
-        return int(float(str_val))
-        
-    except (ValueError, TypeError):
-        digits_only = ''.join(filter(str.isdigit, str_val))
-        if digits_only:
-            return int(digits_only)
-        return 0
-
-def clean_numeric_columns(df, exclude_columns=None):
-    """Clean numeric columns but exclude specified columns"""
-    if exclude_columns is None:
-        exclude_columns = []
-    
-    df_clean = df.copy()
-    numeric_patterns = ['jumlah', 'total', 'count', 'peserta', 'penerima', 'kasus', 'bencana']
-    
-    for col in df_clean.columns:
-        if col in exclude_columns:
-            continue
-        
-        if 'kerugian' in col.lower():
-            continue
-            
-        col_lower = col.lower().strip()
-        if any(pattern in col_lower for pattern in numeric_patterns):
-            df_clean[col] = df_clean[col].apply(convert_indonesian_number)
-        elif df_clean[col].dtype == 'object':
-            sample_vals = df_clean[col].dropna().head(5)
-            if len(sample_vals) > 0:
-                numeric_count = 0
-                for val in sample_vals:
-                    str_val = str(val).strip()
-                    if str_val.isdigit() or ('.' in str_val and len(str_val.replace('.', '').replace(' ', '')) > 0):
-                        try:
-                            convert_indonesian_number(val)
-                            numeric_count += 1
-                        except:
-                            pass
-                
-                if numeric_count / len(sample_vals) > 0.6:
-                    df_clean[col] = df_clean[col].apply(convert_indonesian_number)
-    
-    return df_clean
-
-# ===========================
-# MAP DATA PREPARATION FUNCTIONS - DIPERBAIKI
+# MAP CREATION FUNCTIONS
 # ===========================
 
-def prepare_disaster_data_for_map(data, selected_years):
-    """Prepare disaster data for mapping"""
-    try:
-        if 'Bencana Alam' not in data:
-            return None
-        
-        df = data['Bencana Alam'].copy()
-        
-        kecamatan_col = None
-        jumlah_col = None
-        tahun_col = None
-        
-        for col in df.columns:
-            col_lower = col.lower().strip()
-            if 'kecamatan' in col_lower:
-                kecamatan_col = col
-            elif 'tahun' in col_lower:
-                tahun_col = col
-            elif any(word in col_lower for word in ['jumlah', 'bencana']) and df[col].dtype in ['int64', 'float64']:
-                jumlah_col = col
-        
-        if not kecamatan_col:
-            return None
-        
-        if tahun_col and "Semua Tahun" not in selected_years:
-            df = df[df[tahun_col].isin(selected_years)]
-        
-        if jumlah_col:
-            map_data = df.groupby(kecamatan_col)[jumlah_col].sum().reset_index()
-            map_data.columns = ['Kecamatan', 'Total_Bencana']
-        else:
-            map_data = df[kecamatan_col].value_counts().reset_index()
-            map_data.columns = ['Kecamatan', 'Total_Bencana']
-        
-        map_data['Kecamatan'] = map_data['Kecamatan'].str.strip().str.title()
-        return map_data
-        
-    except Exception as e:
-        return None
+# map_type -> (kolom nilai, satuan, icon, format nilai)
+MAP_LAYER_CONFIG = {
+    "Bencana Alam": ('Total_Bencana', ' kejadian bencana', '🌊', '{:,.0f}'),
+    "Bantuan Sosial": ('Total_Penerima', ' penerima bantuan', '👥', '{:,.0f}'),
+    "KB Performance": ('Growth_Rate', '%', '📈', '{:.2f}'),
+    "Peserta KB": ('Total_Peserta', ' peserta KB', '👶', '{:,.0f}'),
+}
 
-def prepare_bantuan_sosial_data_for_map(data, selected_years):
-    """Prepare bantuan sosial data for mapping"""
-    try:
-        if 'Bantuan Sosial' not in data:
-            return None
-        
-        df = data['Bantuan Sosial'].copy()
-        
-        kecamatan_col = None
-        penerima_col = None
-        tahun_col = None
-        
-        for col in df.columns:
-            col_lower = col.lower().strip()
-            if 'kecamatan' in col_lower:
-                kecamatan_col = col
-            elif 'penerima' in col_lower:
-                penerima_col = col
-            elif 'tahun' in col_lower:
-                tahun_col = col
-        
-        if not all([kecamatan_col, penerima_col]):
-            return None
-        
-        if tahun_col and "Semua Tahun" not in selected_years:
-            df = df[df[tahun_col].isin(selected_years)]
-        
-        map_data = df.groupby(kecamatan_col)[penerima_col].sum().reset_index()
-        map_data.columns = ['Kecamatan', 'Total_Penerima']
-        
-        map_data['Kecamatan'] = map_data['Kecamatan'].str.strip().str.title()
-        return map_data
-        
-    except Exception as e:
-        return None
+# Marker kecamatan tetap terpisah di zoom awal; cluster baru terbentuk saat peta di-zoom out
+# atau ketika titik desa ditambahkan
+MARKER_CLUSTER_OPTIONS = {'disableClusteringAtZoom': 10, 'spiderfyOnMaxZoom': False}
 
-def prepare_kb_performance_data_for_map(data):
-    """Prepare KB performance data for mapping - DIPERBAIKI"""
-    try:
-        if 'Data Kb Performance' not in data:
-            return None
-        
-        df = data['Data Kb Performance'].copy()
-        
-        kecamatan_col = None
-        growth_col = None
-        
-        for col in df.columns:
-            col_lower = col.lower().strip()
-            if 'kecamatan' in col_lower:
-                kecamatan_col = col
-            elif 'growth' in col_lower and '2024' in col_lower and '2023' in col_lower:
-                growth_col = col
-                break
-        
-        if not all([kecamatan_col, growth_col]):
-            return None
-        
-        # Clean growth data - PERBAIKAN UTAMA
-        df_clean = df.copy()
-        if df_clean[growth_col].dtype == 'object':
-            # Remove % and convert to numeric
-            df_clean['Growth_Rate_Numeric'] = df_clean[growth_col].astype(str).str.replace('%', '').str.replace(',', '.').str.strip()
-            df_clean['Growth_Rate_Numeric'] = pd.to_numeric(df_clean['Growth_Rate_Numeric'], errors='coerce')
-            numeric_col = 'Growth_Rate_Numeric'
-        else:
-            numeric_col = growth_col
-        
-        map_data = df_clean[[kecamatan_col, numeric_col]].copy()
-        map_data.columns = ['Kecamatan', 'Growth_Rate']
-        map_data = map_data.dropna()
-        
-        map_data['Kecamatan'] = map_data['Kecamatan'].str.strip().str.title()
-        return map_data
-        
-    except Exception as e:
-        return None
+# Satu callback JS untuk semua marker; row = [lat, lon, warna, icon, kecamatan, nilai terformat].
+# Tooltip dan popup disusun di browser agar HTML popup tidak diulang untuk setiap titik.
+MARKER_CALLBACK_TEMPLATE = """
+function (row) {
+    var label = %s;
+    var icon = L.AwesomeMarkers.icon({
+        icon: row[3], iconColor: 'white', markerColor: row[2], prefix: 'glyphicon', extraClasses: 'fa-rotate-0'
+    });
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindTooltip(row[4] + ': ' + row[5], {sticky: true});
+    marker.bindPopup(
+        '<div style="font-family: Arial, sans-serif; min-width: 200px;">' +
+        '<h4 style="margin: 0; color: #2c3e50;">' + row[4] + '</h4>' +
+        '<hr style="margin: 5px 0;">' +
+        '<p style="margin: 5px 0;"><strong>' + label + ':</strong> ' + row[5] + '</p>' +
+        '</div>',
+        {maxWidth: 300}
+    );
+    return marker;
+}
+"""
 
-def prepare_peserta_kb_data_for_map(data, selected_years):
-    """Prepare peserta KB data for mapping"""
-    try:
-        if 'Peserta Kb' not in data:
-            return None
-        
-        df = data['Peserta Kb'].copy()
-        
-        kecamatan_col = None
-        peserta_col = None
-        tahun_col = None
-        
-        for col in df.columns:
-            col_lower = col.lower().strip()
-            if 'kecamatan' in col_lower:
-                kecamatan_col = col
-            elif 'peserta' in col_lower:
-                peserta_col = col
-            elif 'tahun' in col_lower:
-                tahun_col = col
-        
-        if not all([kecamatan_col, peserta_col]):
-            return None
-        
-        if tahun_col and "Semua Tahun" not in selected_years:
-            df = df[df[tahun_col].isin(selected_years)]
-        
-        map_data = df.groupby(kecamatan_col)[peserta_col].sum().reset_index()
-        map_data.columns = ['Kecamatan', 'Total_Peserta']
-        
-        map_data['Kecamatan'] = map_data['Kecamatan'].str.strip().str.title()
-        return map_data
-        
-    except Exception as e:
-        return None
+def get_marker_styles(values, map_type):
+    """Warna dan icon marker untuk seluruh nilai sekaligus (vektor)"""
+    values = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+    
+    if map_type == "KB Performance":
+        conditions = [values >= 2, values >= 0, values >= -5]
+        colors = ['green', 'lightgreen', 'orange']
+        icons = ['thumbs-up', 'arrow-up', 'minus']
+        return np.select(conditions, colors, 'red'), np.select(conditions, icons, 'arrow-down')
+    
+    max_val = np.nanmax(values) if len(values) else 0
+    conditions = [values == 0, values <= max_val * 0.3, values <= max_val * 0.6]
+    if map_type == "Bencana Alam":
+        colors, default_color = ['green', 'lightgreen', 'orange'], 'red'
+        icons, default_icon = ['ok', 'info-sign', 'warning-sign'], 'exclamation-sign'
+    else:
+        colors, default_color = ['red', 'orange', 'lightblue'], 'green'
+        icons, default_icon = ['remove', 'user', 'heart'], 'star'
+    return np.select(conditions, colors, default_color), np.select(conditions, icons, default_icon)
 
-# ===========================
-# MAP CREATION FUNCTIONS
-# ===========================
+def build_marker_rows(map_data, map_type, dimension):
+    """Baris data marker [lat, lon, warna, icon, kecamatan, nilai] untuk FastMarkerCluster"""
+    if map_data is None or map_data.empty or map_type not in MAP_LAYER_CONFIG:
+        return []
+    
+    value_col, unit, _, value_format = MAP_LAYER_CONFIG[map_type]
+    if value_col not in map_data.columns:
+        return []
+    
+    # Join ke dimensi kecamatan lewat Kecamatan_ID (int); hanya kecamatan yang centroid-nya diketahui
+    centroids = dimension[['Lat', 'Lon']].reindex(kecamatan_ids(map_data['Kecamatan'], dimension).to_numpy())
+    known = centroids['Lat'].notna().to_numpy()
+    layer = map_data.loc[known, ['Kecamatan', value_col]]
+    if layer.empty:
+        return []
+    
+    centroids = centroids[known]
+    colors, icons = get_marker_styles(layer[value_col], map_type)
+    formatted = layer[value_col].map(value_format.format) + unit
+    
+    return [
+        [lat, lon, color, icon, kecamatan, value]
+        for lat, lon, color, icon, kecamatan, value in zip(
+            centroids['Lat'].tolist(), centroids['Lon'].tolist(), colors, icons, layer['Kecamatan'], formatted
+        )
+    ]
 
-def create_map_with_data(map_data, map_type, selected_years=None):
+def create_map_with_data(map_data, map_type, selected_years=None, marker_rows=None):
     """Create a map with different data types"""
     try:
         # Koordinat tengah Kabupaten Malang yang lebih akurat
         center_lat = -8.0710
         center_lon = 112.6333
         
-        m = folium.Map(
+        m = lazy.folium.Map(
             location=[center_lat, center_lon],
             zoom_start=10,
             tiles='OpenStreetMap',
@@ -722,145 +539,18 @@ def create_map_with_data(map_data, map_type, selected_years=None):
             height='500px'
         )
         
-        # Koordinat kecamatan
-        kecamatan_coords = {
-            'Dau': [-7.9167, 112.5833],
-            'Pujon': [-7.8667, 112.4833],
-            'Ngantang': [-7.7667, 112.4333],
-            'Kasembon': [-7.8167, 112.3833],
-            'Singosari': [-7.8833, 112.6667],
-            'Lawang': [-7.8333, 112.6833],
-            'Pakisaji': [-8.0667, 112.6167],
-            'Tajinan': [-8.1500, 112.5833],
-            'Tumpang': [-8.0167, 112.7333],
-            'Pakis': [-7.9333, 112.7167],
-            'Jabung': [-8.0833, 112.7833],
-            'Wajak': [-8.1167, 112.7333],
-            'Dampit': [-8.2167, 112.7500],
-            'Tirtoyudo': [-8.3333, 112.6833],
-            'Ampelgading': [-8.2833, 112.6167],
-            'Poncokusumo': [-8.0500, 112.7833],
-            'Wagir': [-8.0333, 112.5500],
-            'Karangploso': [-7.9167, 112.6000],
-            'Gondanglegi': [-8.1500, 112.6833],
-            'Kepanjen': [-8.1333, 112.5833],
-            'Sumberpucung': [-8.1000, 112.4833],
-            'Sumbermanjing Wetan': [-8.3500, 112.5833],
-            'Donomulyo': [-8.4000, 112.5000],
-            'Pagak': [-8.3667, 112.4500],
-            'Bantur': [-8.3167, 112.5167],
-            'Turen': [-8.1667, 112.6000],
-            'Kalipare': [-8.2000, 112.5500],
-            'Bululawang': [-8.0833, 112.6000],
-            'Ngajum': [-8.1167, 112.5167],
-            'Gedangan': [-8.0667, 112.7667],
-            'Kromengan': [-8.1833, 112.5667],
-            'Wonosari': [-8.2833, 112.5167],
-            'Pagelaran': [-8.3167, 112.4833]
-        }
+        if marker_rows is None:
+            # Jalur cadangan tanpa cache (get_map_layer gagal menyiapkan marker)
+            marker_rows = build_marker_rows(map_data, map_type, load_dimension())
         
-        if map_data is not None and not map_data.empty:
-            # Tentukan kolom value, unit, dan icon berdasarkan map_type
-            if map_type == "Bencana Alam":
-                value_col = 'Total_Bencana'
-                unit = ' kejadian bencana'
-                icon_base = '🌊'
-                def get_disaster_icon_color(value, max_val):
-                    if value == 0:
-                        return 'green', 'ok'
-                    elif value <= max_val * 0.3:
-                        return 'lightgreen', 'info-sign'
-                    elif value <= max_val * 0.6:
-                        return 'orange', 'warning-sign'
-                    else:
-                        return 'red', 'exclamation-sign'
-                        
-            elif map_type == "Bantuan Sosial":
-                value_col = 'Total_Penerima'
-                unit = ' penerima bantuan'
-                icon_base = '👥'
-                def get_bantuan_icon_color(value, max_val):
-                    if value == 0:
-                        return 'red', 'remove'
-                    elif value <= max_val * 0.3:
-                        return 'orange', 'user'
-                    elif value <= max_val * 0.6:
-                        return 'lightblue', 'heart'
-                    else:
-                        return 'green', 'star'
-                        
-            elif map_type == "KB Performance":
-                value_col = 'Growth_Rate'
-                unit = '%'
-                icon_base = '📈'
-                def get_kb_performance_icon_color(value):
-                    if value >= 2:
-                        return 'green', 'thumbs-up'
-                    elif value >= 0:
-                        return 'lightgreen', 'arrow-up'
-                    elif value >= -5:
-                        return 'orange', 'minus'
-                    else:
-                        return 'red', 'arrow-down'
-                        
-            elif map_type == "Peserta KB":
-                value_col = 'Total_Peserta'
-                unit = ' peserta KB'
-                icon_base = '👶'
-                def get_peserta_kb_icon_color(value, max_val):
-                    if value == 0:
-                        return 'red', 'remove'
-                    elif value <= max_val * 0.3:
-                        return 'orange', 'user'
-                    elif value <= max_val * 0.6:
-                        return 'lightblue', 'heart'
-                    else:
-                        return 'green', 'star'
-            else:
-                return m
-            
-            if value_col not in map_data.columns:
-                return m
-            
-            max_value = map_data[value_col].max()
-            min_value = map_data[value_col].min()
-            
-            for _, row in map_data.iterrows():
-                kecamatan = row['Kecamatan']
-                value = row[value_col]
-                
-                coords = kecamatan_coords.get(kecamatan)
-                if coords:
-                    # Tentukan warna dan icon berdasarkan jenis data
-                    if map_type == "Bencana Alam":
-                        color, icon = get_disaster_icon_color(value, max_value)
-                    elif map_type == "Bantuan Sosial":
-                        color, icon = get_bantuan_icon_color(value, max_value)
-                    elif map_type == "KB Performance":
-                        color, icon = get_kb_performance_icon_color(value)
-                    elif map_type == "Peserta KB":
-                        color, icon = get_peserta_kb_icon_color(value, max_value)
-                    
-                    # Format nilai untuk popup
-                    if map_type == "KB Performance":
-                        formatted_value = f"{value:.2f}{unit}"
-                    else:
-                        formatted_value = f"{value:,.0f}{unit}"
-                    
-                    popup_content = f"""
-                    <div style="font-family: Arial, sans-serif; min-width: 200px;">
-                        <h4 style="margin: 0; color: #2c3e50;">{kecamatan}</h4>
-                        <hr style="margin: 5px 0;">
-                        <p style="margin: 5px 0;"><strong>{icon_base} {map_type}:</strong> {formatted_value}</p>
-                    </div>
-                    """
-                    
-                    folium.Marker(
-                        location=coords,
-                        popup=folium.Popup(popup_content, max_width=300),
-                        tooltip=f"{kecamatan}: {formatted_value}",
-                        icon=folium.Icon(color=color, icon=icon)
-                    ).add_to(m)
+        # Satu layer marker yang dirender di browser, bukan satu folium.Marker per baris
+        if marker_rows:
+            icon_base = MAP_LAYER_CONFIG[map_type][2]
+            lazy.folium_plugins.FastMarkerCluster(
+                marker_rows,
+                callback=MARKER_CALLBACK_TEMPLATE % json.dumps(f"{icon_base} {map_type}"),
+                options=MARKER_CLUSTER_OPTIONS
+            ).add_to(m)
         
         return m
         
@@ -960,22 +650,20 @@ def analyze_map_data_generic(map_data, map_type, selected_years=None):
 # ANALYSIS FUNCTIONS UNTUK KEKERASAN - LENGKAP
 # ===========================
 
-def analyze_kekerasan_gender_comparison(data, selected_years):
+def analyze_kekerasan_gender_comparison(fingerprint, data, selected_years):
     """Analyze kekerasan berdasarkan gender"""
     try:
         if 'Kekerasan Anak' not in data:
             return "Data kekerasan anak tidak tersedia untuk analisis."
         
-        df = data['Kekerasan Anak'].copy()
-        
-        if "Semua Tahun" not in selected_years:
-            df = df[df['Tahun'].isin(selected_years)]
+        gender_data = query_cube(fingerprint, 'Kekerasan Anak', selected_years, ('Tahun', 'Gender'))
+        if gender_data is None:
+            return "Data kekerasan anak tidak tersedia untuk analisis."
         
-        if df.empty:
+        if gender_data.empty:
             return "Tidak ada data untuk periode yang dipilih."
         
-        gender_data = df.groupby(['Tahun', 'Gender'])['Jumlah_Kasus'].sum().reset_index()
-        total_by_gender = df.groupby('Gender')['Jumlah_Kasus'].sum()
+        total_by_gender = gender_data.groupby('Gender', observed=True)['Jumlah_Kasus'].sum()
         
         if len(total_by_gender) >= 2:
             gender_tertinggi = total_by_gender.idxmax()
@@ -986,7 +674,7 @@ def analyze_kekerasan_gender_comparison(data, selected_years):
             # Find year with highest cases for each gender
             tahun_puncak = {}
             for gender in total_by_gender.index:
-                gender_yearly = df[df['Gender'] == gender].groupby('Tahun')['Jumlah_Kasus'].sum()
+                gender_yearly = gender_data[gender_data['Gender'] == gender].set_index('Tahun')['Jumlah_Kasus']
                 tahun_puncak[gender] = gender_yearly.idxmax()
             
             insight = f"Korban kekerasan anak dengan gender {gender_tertinggi.lower()} lebih dominan dengan total {kasus_tertinggi:,.0f} kasus, " \
@@ -994,7 +682,7 @@ def analyze_kekerasan_gender_comparison(data, selected_years):
                      f"Puncak kasus korban {gender_tertinggi.lower()} terjadi pada tahun {tahun_puncak[gender_tertinggi]}, " \
                      f"sementara korban {gender_terendah.lower()} tertinggi pada tahun {tahun_puncak[gender_terendah]}."
         else:
-            total_kasus = df['Jumlah_Kasus'].sum()
+            total_kasus = gender_data['Jumlah_Kasus'].sum()
             insight = f"Total kasus kekerasan anak adalah {total_kasus:,.0f} kasus dalam periode yang dipilih."
         
         return insight
@@ -1002,27 +690,26 @@ def analyze_kekerasan_gender_comparison(data, selected_years):
     except Exception as e:
         return f"Error dalam analisis: {str(e)}"
 
-def analyze_kekerasan_perempuan_yearly(data, selected_years):
+def analyze_kekerasan_perempuan_yearly(fingerprint, data, selected_years):
     """Analyze kekerasan perempuan per tahun berdasarkan bentuk kekerasan"""
     try:
         if 'Bentuk Kekerasan Perempuan' not in data:
             return "Data kekerasan perempuan tidak tersedia untuk analisis."
         
-        df = data['Bentuk Kekerasan Perempuan'].copy()
-        
-        if "Semua Tahun" not in selected_years:
-            df = df[df['Tahun'].isin(selected_years)]
+        chart_data = query_cube(fingerprint, 'Bentuk Kekerasan Perempuan', selected_years, ('Tahun', 'Bentuk_Kekerasan'))
+        if chart_data is None:
+            return "Data kekerasan perempuan tidak tersedia untuk analisis."
         
-        if df.empty:
+        if chart_data.empty:
             return "Tidak ada data untuk periode yang dipilih."
         
         # Analisis bentuk kekerasan dominan
-        bentuk_total = df.groupby('Bentuk_Kekerasan')['Jumlah_Kasus'].sum().sort_values(ascending=False)
+        bentuk_total = chart_data.groupby('Bentuk_Kekerasan', observed=True)['Jumlah_Kasus'].sum().sort_values(ascending=False)
         bentuk_tertinggi = bentuk_total.index[0]
         kasus_tertinggi = bentuk_total.iloc[0]
         
         # Analisis tahun dengan kasus tertinggi
-        yearly_total = df.groupby('Tahun')['Jumlah_Kasus'].sum()
+        yearly_total = chart_data.groupby('Tahun')['Jumlah_Kasus'].sum()
         tahun_tertinggi = yearly_total.idxmax()
         kasus_tahun_tertinggi = yearly_total.max()
         
@@ -1032,7 +719,7 @@ def analyze_kekerasan_perempuan_yearly(data, selected_years):
         else:
             tren = "stabil"
         
-        total_kasus = df['Jumlah_Kasus'].sum()
+        total_kasus = chart_data['Jumlah_Kasus'].sum()
         persentase_dominan = (kasus_tertinggi / total_kasus) * 100
         
         insight = f"{bentuk_tertinggi} adalah bentuk kekerasan terhadap perempuan yang paling dominan dengan {kasus_tertinggi:,.0f} kasus " \
@@ -1045,30 +732,29 @@ def analyze_kekerasan_perempuan_yearly(data, selected_years):
     except Exception as e:
         return f"Error dalam analisis: {str(e)}"
 
-def analyze_kekerasan_perempuan_usia(data, selected_years):
+def analyze_kekerasan_perempuan_usia(fingerprint, data, selected_years):
     """Analyze kekerasan perempuan berdasarkan kelompok usia"""
     try:
         if 'Usia Kekerasan Perempuan' not in data:
             return "Data usia kekerasan perempuan tidak tersedia untuk analisis."
         
-        df = data['Usia Kekerasan Perempuan'].copy()
-        
-        if "Semua Tahun" not in selected_years:
-            df = df[df['Tahun'].isin(selected_years)]
+        chart_data = query_cube(fingerprint, 'Usia Kekerasan Perempuan', selected_years, ('Tahun', 'Kelompok_Usia'))
+        if chart_data is None:
+            return "Data usia kekerasan perempuan tidak tersedia untuk analisis."
         
-        if df.empty:
+        if chart_data.empty:
             return "Tidak ada data untuk periode yang dipilih."
         
         # Analisis kelompok usia paling rentan
-        usia_total = df.groupby('Kelompok_Usia')['Jumlah_Kasus'].sum().sort_values(ascending=False)
+        usia_total = chart_data.groupby('Kelompok_Usia', observed=True)['Jumlah_Kasus'].sum().sort_values(ascending=False)
         usia_tertinggi = usia_total.index[0]
         kasus_tertinggi = usia_total.iloc[0]
         
-        total_kasus = df['Jumlah_Kasus'].sum()
+        total_kasus = chart_data['Jumlah_Kasus'].sum()
         persentase_tertinggi = (kasus_tertinggi / total_kasus) * 100
         
         # Analisis tahun dengan kasus tertinggi untuk kelompok usia dominan
-        usia_yearly = df[df['Kelompok_Usia'] == usia_tertinggi].groupby('Tahun')['Jumlah_Kasus'].sum()
+        usia_yearly = chart_data[chart_data['Kelompok_Usia'] == usia_tertinggi].set_index('Tahun')['Jumlah_Kasus']
         tahun_puncak = usia_yearly.idxmax()
         
         insight = f"Kelompok usia {usia_tertinggi} adalah yang paling rentan mengalami kekerasan dengan {kasus_tertinggi:,.0f} kasus " \
@@ -1087,22 +773,21 @@ def analyze_kekerasan_perempuan_usia(data, selected_years):
     except Exception as e:
         return f"Error dalam analisis: {str(e)}"
 
-def analyze_kekerasan_anak_monthly_pattern(data, selected_years):
+def analyze_kekerasan_anak_monthly_pattern(fingerprint, data, selected_years):
     """Analyze pola bulanan kekerasan anak"""
     try:
         if 'Kekerasan Anak' not in data:
             return "Data kekerasan anak tidak tersedia untuk analisis."
         
-        df = data['Kekerasan Anak'].copy()
-        
-        if "Semua Tahun" not in selected_years:
-            df = df[df['Tahun'].isin(selected_years)]
+        pivot_data = query_cube(fingerprint, 'Kekerasan Anak', selected_years, ('Tahun', 'Bulan'))
+        if pivot_data is None:
+            return "Data kekerasan anak tidak tersedia untuk analisis."
         
-        if df.empty:
+        if pivot_data.empty:
             return "Tidak ada data untuk periode yang dipilih."
         
         # Analisis bulan dengan kasus tertinggi
-        monthly_total = df.groupby('Bulan')['Jumlah_Kasus'].sum().sort_values(ascending=False)
+        monthly_total = pivot_data.groupby('Bulan', observed=True)['Jumlah_Kasus'].sum().sort_values(ascending=False)
         bulan_tertinggi = monthly_total.index[0]
         kasus_tertinggi = monthly_total.iloc[0]
         
@@ -1110,11 +795,11 @@ def analyze_kekerasan_anak_monthly_pattern(data, selected_years):
         kasus_terendah = monthly_total.iloc[-1]
         
         # Analisis tahun dan bulan dengan kombinasi kasus tertinggi
-        yearly_monthly = df.groupby(['Tahun', 'Bulan'])['Jumlah_Kasus'].sum()
+        yearly_monthly = pivot_data.set_index(['Tahun', 'Bulan'])['Jumlah_Kasus']
         puncak_kombinasi = yearly_monthly.idxmax()
         kasus_puncak = yearly_monthly.max()
         
-        total_kasus = df['Jumlah_Kasus'].sum()
+        total_kasus = pivot_data['Jumlah_Kasus'].sum()
         rata_rata_bulanan = monthly_total.mean()
         
         insight = f"Bulan {bulan_tertinggi} adalah periode dengan kasus kekerasan anak tertinggi ({kasus_tertinggi:,.0f} kasus), " \
@@ -1128,27 +813,24 @@ def analyze_kekerasan_anak_monthly_pattern(data, selected_years):
     except Exception as e:
         return f"Error dalam analisis: {str(e)}"
 
-def analyze_kekerasan_anak_cumulative(data, selected_years):
+def analyze_kekerasan_anak_cumulative(fingerprint, data, selected_years):
     """Analyze kumulatif kekerasan anak"""
     try:
         if 'Kekerasan Anak' not in data:
             return "Data kekerasan anak tidak tersedia untuk analisis."
         
-        df = data['Kekerasan Anak'].copy()
-        
-        if "Semua Tahun" not in selected_years:
-            df = df[df['Tahun'].isin(selected_years)]
+        # Analisis kumulatif per gender dan tahun
+        yearly_data = query_cube(fingerprint, 'Kekerasan Anak', selected_years, ('Tahun', 'Gender'))
+        if yearly_data is None:
+            return "Data kekerasan anak tidak tersedia untuk analisis."
         
-        if df.empty:
+        if yearly_data.empty:
             return "Tidak ada data untuk periode yang dipilih."
         
-        # Analisis kumulatif per gender dan tahun
-        yearly_data = df.groupby(['Tahun', 'Gender'])['Jumlah_Kasus'].sum().reset_index()
-        
-        total_by_gender = df.groupby('Gender')['Jumlah_Kasus'].sum()
-        total_keseluruhan = df['Jumlah_Kasus'].sum()
+        total_by_gender = yearly_data.groupby('Gender', observed=True)['Jumlah_Kasus'].sum()
+        total_keseluruhan = yearly_data['Jumlah_Kasus'].sum()
         
-        years = sorted(df['Tahun'].unique())
+        years = sorted(yearly_data['Tahun'].unique())
         
         if len(total_by_gender) >= 2:
             gender_dominan = total_by_gender.idxmax()
@@ -1178,24 +860,18 @@ def analyze_kekerasan_anak_cumulative(data, selected_years):
 # CHART FUNCTIONS UNTUK KEKERASAN - LENGKAP
 # ===========================
 
-def create_kekerasan_gender_comparison_chart(data, selected_years):
+def create_kekerasan_gender_comparison_chart(fingerprint, data, selected_years):
     """Perbandingan Kekerasan berdasarkan Gender per Tahun - Stacked Bar Chart"""
     try:
         if 'Kekerasan Anak' not in data:
             return None
         
-        df = data['Kekerasan Anak'].copy()
-        
-        # Filter data berdasarkan tahun yang dipilih
-        if "Semua Tahun" not in selected_years:
-            df = df[df['Tahun'].isin(selected_years)]
+        # Slice cube tahun x gender (dipakai bersama dengan analisisnya)
+        chart_data = query_cube(fingerprint, 'Kekerasan Anak', selected_years, ('Tahun', 'Gender'))
         
-        if df.empty:
+        if chart_data is None or chart_data.empty:
             return None
         
-        # Group by tahun dan gender
-        chart_data = df.groupby(['Tahun', 'Gender'])['Jumlah_Kasus'].sum().reset_index()
-        
         fig = px.bar(
             chart_data,
             x='Tahun',
@@ -1221,24 +897,18 @@ def create_kekerasan_gender_comparison_chart(data, selected_years):
     except Exception as e:
         return None
 
-def create_kekerasan_perempuan_yearly_chart(data, selected_years):
+def create_kekerasan_perempuan_yearly_chart(fingerprint, data, selected_years):
     """Tren Kekerasan Perempuan per Tahun - Line Chart"""
     try:
         if 'Bentuk Kekerasan Perempuan' not in data:
             return None
         
-        df = data['Bentuk Kekerasan Perempuan'].copy()
-        
-        # Filter data berdasarkan tahun yang dipilih
-        if "Semua Tahun" not in selected_years:
-            df = df[df['Tahun'].isin(selected_years)]
+        # Slice cube tahun x bentuk kekerasan
+        chart_data = query_cube(fingerprint, 'Bentuk Kekerasan Perempuan', selected_years, ('Tahun', 'Bentuk_Kekerasan'))
         
-        if df.empty:
+        if chart_data is None or chart_data.empty:
             return None
         
-        # Group by tahun dan bentuk kekerasan
-        chart_data = df.groupby(['Tahun', 'Bentuk_Kekerasan'])['Jumlah_Kasus'].sum().reset_index()
-        
         fig = px.line(
             chart_data,
             x='Tahun',
@@ -1261,24 +931,18 @@ def create_kekerasan_perempuan_yearly_chart(data, selected_years):
     except Exception as e:
         return None
 
-def create_kekerasan_perempuan_usia_chart(data, selected_years):
+def create_kekerasan_perempuan_usia_chart(fingerprint, data, selected_years):
     """Kekerasan Perempuan berdasarkan Kelompok Usia - Stacked Bar Chart"""
     try:
         if 'Usia Kekerasan Perempuan' not in data:
             return None
         
-        df = data['Usia Kekerasan Perempuan'].copy()
-        
-        # Filter data berdasarkan tahun yang dipilih
-        if "Semua Tahun" not in selected_years:
-            df = df[df['Tahun'].isin(selected_years)]
+        # Slice cube tahun x kelompok usia
+        chart_data = query_cube(fingerprint, 'Usia Kekerasan Perempuan', selected_years, ('Tahun', 'Kelompok_Usia'))
         
-        if df.empty:
+        if chart_data is None or chart_data.empty:
             return None
         
-        # Group by tahun dan kelompok usia
-        chart_data = df.groupby(['Tahun', 'Kelompok_Usia'])['Jumlah_Kasus'].sum().reset_index()
-        
         fig = px.bar(
             chart_data,
             x='Tahun',
@@ -1301,27 +965,22 @@ def create_kekerasan_perempuan_usia_chart(data, selected_years):
     except Exception as e:
         return None
 
-def create_kekerasan_anak_monthly_pattern_chart(data, selected_years):
+def create_kekerasan_anak_monthly_pattern_chart(fingerprint, data, selected_years):
     """Pola Kekerasan Anak per Bulan - Heatmap"""
     try:
         if 'Kekerasan Anak' not in data:
             return None
         
-        df = data['Kekerasan Anak'].copy()
-        
-        # Filter data berdasarkan tahun yang dipilih
-        if "Semua Tahun" not in selected_years:
-            df = df[df['Tahun'].isin(selected_years)]
+        # Slice cube tahun x bulan
+        pivot_data = query_cube(fingerprint, 'Kekerasan Anak', selected_years, ('Tahun', 'Bulan'))
         
-        if df.empty:
+        if pivot_data is None or pivot_data.empty:
             return None
         
         # Create month order for proper sorting
         month_order = ['Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni',
                       'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember']
         
-        # Aggregate data by month and year
-        pivot_data = df.groupby(['Tahun', 'Bulan'])['Jumlah_Kasus'].sum().reset_index()
         pivot_table = pivot_data.pivot(index='Bulan', columns='Tahun', values='Jumlah_Kasus')
         
         # Reorder months
@@ -1348,26 +1007,20 @@ def create_kekerasan_anak_monthly_pattern_chart(data, selected_years):
     except Exception as e:
         return None
 
-def create_kekerasan_anak_cumulative_chart(data, selected_years):
+def create_kekerasan_anak_cumulative_chart(fingerprint, data, selected_years):
     """Kumulatif Kekerasan Anak per Tahun - Area Chart"""
     try:
         if 'Kekerasan Anak' not in data:
             return None
         
-        df = data['Kekerasan Anak'].copy()
+        # Slice cube tahun x gender
+        yearly_data = query_cube(fingerprint, 'Kekerasan Anak', selected_years, ('Tahun', 'Gender'))
         
-        # Filter data berdasarkan tahun yang dipilih
-        if "Semua Tahun" not in selected_years:
-            df = df[df['Tahun'].isin(selected_years)]
-        
-        if df.empty:
+        if yearly_data is None or yearly_data.empty:
             return None
         
-        # Group by tahun dan gender untuk mendapatkan total per tahun
-        yearly_data = df.groupby(['Tahun', 'Gender'])['Jumlah_Kasus'].sum().reset_index()
-        
         # Sort by year
-        yearly_data = yearly_data.sort_values('Tahun')
+        yearly_data = yearly_data[['Tahun', 'Gender', 'Jumlah_Kasus']].sort_values('Tahun')
         
         # Calculate cumulative sum for each gender
         cumulative_data = []
@@ -1408,43 +1061,27 @@ def create_kekerasan_anak_cumulative_chart(data, selected_years):
 # ===========================
 # ANALYSIS FUNCTIONS - DIPERBAIKI DAN LENGKAP
 # ===========================
-def analyze_penerima_per_tahun(data, selected_years):
+def analyze_penerima_per_tahun(fingerprint, data, selected_years):
     """Analyze penerima bantuan per tahun data"""
     try:
         if 'Bantuan Sosial' not in data:
             return "Data bantuan sosial tidak tersedia untuk analisis."
         
-        df = data['Bantuan Sosial'].copy()
-        
-        tahun_col = None
-        penerima_col = None
-        
-        for col in df.columns:
-            col_lower = col.lower().strip()
-            if 'tahun' in col_lower:
-                tahun_col = col
-            elif 'penerima' in col_lower:
-                penerima_col = col
-        
-        if not all([tahun_col, penerima_col]):
+        # Slice cube per tahun (dipakai bersama oleh chart dan analisis)
+        yearly_data = get_penerima_per_tahun(fingerprint, selected_years)
+        if yearly_data is None:
             return "Kolom tahun atau penerima tidak ditemukan."
         
-        if "Semua Tahun" not in selected_years:
-            df = df[df[tahun_col].isin(selected_years)]
-        
-        yearly_data = df.groupby(tahun_col)[penerima_col].agg(['sum', 'mean']).reset_index()
-        yearly_data.columns = [tahun_col, 'Total_Penerima', 'Rata_rata_Penerima']
-        
         if yearly_data.empty:
             return "Tidak ada data untuk periode yang dipilih."
         
         # Find insights
-        max_year = yearly_data.loc[yearly_data['Total_Penerima'].idxmax(), tahun_col]
+        max_year = yearly_data.loc[yearly_data['Total_Penerima'].idxmax(), 'Tahun']
         max_total = yearly_data['Total_Penerima'].max()
-        min_year = yearly_data.loc[yearly_data['Total_Penerima'].idxmin(), tahun_col]
+        min_year = yearly_data.loc[yearly_data['Total_Penerima'].idxmin(), 'Tahun']
         min_total = yearly_data['Total_Penerima'].min()
         
-        avg_highest_year = yearly_data.loc[yearly_data['Rata_rata_Penerima'].idxmax(), tahun_col]
+        avg_highest_year = yearly_data.loc[yearly_data['Rata_rata_Penerima'].idxmax(), 'Tahun']
         avg_highest = yearly_data['Rata_rata_Penerima'].max()
         
         total_all_years = yearly_data['Total_Penerima'].sum()
@@ -1460,34 +1097,19 @@ def analyze_penerima_per_tahun(data, selected_years):
     except Exception as e:
         return f"Error dalam analisis: {str(e)}"
 
-def analyze_bantuan_donut(data, selected_years):
+def analyze_bantuan_donut(fingerprint, data, selected_years):
     """Analyze bantuan distribution"""
     try:
         if 'Bantuan Sosial' not in data:
             return "Data bantuan sosial tidak tersedia untuk analisis."
         
-        df = data['Bantuan Sosial'].copy()
-        
-        program_col = None
-        penerima_col = None
-        tahun_col = None
-        
-        for col in df.columns:
-            col_lower = col.lower().strip()
-            if 'program' in col_lower and 'type' in col_lower:
-                program_col = col
-            elif 'penerima' in col_lower:
-                penerima_col = col
-            elif 'tahun' in col_lower:
-                tahun_col = col
-        
-        if not all([program_col, penerima_col]):
+        chart_data = query_cube(fingerprint, 'Bantuan Sosial', selected_years, ('Program_Type',))
+        if chart_data is None:
             return "Kolom program atau penerima tidak ditemukan."
         
-        if tahun_col and "Semua Tahun" not in selected_years:
-            df = df[df[tahun_col].isin(selected_years)]
-        
-        chart_data = df.groupby(program_col)[penerima_col].sum().reset_index()
+        program_col = 'Program_Type'
+        penerima_col = 'Jumlah_Penerima'
+        chart_data = chart_data[[program_col, penerima_col]]
         chart_data = chart_data.sort_values(penerima_col, ascending=False)
         
         if chart_data.empty:
@@ -1515,47 +1137,22 @@ def analyze_bantuan_donut(data, selected_years):
     except Exception as e:
         return f"Error dalam analisis: {str(e)}"
 
-def analyze_jenis_bencana_pie(data, selected_years):
+def analyze_jenis_bencana_pie(fingerprint, data, selected_years):
     """Analyze jenis bencana distribution"""
     try:
         if 'Jenis Bencana' not in data:
             return "Data jenis bencana tidak tersedia untuk analisis."
         
-        df = data['Jenis Bencana'].copy()
-        
-        if 'Jenis_Bencana_Nama' in df.columns:
-            jenis_col = 'Jenis_Bencana_Nama'
-        else:
-            if 'Jenis_Bencana' in df.columns:
-                df['Jenis_Bencana_Display'] = df['Jenis_Bencana'].astype(str).str.replace('_', ' ').str.title()
-                jenis_col = 'Jenis_Bencana_Display'
-            else:
-                return "Kolom jenis bencana tidak ditemukan."
-        
-        jumlah_col = None
-        for col in df.columns:
-            if 'jumlah' in col.lower() and df[col].dtype in ['int64', 'float64']:
-                jumlah_col = col
-                break
-        
-        if not jumlah_col:
-            return "Kolom jumlah bencana tidak ditemukan."
-        
-        tahun_col = None
-        for col in df.columns:
-            if 'tahun' in col.lower():
-                tahun_col = col
-                break
-        
-        if tahun_col and "Semua Tahun" not in selected_years:
-            df_filtered = df[df[tahun_col].isin(selected_years)]
-        else:
-            df_filtered = df
+        chart_data = query_cube(fingerprint, 'Jenis Bencana', selected_years, ('Jenis_Bencana_Nama',))
+        if chart_data is None:
+            return "Kolom jenis bencana tidak ditemukan."
         
-        if df_filtered.empty:
+        if chart_data.empty:
             return "Tidak ada data untuk periode yang dipilih."
         
-        chart_data = df_filtered.groupby(jenis_col)[jumlah_col].sum().reset_index()
+        jenis_col = 'Jenis_Bencana_Nama'
+        jumlah_col = 'Jumlah'
+        chart_data = chart_data[[jenis_col, jumlah_col]]
         chart_data = chart_data[chart_data[jumlah_col] > 0].sort_values(jumlah_col, ascending=False)
         
         if chart_data.empty:
@@ -1582,43 +1179,19 @@ def analyze_jenis_bencana_pie(data, selected_years):
     except Exception as e:
         return f"Error dalam analisis: {str(e)}"
 
-def analyze_bencana_kecamatan(data, selected_years):
+def analyze_bencana_kecamatan(fingerprint, data, selected_years):
     """Analyze bencana per kecamatan"""
     try:
         if 'Bencana Alam' not in data:
             return "Data bencana alam tidak tersedia untuk analisis."
         
-        df = data['Bencana Alam'].copy()
-        
-        kecamatan_col = None
-        jumlah_col = None
-        
-        for col in df.columns:
-            col_lower = col.lower().strip()
-            if 'kecamatan' in col_lower:
-                kecamatan_col = col
-            elif any(word in col_lower for word in ['jumlah', 'bencana']) and df[col].dtype in ['int64', 'float64']:
-                jumlah_col = col
-        
-        if not kecamatan_col:
+        chart_data = query_cube(fingerprint, 'Bencana Alam', selected_years, ('Kecamatan',))
+        if chart_data is None:
             return "Kolom kecamatan tidak ditemukan."
         
-        tahun_col = None
-        for col in df.columns:
-            if 'tahun' in col.lower():
-                tahun_col = col
-                break
-        
-        if tahun_col and "Semua Tahun" not in selected_years:
-            df = df[df[tahun_col].isin(selected_years)]
-        
-        if jumlah_col:
-            chart_data = df.groupby(kecamatan_col)[jumlah_col].sum().reset_index()
-            value_col = jumlah_col
-        else:
-            chart_data = df[kecamatan_col].value_counts().reset_index()
-            chart_data.columns = [kecamatan_col, 'Count']
-            value_col = 'Count'
+        kecamatan_col = 'Kecamatan'
+        value_col = 'Jumlah_Bencana'
+        chart_data = chart_data[[kecamatan_col, value_col]]
         
         chart_data = chart_data.sort_values(value_col, ascending=False)
         
@@ -1627,7 +1200,6 @@ def analyze_bencana_kecamatan(data, selected_years):
         
         # Find insights
         top_kecamatan = chart_data.iloc[0]
-        total_bencana = chart_data[value_col].sum()
         avg_bencana = chart_data[value_col].mean()
         
         kecamatan_aman = chart_data[chart_data[value_col] == 0]
@@ -1650,21 +1222,19 @@ def analyze_bencana_kecamatan(data, selected_years):
     except Exception as e:
         return f"Error dalam analisis: {str(e)}"
 
-def analyze_kekerasan_total_yearly(data, selected_years):
+def analyze_kekerasan_total_yearly(fingerprint, data, selected_years):
     """Analyze total kekerasan yearly trend"""
     try:
         if 'Kekerasan Anak' not in data or 'Bentuk Kekerasan Perempuan' not in data:
             return "Data kekerasan tidak lengkap untuk analisis."
         
-        df_anak = data['Kekerasan Anak'].copy()
-        df_perempuan = data['Bentuk Kekerasan Perempuan'].copy()
-        
-        if "Semua Tahun" not in selected_years:
-            df_anak = df_anak[df_anak['Tahun'].isin(selected_years)]
-            df_perempuan = df_perempuan[df_perempuan['Tahun'].isin(selected_years)]
+        anak_yearly = query_cube(fingerprint, 'Kekerasan Anak', selected_years, ('Tahun',))
+        perempuan_yearly = query_cube(fingerprint, 'Bentuk Kekerasan Perempuan', selected_years, ('Tahun',))
+        if anak_yearly is None or perempuan_yearly is None:
+            return "Data kekerasan tidak lengkap untuk analisis."
         
-        anak_yearly = df_anak.groupby('Tahun')['Jumlah_Kasus'].sum().reset_index()
-        perempuan_yearly = df_perempuan.groupby('Tahun')['Jumlah_Kasus'].sum().reset_index()
+        anak_yearly = anak_yearly[['Tahun', 'Jumlah_Kasus']]
+        perempuan_yearly = perempuan_yearly[['Tahun', 'Jumlah_Kasus']]
         
         if anak_yearly.empty or perempuan_yearly.empty:
             return "Tidak ada data untuk periode yang dipilih."
@@ -1694,34 +1264,19 @@ def analyze_kekerasan_total_yearly(data, selected_years):
     except Exception as e:
         return f"Error dalam analisis: {str(e)}"
 
-def analyze_kontrasepsi_chart(data, selected_years):
+def analyze_kontrasepsi_chart(fingerprint, data, selected_years):
     """Analyze kontrasepsi usage"""
     try:
         if 'Peserta Kb' not in data:
             return "Data peserta KB tidak tersedia untuk analisis."
         
-        df = data['Peserta Kb'].copy()
-        
-        kontrasepsi_col = None
-        peserta_col = None
-        tahun_col = None
-        
-        for col in df.columns:
-            col_lower = col.lower().strip()
-            if 'kontrasepsi' in col_lower:
-                kontrasepsi_col = col
-            elif 'peserta' in col_lower:
-                peserta_col = col
-            elif 'tahun' in col_lower:
-                tahun_col = col
-        
-        if not all([kontrasepsi_col, peserta_col]):
+        chart_data = query_cube(fingerprint, 'Peserta Kb', selected_years, ('Jenis_Kontrasepsi',))
+        if chart_data is None:
             return "Kolom kontrasepsi atau peserta tidak ditemukan."
         
-        if tahun_col and "Semua Tahun" not in selected_years:
-            df = df[df[tahun_col].isin(selected_years)]
-        
-        chart_data = df.groupby(kontrasepsi_col)[peserta_col].sum().reset_index()
+        kontrasepsi_col = 'Jenis_Kontrasepsi'
+        peserta_col = 'Jumlah_Peserta'
+        chart_data = chart_data[[kontrasepsi_col, peserta_col]]
         chart_data = chart_data.sort_values(peserta_col, ascending=False)
         
         if chart_data.empty:
@@ -1756,166 +1311,137 @@ def analyze_kontrasepsi_chart(data, selected_years):
 
 def analyze_kb_performance_table(data):
     """Analyze KB Performance Table - DIPERBAIKI"""
-    try:
-        if 'Data Kb Performance' not in data:
-            return "Data performa KB tidak tersedia untuk analisis."
-        
-        df = data['Data Kb Performance'].copy()
-        
-        if df.empty:
-            return "Tidak ada data performa KB untuk dianalisis."
-        
-        # Find columns dynamically
-        kecamatan_col = None
-        growth_col = None
-        
-        for col in df.columns:
-            col_lower = col.lower().strip()
-            if 'kecamatan' in col_lower:
-                kecamatan_col = col
-            elif 'growth' in col_lower and '2024' in col_lower and '2023' in col_lower:
-                growth_col = col
-                break
-        
-        if not kecamatan_col:
-            return "Data kecamatan tidak ditemukan dalam tabel performa KB."
-        
-        if not growth_col:
-            return f"Data mencakup {len(df)} kecamatan namun tidak ditemukan kolom pertumbuhan untuk dianalisis."
-        
-        # Clean and convert growth data - PERBAIKAN UTAMA
-        df_clean = df.copy()
-        
-        try:
-            if df_clean[growth_col].dtype == 'object':
-                # Remove %, commas, and convert to numeric
-                df_clean['Growth_Rate_Clean'] = df_clean[growth_col].astype(str).str.replace('%', '').str.replace(',', '.').str.strip()
-                df_clean['Growth_Rate_Clean'] = pd.to_numeric(df_clean['Growth_Rate_Clean'], errors='coerce')
-                numeric_col = 'Growth_Rate_Clean'
-            else:
-                numeric_col = growth_col
-                
-        except:
-            return f"Data performa KB mencakup {len(df)} kecamatan namun format data tidak dapat dianalisis."
-        
-        # Remove rows with NaN values
-        df_clean = df_clean.dropna(subset=[numeric_col])
-        
-        if df_clean.empty or len(df_clean) < 2:
-            return f"Data performa KB mencakup {len(df)} kecamatan namun data numerik tidak mencukupi untuk analisis."
-        
-        # Find best and worst performers
-        best_idx = df_clean[numeric_col].idxmax()
-        worst_idx = df_clean[numeric_col].idxmin()
-        
-        best_kecamatan = df_clean.loc[best_idx, kecamatan_col]
-        best_value = df_clean.loc[best_idx, numeric_col]
-        
-        worst_kecamatan = df_clean.loc[worst_idx, kecamatan_col]
-        worst_value = df_clean.loc[worst_idx, numeric_col]
-        
-        # Calculate statistics
-        avg_value = df_clean[numeric_col].mean()
-        total_kecamatan = len(df_clean)
-        
-        # Build insight
-        insight = f"Kecamatan {best_kecamatan} menunjukkan performa KB terbaik dengan pertumbuhan {best_value:.2f}%, " \
-                 f"sedangkan Kecamatan {worst_kecamatan} mengalami penurunan terbesar dengan {worst_value:.2f}%. "
-        
-        # Add comparison context
-        if best_value > avg_value:
-            diff_best = best_value - avg_value
-            insight += f"Performa terbaik berada {diff_best:.2f}% di atas rata-rata ({avg_value:.2f}%). "
-        
-        if worst_value < avg_value:
-            diff_worst = avg_value - worst_value
-            insight += f"Performa terendah berada {diff_worst:.2f}% di bawah rata-rata. "
-        
-        # Add performance gap information
-        performance_gap = best_value - worst_value
-        insight += f"Terdapat kesenjangan performa sebesar {performance_gap:.2f}% antara kecamatan terbaik dan terburuk. "
-        
-        # Categorize performance levels
-        above_avg = len(df_clean[df_clean[numeric_col] > avg_value])
-        below_avg = len(df_clean[df_clean[numeric_col] < avg_value])
-        
-        insight += f"Dari {total_kecamatan} kecamatan, {above_avg} kecamatan berada di atas rata-rata dan {below_avg} kecamatan di bawah rata-rata."
-        
-        return insight
-        
-    except Exception as e:
-        return f"Data performa KB tersedia untuk {len(data.get('Data Kb Performance', []))} kecamatan namun tidak dapat dianalisis secara detail."
+    if 'Data Kb Performance' not in data:
+        return "Data performa KB tidak tersedia untuk analisis."
+    
+    df = data['Data Kb Performance']
+    
+    if df.empty:
+        return "Tidak ada data performa KB untuk dianalisis."
+    
+    # Kolom dari schema; pertumbuhan sudah numerik sejak ingest
+    kecamatan_col, numeric_col = columns('Data Kb Performance', 'kecamatan', 'growth')
+    df_clean = df
+    
+    # Remove rows with NaN values
+    df_clean = df_clean.dropna(subset=[numeric_col])
+    
+    if df_clean.empty or len(df_clean) < 2:
+        return f"Data performa KB mencakup {len(df)} kecamatan namun data numerik tidak mencukupi untuk analisis."
+    
+    # Find best and worst performers
+    best_idx = df_clean[numeric_col].idxmax()
+    worst_idx = df_clean[numeric_col].idxmin()
+    
+    best_kecamatan = df_clean.loc[best_idx, kecamatan_col]
+    best_value = df_clean.loc[best_idx, numeric_col]
+    
+    worst_kecamatan = df_clean.loc[worst_idx, kecamatan_col]
+    worst_value = df_clean.loc[worst_idx, numeric_col]
+    
+    # Calculate statistics
+    avg_value = df_clean[numeric_col].mean()
+    total_kecamatan = len(df_clean)
+    
+    # Build insight
+    insight = f"Kecamatan {best_kecamatan} menunjukkan performa KB terbaik dengan pertumbuhan {best_value:.2f}%, " \
+             f"sedangkan Kecamatan {worst_kecamatan} mengalami penurunan terbesar dengan {worst_value:.2f}%. "
+    
+    # Add comparison context
+    if best_value > avg_value:
+        diff_best = best_value - avg_value
+        insight += f"Performa terbaik berada {diff_best:.2f}% di atas rata-rata ({avg_value:.2f}%). "
+    
+    if worst_value < avg_value:
+        diff_worst = avg_value - worst_value
+        insight += f"Performa terendah berada {diff_worst:.2f}% di bawah rata-rata. "
+    
+    # Add performance gap information
+    performance_gap = best_value - worst_value
+    insight += f"Terdapat kesenjangan performa sebesar {performance_gap:.2f}% antara kecamatan terbaik dan terburuk. "
+    
+    # Categorize performance levels
+    above_avg = len(df_clean[df_clean[numeric_col] > avg_value])
+    below_avg = len(df_clean[df_clean[numeric_col] < avg_value])
+    
+    insight += f"Dari {total_kecamatan} kecamatan, {above_avg} kecamatan berada di atas rata-rata dan {below_avg} kecamatan di bawah rata-rata."
+    
+    return insight
 
 # ===========================
 # DATA LOADING FROM LOCAL FILES
 # ===========================
-@st.cache_data
-def load_local_data():
-    """Load data from local CSV files"""
-    data_path = "data/sosial/"
-    
-    file_list = [
-        "bantuan_sosial.csv",
-        "bencana_alam.csv",
-        "bentuk_kekerasan_perempuan.csv",
-        "data_kb_performance.csv",
-        "data_kb_tren_metode.csv",
-        "jenis_bencana.csv",
-        "kekerasan_anak.csv",
-        "master_kecamatan.csv",
-        "master_tahun.csv",
-        "peserta_kb.csv",
-        "usia_kekerasan_perempuan.csv"
-    ]
-    
+SOSIAL_DATA_PATH = "data/sosial/"
+SOSIAL_FILES = [
+    "bantuan_sosial.csv",
+    "bencana_alam.csv",
+    "bentuk_kekerasan_perempuan.csv",
+    "data_kb_performance.csv",
+    "data_kb_tren_metode.csv",
+    "jenis_bencana.csv",
+    "kekerasan_anak.csv",
+    "master_kecamatan.csv",
+    "master_tahun.csv",
+    "peserta_kb.csv",
+    "usia_kekerasan_perempuan.csv"
+]
+
+def sosial_fingerprint():
+    """Fingerprint isi semua CSV sosial & kode core; kunci semua cache turunan di halaman ini"""
+    return dataset_fingerprint(*(SOSIAL_DATA_PATH + filename for filename in SOSIAL_FILES))
+
+@st.cache_data(persist="disk")
+def load_sosial_data(fingerprint):
+    """Dataset sosial yang sudah divalidasi; disimpan di disk sehingga bertahan saat server restart"""
+    data_path = SOSIAL_DATA_PATH
     data = {}
     
-    for filename in file_list:
+    for filename in SOSIAL_FILES:
         try:
             file_path = data_path + filename
-            df = pd.read_csv(file_path)
-            df.columns = df.columns.str.strip()
-            
-            if filename == "jenis_bencana.csv":
-                try:
-                    df_clean = clean_numeric_columns(df, exclude_columns=['Jenis_Bencana'])
-                    
-                    if 'Jenis_Bencana' in df_clean.columns:
-                        df_clean['Jenis_Bencana'] = df_clean['Jenis_Bencana'].astype(str)
-                        df_clean['Jenis_Bencana_Nama'] = df_clean['Jenis_Bencana'].map(JENIS_BENCANA_MAPPING)
-                        
-                        mask = df_clean['Jenis_Bencana_Nama'].isna()
-                        if mask.any():
-                            df_clean.loc[mask, 'Jenis_Bencana_Nama'] = (
-                                df_clean.loc[mask, 'Jenis_Bencana']
-                                .str.replace('_', ' ')
-                                .str.title()
-                            )
-                    
-                except Exception as e:
-                    df_clean = clean_numeric_columns(df, exclude_columns=['Jenis_Bencana'])
-            
-            elif filename == "bencana_alam.csv":
-                df_clean = clean_numeric_columns(df)
-                for col in df_clean.columns:
-                    if 'kerugian' in col.lower():
-                        df_clean[col + '_Numeric'] = df_clean[col].apply(extract_rupiah_value)
-                
-            else:
-                df_clean = clean_numeric_columns(df)
+            # Pembersihan numerik & kerugian sudah dilakukan saat ingest ke cache kolumnar
+            df_clean = load_dataset(file_path)
             
             clean_name = filename.replace('.csv', '').replace('_', ' ').title()
-            data[clean_name] = df_clean
+            # Peran kolom divalidasi sekali di sini; fungsi chart memakai nama kolom dari schema
+            data[clean_name] = validate_dataset(clean_name, df_clean)
             
         except FileNotFoundError:
             st.error(f"File not found: {file_path}. Please make sure the CSV file is in the correct directory.")
             continue
+        except SchemaError:
+            # Schema tidak cocok harus terlihat jelas, bukan menjadi chart kosong
+            raise
         except Exception as e:
             st.error(f"Error loading {filename}: {str(e)}")
             continue
     
     return data
 
+@st.cache_data
+def load_cubes(fingerprint):
+    """Bangun cube agregat (Tahun x Kecamatan/Bulan x kategori) sekali per versi data"""
+    return build_cubes(load_sosial_data(fingerprint))
+
+@st.cache_data
+def load_kecamatan_dimension(fingerprint):
+    """Dimensi kecamatan bersama (Kecamatan_ID, region, centroid, indeks geometri)"""
+    return load_dimension()
+
+@st.cache_data
+def query_cube(fingerprint, name, selected_years, by):
+    """Slice cube untuk pilihan tahun; hasilnya dipakai bersama oleh chart dan analisisnya"""
+    return query_cubes(load_cubes(fingerprint), name, selected_years, by)
+
+def get_penerima_per_tahun(fingerprint, selected_years):
+    """Total dan rata-rata penerima per tahun dari cube Bantuan Sosial"""
+    yearly_data = query_cube(fingerprint, 'Bantuan Sosial', selected_years, ('Tahun',))
+    if yearly_data is None:
+        return None
+    yearly_data['Rata_rata_Penerima'] = yearly_data['Jumlah_Penerima'] / yearly_data[ROW_COUNT_COL]
+    yearly_data = yearly_data.rename(columns={'Jumlah_Penerima': 'Total_Penerima'})
+    return yearly_data[['Tahun', 'Total_Penerima', 'Rata_rata_Penerima']]
+
 # ===========================
 # FUNCTION TO GET AVAILABLE YEARS
 # ===========================
@@ -1923,17 +1449,17 @@ def get_available_years(data):
     """Get available years from data (2020-2024 only)"""
     available_years = set()
     
-    for df in data.values():
-        for col in df.columns:
-            if 'tahun' in col.lower():
-                years = df[col].dropna().unique()
-                for year in years:
-                    try:
-                        year_int = int(year)
-                        if 2020 <= year_int <= 2024:
-                            available_years.add(year_int)
-                    except (ValueError, TypeError):
-                        continue
+    for name, df in data.items():
+        if not has_role(name, 'tahun'):
+            continue
+        years = df[column(name, 'tahun')].dropna().unique()
+        for year in years:
+            try:
+                year_int = int(year)
+                if 2020 <= year_int <= 2024:
+                    available_years.add(year_int)
+            except (ValueError, TypeError):
+                continue
     
     return sorted(list(available_years))
 
@@ -2011,160 +1537,33 @@ def create_year_chips(available_years, key):
     return st.session_state[f"selected_years_{key}"]
 
 # ===========================
-# KPI CALCULATION
+# CHART FUNCTIONS - LENGKAP
 # ===========================
-def calculate_kpis(data, selected_years):
-    """Calculate KPI values"""
-    kpis = {}
-    
+
+# BANTUAN SOSIAL SECTION CHARTS
+def create_penerima_per_tahun_chart(fingerprint, data, selected_years):
+    """Rata-rata dan Jumlah Penerima per Tahun - Combo Chart"""
     try:
-        # 1. Total Penerima Bantuan
-        if 'Bantuan Sosial' in data:
-            df = data['Bantuan Sosial'].copy()
-            
-            tahun_col = None
-            penerima_col = None
-            
-            for col in df.columns:
-                col_lower = col.lower().strip()
-                if 'tahun' in col_lower:
-                    tahun_col = col
-                elif 'penerima' in col_lower:
-                    penerima_col = col
-            
-            if tahun_col and "Semua Tahun" not in selected_years:
-                df = df[df[tahun_col].isin(selected_years)]
-            
-            if penerima_col:
-                total = df[penerima_col].sum()
-            else:
-                total = len(df)
-            
-            kpis['total_penerima_bantuan'] = int(total)
+        if 'Bantuan Sosial' not in data:
+            return None
         
-        # 2. Total Bencana
-        if 'Jenis Bencana' in data:
-            df = data['Jenis Bencana'].copy()
-            
-            tahun_col = None
-            jumlah_col = None
-            
-            for col in df.columns:
-                col_lower = col.lower().strip()
-                if 'tahun' in col_lower:
-                    tahun_col = col
-                elif 'jumlah' in col_lower and df[col].dtype in ['int64', 'float64']:
-                    jumlah_col = col
-            
-            if tahun_col and "Semua Tahun" not in selected_years:
-                df = df[df[tahun_col].isin(selected_years)]
-            
-            if jumlah_col:
-                total = df[jumlah_col].sum()
-            else:
-                total = len(df)
-            
-            kpis['total_bencana'] = int(total)
+        # Slice cube per tahun (dipakai bersama oleh chart dan analisis)
+        yearly_data = get_penerima_per_tahun(fingerprint, selected_years)
+        if yearly_data is None:
+            return None
         
-        # 3. Kekerasan Anak
-        if 'Kekerasan Anak' in data:
-            df = data['Kekerasan Anak'].copy()
-            
-            if "Semua Tahun" not in selected_years:
-                df = df[df['Tahun'].isin(selected_years)]
-            
-            total = df['Jumlah_Kasus'].sum()
-            kpis['kekerasan_anak'] = int(total)
+        fig = go.Figure()
         
-        # 4. Kekerasan Perempuan
-        if 'Bentuk Kekerasan Perempuan' in data:
-            df = data['Bentuk Kekerasan Perempuan'].copy()
-            
-            if "Semua Tahun" not in selected_years:
-                df = df[df['Tahun'].isin(selected_years)]
-            
-            total = df['Jumlah_Kasus'].sum()
-            kpis['kekerasan_perempuan'] = int(total)
-        
-        # 5. Peserta KB
-        if 'Peserta Kb' in data:
-            df = data['Peserta Kb'].copy()
-            
-            tahun_col = None
-            peserta_col = None
-            
-            for col in df.columns:
-                col_lower = col.lower().strip()
-                if 'tahun' in col_lower:
-                    tahun_col = col
-                elif 'peserta' in col_lower and df[col].dtype in ['int64', 'float64']:
-                    peserta_col = col
-            
-            if tahun_col and "Semua Tahun" not in selected_years:
-                df = df[df[tahun_col].isin(selected_years)]
-            
-            if peserta_col:
-                total = df[peserta_col].sum()
-            else:
-                total = len(df)
-            
-            kpis['peserta_kb'] = int(total)
-            
-    except Exception as e:
-        kpis = {
-            'total_penerima_bantuan': 0,
-            'total_bencana': 0,
-            'kekerasan_anak': 0,
-            'kekerasan_perempuan': 0,
-            'peserta_kb': 0
-        }
-    
-    return kpis
-
-# ===========================
-# CHART FUNCTIONS - LENGKAP
-# ===========================
-
-# BANTUAN SOSIAL SECTION CHARTS
-def create_penerima_per_tahun_chart(data, selected_years):
-    """Rata-rata dan Jumlah Penerima per Tahun - Combo Chart"""
-    try:
-        if 'Bantuan Sosial' not in data:
-            return None
-        
-        df = data['Bantuan Sosial'].copy()
-        
-        tahun_col = None
-        penerima_col = None
-        
-        for col in df.columns:
-            col_lower = col.lower().strip()
-            if 'tahun' in col_lower:
-                tahun_col = col
-            elif 'penerima' in col_lower:
-                penerima_col = col
-        
-        if not all([tahun_col, penerima_col]):
-            return None
-        
-        if "Semua Tahun" not in selected_years:
-            df = df[df[tahun_col].isin(selected_years)]
-        
-        yearly_data = df.groupby(tahun_col)[penerima_col].agg(['sum', 'mean']).reset_index()
-        yearly_data.columns = [tahun_col, 'Total_Penerima', 'Rata_rata_Penerima']
-        
-        fig = go.Figure()
-        
-        fig.add_trace(go.Bar(
-            x=yearly_data[tahun_col],
-            y=yearly_data['Total_Penerima'],
-            name='Total Penerima',
-            marker_color='#3498db',
-            yaxis='y'
-        ))
+        fig.add_trace(go.Bar(
+            x=yearly_data['Tahun'],
+            y=yearly_data['Total_Penerima'],
+            name='Total Penerima',
+            marker_color='#3498db',
+            yaxis='y'
+        ))
         
         fig.add_trace(go.Scatter(
-            x=yearly_data[tahun_col],
+            x=yearly_data['Tahun'],
             y=yearly_data['Rata_rata_Penerima'],
             mode='lines+markers',
             name='Rata-rata Penerima',
@@ -2194,34 +1593,19 @@ def create_penerima_per_tahun_chart(data, selected_years):
     except Exception as e:
         return None
 
-def create_bantuan_donut_chart(data, selected_years):
+def create_bantuan_donut_chart(fingerprint, data, selected_years):
     """Jumlah Penerima Bantuan - Donut Chart"""
     try:
         if 'Bantuan Sosial' not in data:
             return None
         
-        df = data['Bantuan Sosial'].copy()
-        
-        program_col = None
-        penerima_col = None
-        tahun_col = None
-        
-        for col in df.columns:
-            col_lower = col.lower().strip()
-            if 'program' in col_lower and 'type' in col_lower:
-                program_col = col
-            elif 'penerima' in col_lower:
-                penerima_col = col
-            elif 'tahun' in col_lower:
-                tahun_col = col
-        
-        if not all([program_col, penerima_col]):
+        chart_data = query_cube(fingerprint, 'Bantuan Sosial', selected_years, ('Program_Type',))
+        if chart_data is None:
             return None
         
-        if tahun_col and "Semua Tahun" not in selected_years:
-            df = df[df[tahun_col].isin(selected_years)]
-        
-        chart_data = df.groupby(program_col)[penerima_col].sum().reset_index()
+        program_col = 'Program_Type'
+        penerima_col = 'Jumlah_Penerima'
+        chart_data = chart_data[[program_col, penerima_col]]
         
         fig = px.pie(
             chart_data,
@@ -2245,47 +1629,22 @@ def create_bantuan_donut_chart(data, selected_years):
         return None
 
 # BENCANA SECTION CHARTS
-def create_jenis_bencana_pie_chart(data, selected_years):
+def create_jenis_bencana_pie_chart(fingerprint, data, selected_years):
     """Jenis Bencana - Pie Chart"""
     try:
         if 'Jenis Bencana' not in data:
             return None
         
-        df = data['Jenis Bencana'].copy()
-        
-        if 'Jenis_Bencana_Nama' in df.columns:
-            jenis_col = 'Jenis_Bencana_Nama'
-        else:
-            if 'Jenis_Bencana' in df.columns:
-                df['Jenis_Bencana_Display'] = df['Jenis_Bencana'].astype(str).str.replace('_', ' ').str.title()
-                jenis_col = 'Jenis_Bencana_Display'
-            else:
-                return None
-        
-        jumlah_col = None
-        for col in df.columns:
-            if 'jumlah' in col.lower() and df[col].dtype in ['int64', 'float64']:
-                jumlah_col = col
-                break
-        
-        if not jumlah_col:
+        chart_data = query_cube(fingerprint, 'Jenis Bencana', selected_years, ('Jenis_Bencana_Nama',))
+        if chart_data is None:
             return None
         
-        tahun_col = None
-        for col in df.columns:
-            if 'tahun' in col.lower():
-                tahun_col = col
-                break
-        
-        if tahun_col and "Semua Tahun" not in selected_years:
-            df_filtered = df[df[tahun_col].isin(selected_years)]
-        else:
-            df_filtered = df
-        
-        if df_filtered.empty:
+        if chart_data.empty:
             return None
         
-        chart_data = df_filtered.groupby(jenis_col)[jumlah_col].sum().reset_index()
+        jenis_col = 'Jenis_Bencana_Nama'
+        jumlah_col = 'Jumlah'
+        chart_data = chart_data[[jenis_col, jumlah_col]]
         chart_data = chart_data[chart_data[jumlah_col] > 0]
         
         if chart_data.empty:
@@ -2314,43 +1673,19 @@ def create_jenis_bencana_pie_chart(data, selected_years):
     except Exception as e:
         return None
 
-def create_bencana_kecamatan_chart(data, selected_years):
+def create_bencana_kecamatan_chart(fingerprint, data, selected_years):
     """Bencana per Kecamatan"""
     try:
         if 'Bencana Alam' not in data:
             return None
         
-        df = data['Bencana Alam'].copy()
-        
-        kecamatan_col = None
-        jumlah_col = None
-        
-        for col in df.columns:
-            col_lower = col.lower().strip()
-            if 'kecamatan' in col_lower:
-                kecamatan_col = col
-            elif any(word in col_lower for word in ['jumlah', 'bencana']) and df[col].dtype in ['int64', 'float64']:
-                jumlah_col = col
-        
-        if not kecamatan_col:
+        chart_data = query_cube(fingerprint, 'Bencana Alam', selected_years, ('Kecamatan',))
+        if chart_data is None:
             return None
         
-        tahun_col = None
-        for col in df.columns:
-            if 'tahun' in col.lower():
-                tahun_col = col
-                break
-        
-        if tahun_col and "Semua Tahun" not in selected_years:
-            df = df[df[tahun_col].isin(selected_years)]
-        
-        if jumlah_col:
-            chart_data = df.groupby(kecamatan_col)[jumlah_col].sum().reset_index()
-            value_col = jumlah_col
-        else:
-            chart_data = df[kecamatan_col].value_counts().reset_index()
-            chart_data.columns = [kecamatan_col, 'Count']
-            value_col = 'Count'
+        kecamatan_col = 'Kecamatan'
+        value_col = 'Jumlah_Bencana'
+        chart_data = chart_data[[kecamatan_col, value_col]]
         
         chart_data = chart_data.sort_values(value_col, ascending=True)
         
@@ -2369,36 +1704,20 @@ def create_bencana_kecamatan_chart(data, selected_years):
     except Exception as e:
         return None
 
-def create_kerugian_table(data, selected_years):
+def create_kerugian_table(fingerprint, data, selected_years):
     """Kerugian Table"""
     try:
         if 'Bencana Alam' not in data:
             return None
         
-        df = data['Bencana Alam'].copy()
-        
-        kecamatan_col = None
-        tahun_col = None
-        kerugian_col = None
-        
-        for col in df.columns:
-            col_lower = col.lower().strip()
-            if 'kecamatan' in col_lower:
-                kecamatan_col = col
-            elif 'tahun' in col_lower:
-                tahun_col = col
-            elif 'kerugian' in col_lower and 'numeric' not in col_lower:
-                kerugian_col = col
-        
-        if not all([kecamatan_col, tahun_col, kerugian_col]):
+        # Kerugian numerik sudah dijumlahkan di cube (Kecamatan x Tahun)
+        table_data = query_cube(fingerprint, 'Bencana Alam', selected_years, ('Kecamatan', 'Tahun'))
+        if table_data is None:
             return None
         
-        if "Semua Tahun" not in selected_years:
-            df = df[df[tahun_col].isin(selected_years)]
-        
-        df['Kerugian_Numeric'] = df[kerugian_col].apply(extract_rupiah_value)
-        
-        table_data = df.groupby([kecamatan_col, tahun_col])['Kerugian_Numeric'].sum().reset_index()
+        kecamatan_col = 'Kecamatan'
+        tahun_col = 'Tahun'
+        table_data = table_data.rename(columns={'Kerugian_Rupiah_Numeric': 'Kerugian_Numeric'})
         table_data['Kerugian_Formatted'] = table_data['Kerugian_Numeric'].apply(
             lambda x: f"Rp {x:,.0f}" if x > 0 else "Rp 0"
         )
@@ -2413,26 +1732,22 @@ def create_kerugian_table(data, selected_years):
         return None
 
 # KEKERASAN SECTION CHARTS - LENGKAP
-def create_kekerasan_total_yearly_chart(data, selected_years):
+def create_kekerasan_total_yearly_chart(fingerprint, data, selected_years):
     """Total Kekerasan per Tahun - Line Chart"""
     try:
         if 'Kekerasan Anak' not in data or 'Bentuk Kekerasan Perempuan' not in data:
             return None
         
-        df_anak = data['Kekerasan Anak'].copy()
-        df_perempuan = data['Bentuk Kekerasan Perempuan'].copy()
-        
-        # Filter data berdasarkan tahun yang dipilih
-        if "Semua Tahun" not in selected_years:
-            df_anak = df_anak[df_anak['Tahun'].isin(selected_years)]
-            df_perempuan = df_perempuan[df_perempuan['Tahun'].isin(selected_years)]
+        # Slice cube per tahun (semua bulan) untuk kedua jenis kekerasan
+        anak_yearly = query_cube(fingerprint, 'Kekerasan Anak', selected_years, ('Tahun',))
+        perempuan_yearly = query_cube(fingerprint, 'Bentuk Kekerasan Perempuan', selected_years, ('Tahun',))
+        if anak_yearly is None or perempuan_yearly is None:
+            return None
         
-        # Aggregate kekerasan anak per tahun (semua bulan)
-        anak_yearly = df_anak.groupby('Tahun')['Jumlah_Kasus'].sum().reset_index()
+        anak_yearly = anak_yearly[['Tahun', 'Jumlah_Kasus']].copy()
         anak_yearly['Jenis'] = 'Kekerasan Anak'
         
-        # Aggregate kekerasan perempuan per tahun (semua bulan)
-        perempuan_yearly = df_perempuan.groupby('Tahun')['Jumlah_Kasus'].sum().reset_index()
+        perempuan_yearly = perempuan_yearly[['Tahun', 'Jumlah_Kasus']].copy()
         perempuan_yearly['Jenis'] = 'Kekerasan Perempuan'
         
         # Combine data
@@ -2465,34 +1780,19 @@ def create_kekerasan_total_yearly_chart(data, selected_years):
         return None
 
 # KB SECTION CHARTS
-def create_kontrasepsi_chart(data, selected_years):
+def create_kontrasepsi_chart(fingerprint, data, selected_years):
     """Jumlah Peserta per Jenis Kontrasepsi - Horizontal Bar Chart"""
     try:
         if 'Peserta Kb' not in data:
             return None
         
-        df = data['Peserta Kb'].copy()
-        
-        kontrasepsi_col = None
-        peserta_col = None
-        tahun_col = None
-        
-        for col in df.columns:
-            col_lower = col.lower().strip()
-            if 'kontrasepsi' in col_lower:
-                kontrasepsi_col = col
-            elif 'peserta' in col_lower:
-                peserta_col = col
-            elif 'tahun' in col_lower:
-                tahun_col = col
-        
-        if not all([kontrasepsi_col, peserta_col]):
+        chart_data = query_cube(fingerprint, 'Peserta Kb', selected_years, ('Jenis_Kontrasepsi',))
+        if chart_data is None:
             return None
         
-        if tahun_col and "Semua Tahun" not in selected_years:
-            df = df[df[tahun_col].isin(selected_years)]
-        
-        chart_data = df.groupby(kontrasepsi_col)[peserta_col].sum().reset_index()
+        kontrasepsi_col = 'Jenis_Kontrasepsi'
+        peserta_col = 'Jumlah_Peserta'
+        chart_data = chart_data[[kontrasepsi_col, peserta_col]]
         chart_data = chart_data.sort_values(peserta_col, ascending=True)
         
         fig = px.bar(
@@ -2518,47 +1818,450 @@ def create_kontrasepsi_chart(data, selected_years):
 
 def create_kb_performance_table(data):
     """Performa KB Kecamatan 2023-2024 - Table"""
+    if 'Data Kb Performance' not in data:
+        return None
+    
+    df = data['Data Kb Performance'].copy()
+    
+    if df.empty:
+        return None
+    
+    # Kolom tampilan dari schema (urutan sama dengan file sumber)
+    display_cols = columns('Data Kb Performance', 'kecamatan', 'peserta_2023', 'peserta_2024', 'growth_label', 'level')
+    
+    # Limit to reasonable number of rows and columns
+    table_data = df[display_cols].head(20)
+    
+    # Clean the data - replace NaN with appropriate values
+    table_data = table_data.fillna('-')
+    
+    return table_data
+
+# ===========================
+# MEMOIZED CHART + INSIGHT PIPELINE
+# ===========================
+# Jumlah maksimum pasangan (figure, insight) yang disimpan; entri terlama dibuang (LRU)
+CHART_CACHE_MAX_ENTRIES = 256
+
+# Nama pipeline -> (fungsi chart, fungsi analisis) yang memakai slice data yang sama
+CHART_PIPELINES = {
+    'penerima_per_tahun': (create_penerima_per_tahun_chart, analyze_penerima_per_tahun),
+    'bantuan_donut': (create_bantuan_donut_chart, analyze_bantuan_donut),
+    'jenis_bencana_pie': (create_jenis_bencana_pie_chart, analyze_jenis_bencana_pie),
+    'bencana_kecamatan': (create_bencana_kecamatan_chart, analyze_bencana_kecamatan),
+    'kekerasan_total_yearly': (create_kekerasan_total_yearly_chart, analyze_kekerasan_total_yearly),
+    'kekerasan_gender_comparison': (create_kekerasan_gender_comparison_chart, analyze_kekerasan_gender_comparison),
+    'kekerasan_perempuan_yearly': (create_kekerasan_perempuan_yearly_chart, analyze_kekerasan_perempuan_yearly),
+    'kekerasan_perempuan_usia': (create_kekerasan_perempuan_usia_chart, analyze_kekerasan_perempuan_usia),
+    'kekerasan_anak_monthly_pattern': (create_kekerasan_anak_monthly_pattern_chart, analyze_kekerasan_anak_monthly_pattern),
+    'kekerasan_anak_cumulative': (create_kekerasan_anak_cumulative_chart, analyze_kekerasan_anak_cumulative),
+    'kontrasepsi': (create_kontrasepsi_chart, analyze_kontrasepsi_chart),
+}
+
+def normalize_years(selected_years):
+    """Ubah pilihan tahun menjadi tuple terurut yang hashable untuk kunci cache"""
+    if "Semua Tahun" in selected_years:
+        return ("Semua Tahun",)
+    return tuple(sorted(int(year) for year in selected_years))
+
+@st.cache_data(max_entries=CHART_CACHE_MAX_ENTRIES)
+def get_chart_and_insight(fingerprint, pipeline, years_key):
+    """Figure dan teks insight satu pipeline, di-memo per (versi data, pilihan tahun)"""
+    create_chart, analyze_chart = CHART_PIPELINES[pipeline]
+    data = load_sosial_data(fingerprint)
+    selected_years = list(years_key)
+
+    fig = create_chart(fingerprint, data, selected_years)
+    if fig is None:
+        return None, None
+    return fig, analyze_chart(fingerprint, data, selected_years)
+
+@st.cache_data(max_entries=CHART_CACHE_MAX_ENTRIES)
+def get_kpis(fingerprint, years_key):
+    """Nilai KPI dari cube agregat, di-memo per (versi data, pilihan tahun)"""
+    return calculate_kpis(load_cubes(fingerprint), list(years_key))
+
+# Jenis peta -> fungsi penyiapan data peta (core.sosial, dari cube agregat versi data `fingerprint`)
+MAP_PREPARERS = {
+    "Bencana Alam": lambda fingerprint, selected_years: prepare_disaster_data_for_map(load_cubes(fingerprint), selected_years),
+    "Bantuan Sosial": lambda fingerprint, selected_years: prepare_bantuan_sosial_data_for_map(load_cubes(fingerprint), selected_years),
+    "KB Performance": lambda fingerprint, selected_years: prepare_kb_performance_data_for_map(load_sosial_data(fingerprint)),
+    "Peserta KB": lambda fingerprint, selected_years: prepare_peserta_kb_data_for_map(load_cubes(fingerprint), selected_years),
+}
+
+@st.cache_data(max_entries=CHART_CACHE_MAX_ENTRIES)
+def get_map_layer(fingerprint, map_type, years_key):
+    """Data peta dan baris marker, di-memo per (versi data, jenis peta, pilihan tahun)"""
+    prepare_map_data = MAP_PREPARERS.get(map_type)
+    if prepare_map_data is None:
+        return None, []
+    
+    map_data = prepare_map_data(fingerprint, list(years_key))
     try:
-        if 'Data Kb Performance' not in data:
-            return None
-        
-        df = data['Data Kb Performance'].copy()
-        
-        if df.empty:
-            return None
-        
-        # Find relevant columns
-        display_cols = []
-        for col in df.columns:
-            col_lower = col.lower().strip()
-            if any(word in col_lower for word in ['kecamatan', 'growth', 'performance', '2023', '2024', 'pertumbuhan', 'performa', 'pencapaian']):
-                display_cols.append(col)
-        
-        # If no specific columns found, use first few columns
-        if len(display_cols) < 2:
-            display_cols = df.columns.tolist()[:min(5, len(df.columns))]
-        
-        # Limit to reasonable number of rows and columns
-        table_data = df[display_cols].head(20)
+        marker_rows = build_marker_rows(map_data, map_type, load_kecamatan_dimension(fingerprint))
+    except Exception:
+        # Biarkan create_map_with_data yang menangani data yang tidak valid
+        marker_rows = None
+    return map_data, marker_rows
+
+def render_chart_with_insight(fingerprint, pipeline, years_key, icon, empty_message):
+    """Tampilkan chart beserta hasil analisisnya dari cache pipeline"""
+    with profiling.section(pipeline, "figure"):
+        fig, analysis = get_chart_and_insight(fingerprint, pipeline, years_key)
+    if fig:
+        with profiling.section(pipeline, "render"):
+            st.plotly_chart(fig, use_container_width=True)
+        st.markdown(f"""
+        <div class="chart-explanation">
+            {icon} <strong>Hasil Analisis:</strong> {analysis}
+        </div>
+        """, unsafe_allow_html=True)
+    else:
+        st.info(empty_message)
+
+# ===========================
+# SECTION RENDERING FUNCTIONS
+# ===========================
+def render_map_section(fingerprint, data, selected_years, years_key):
+    """Section peta interaktif per kecamatan"""
+    st.markdown("""
+    <div class="map-container">
+        <div class="map-header">
+            <h2>🗺️ PETA INTERAKTIF KABUPATEN MALANG</h2>
+            <p><em>Visualisasi data sosial per kecamatan berdasarkan berbagai indikator</em></p>
+        </div>
+    """, unsafe_allow_html=True)
+    
+    # FILTER PETA YANG DIPERBAIKI - LEBIH RAPI
+    st.markdown("""
+    <div class="map-filter-container">
+        <h4 class="map-filter-header">🎯 Pilih Jenis Data untuk Visualisasi Peta</h4>
+    """, unsafe_allow_html=True)
+    
+    # Layout filter yang lebih rapi
+    filter_col1, filter_col2 = st.columns([2, 3])
+    
+    with filter_col1:
+        map_type = st.selectbox(
+            "📊 Jenis Data:",
+            ["Bencana Alam", "Bantuan Sosial", "KB Performance", "Peserta KB"],
+            key="map_type_selector",
+            help="Pilih jenis data yang ingin ditampilkan pada peta"
+        )
+    
+    with filter_col2:
+        # Info box yang lebih informatif
+        if map_type == "Bencana Alam":
+            info_text = "🌊 Menampilkan tingkat kerawanan bencana per kecamatan berdasarkan data historis"
+            filter_applied = "📅 Filter tahun aktif"
+        elif map_type == "Bantuan Sosial":
+            info_text = "👥 Menampilkan distribusi penerima bantuan sosial per kecamatan"
+            filter_applied = "📅 Filter tahun aktif"
+        elif map_type == "KB Performance":
+            info_text = "📈 Menampilkan tingkat pertumbuhan program KB tahun 2024 vs 2023"
+            filter_applied = "📊 Data perbandingan 2023-2024"
+        elif map_type == "Peserta KB":
+            info_text = "👶 Menampilkan jumlah peserta program Keluarga Berencana per kecamatan"
+            filter_applied = "📅 Filter tahun aktif"
         
-        # Clean the data - replace NaN with appropriate values
-        table_data = table_data.fillna('-')
+        st.markdown(f"""
+        <div class="filter-info-box">
+            <strong>ℹ️ Informasi:</strong><br>
+            {info_text}<br>
+            <strong>🔧 Status Filter:</strong> {filter_applied}
+        </div>
+        """, unsafe_allow_html=True)
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+    
+    # Prepare data dan layer marker berdasarkan filter (cache per jenis peta & tahun)
+    with profiling.section(f"Peta {map_type}", "groupby"):
+        map_data, marker_rows = get_map_layer(fingerprint, map_type, years_key)
+    
+    # Create and display map
+    with profiling.section(f"Peta {map_type}", "figure"):
+        interactive_map = create_map_with_data(map_data, map_type, selected_years, marker_rows)
+    
+    if interactive_map:
+        # Display map
+        with profiling.section(f"Peta {map_type}", "render"):
+            lazy.streamlit_folium.st_folium(interactive_map, width='100%', height=500)
         
-        return table_data
+        # Map statistics and analysis - DIPERBAIKI
+        if map_data is not None and not map_data.empty:
+            # Analisis data
+            insight = analyze_map_data_generic(map_data, map_type, selected_years)
+            
+            # Statistik berdasarkan jenis data - DIPERBAIKI
+            if map_type == "KB Performance":
+                avg_value = map_data['Growth_Rate'].mean()
+                positive_growth = len(map_data[map_data['Growth_Rate'] > 0])
+                negative_growth = len(map_data[map_data['Growth_Rate'] < 0])
+                top_3 = map_data.nlargest(3, 'Growth_Rate')
+                worst_3 = map_data.nsmallest(3, 'Growth_Rate')
+                
+                st.markdown(f"""
+                <div class="map-stats">
+                    <div class="map-stat-card">
+                        <h4>📊 Statistik KB Performance</h4>
+                        <p><strong>Total Kecamatan:</strong> {len(map_data)}</p>
+                        <p><strong>Pertumbuhan Positif:</strong> {positive_growth} kecamatan</p>
+                        <p><strong>Pertumbuhan Negatif:</strong> {negative_growth} kecamatan</p>
+                    </div>
+                    <div class="map-stat-card">
+                        <h4>🔝 Top 3 Pertumbuhan Terbaik</h4>
+                        {'<br>'.join([f"• {row['Kecamatan']}: {row['Growth_Rate']:.2f}%" for _, row in top_3.iterrows()])}
+                    </div>
+                    <div class="map-stat-card">
+                        <h4>📈 Ringkasan Pertumbuhan</h4>
+                        <p><strong>Rata-rata Pertumbuhan:</strong> {avg_value:.2f}%</p>
+                        <p><strong>Tertinggi:</strong> {top_3.iloc[0]['Growth_Rate']:.2f}%</p>
+                        <p><strong>Terendah:</strong> {worst_3.iloc[0]['Growth_Rate']:.2f}%</p>
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                # Untuk data lainnya (Bencana, Bantuan Sosial, Peserta KB) - DIPERBAIKI FORMAT RATA-RATA
+                value_col = map_data.columns[1]  # Kolom kedua adalah value column
+                total_value = map_data[value_col].sum()
+                avg_value = map_data[value_col].mean()
+                top_3 = map_data.nlargest(3, value_col)
+                
+                if map_type == "Bencana Alam":
+                    unit = "kejadian"
+                    avg_text = f"{avg_value:.0f} bencana"
+                elif map_type == "Bantuan Sosial":
+                    unit = "penerima"
+                    avg_text = f"{avg_value:.0f} orang"
+                elif map_type == "Peserta KB":
+                    unit = "peserta"
+                    avg_text = f"{avg_value:.0f} orang"
+                
+                st.markdown(f"""
+                <div class="map-stats">
+                    <div class="map-stat-card">
+                        <h4>📊 Statistik {map_type}</h4>
+                        <p><strong>Total Kecamatan:</strong> {len(map_data)}</p>
+                        <p><strong>Total {unit.title()}:</strong> {total_value:,.0f}</p>
+                    </div>
+                    <div class="map-stat-card">
+                        <h4>🔝 Top 3 Kecamatan</h4>
+                        {'<br>'.join([f"• {row['Kecamatan']}: {row[value_col]:,.0f} {unit}" for _, row in top_3.iterrows()])}
+                    </div>
+                    <div class="map-stat-card">
+                        <h4>📈 Ringkasan Data</h4>
+                        <p><strong>Rata-rata per Kecamatan:</strong> {avg_text}</p>
+                        <p><strong>Tertinggi:</strong> {top_3.iloc[0][value_col]:,.0f}</p>
+                        <p><strong>Terendah:</strong> {map_data[value_col].min():,.0f}</p>
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            # Display insight
+            icon_map = {
+                "Bencana Alam": "🌊",
+                "Bantuan Sosial": "👥", 
+                "KB Performance": "📈",
+                "Peserta KB": "👶"
+            }
+            icon = icon_map.get(map_type, "📊")
+            
+            st.markdown(f"""
+            <div class="chart-explanation">
+                {icon} <strong>Hasil Analisis {map_type}:</strong> {insight}
+            </div>
+            """, unsafe_allow_html=True)
         
-    except Exception as e:
-        return None
+        else:
+            st.warning(f"⚠️ Data {map_type} tidak tersedia untuk periode yang dipilih.")
+    
+    else:
+        st.error("❌ Gagal memuat peta. Silakan coba lagi.")
+    
+    # Instructions
+    st.markdown("""
+    <div class="instructions">
+        <h4>💡 Cara Menggunakan Peta Interaktif:</h4>
+        <ul>
+            <li>🎯 <strong>Filter Data:</strong> Pilih jenis data yang ingin ditampilkan di peta</li>
+            <li>📍 <strong>Marker:</strong> Klik marker untuk melihat detail data per kecamatan</li>
+            <li>🎨 <strong>Warna Marker:</strong> 
+                <br>• Bencana Alam: Hijau=Aman, Kuning=Rendah, Orange=Sedang, Merah=Tinggi
+                <br>• Bantuan Sosial: Merah=Tidak Ada, Orange=Sedikit, Biru=Sedang, Hijau=Banyak
+                <br>• KB Performance: Hijau=Pertumbuhan Bagus, Orange=Penurunan, Merah=Penurunan Besar
+                <br>• Peserta KB: Merah=Tidak Ada, Orange=Sedikit, Biru=Sedang, Hijau=Banyak</li>
+            <li>🔍 <strong>Zoom & Pan:</strong> Gunakan mouse untuk memperbesar dan menggeser peta</li>
+            <li>📅 <strong>Filter Tahun:</strong> Gunakan filter tahun di sidebar untuk data yang sensitif waktu</li>
+            <li>📊 <strong>Statistik:</strong> Lihat ringkasan statistik di bawah peta untuk insight cepat</li>
+        </ul>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+
+def render_bantuan_sosial_section(fingerprint, data, selected_years, years_key):
+    """Section chart bantuan sosial"""
+    st.markdown("""
+    <div class="section-container">
+        <div class="section-header">
+            <h2>👥 BANTUAN SOSIAL</h2>
+        </div>
+    """, unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        render_chart_with_insight(fingerprint, 'penerima_per_tahun', years_key, "📊", "📊 Data Penerima per Tahun tidak tersedia")
+    
+    with col2:
+        render_chart_with_insight(fingerprint, 'bantuan_donut', years_key, "🍩", "📊 Data Bantuan tidak tersedia")
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+
+def render_bencana_section(fingerprint, data, selected_years, years_key):
+    """Section chart dan tabel kerugian bencana alam"""
+    st.markdown("""
+    <div class="section-container">
+        <div class="section-header">
+            <h2>🌊 BENCANA ALAM</h2>
+        </div>
+    """, unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        render_chart_with_insight(fingerprint, 'jenis_bencana_pie', years_key, "🥧", "📊 Data Jenis Bencana tidak tersedia")
+    
+    with col2:
+        render_chart_with_insight(fingerprint, 'bencana_kecamatan', years_key, "📊", "📊 Data Bencana per Kecamatan tidak tersedia")
+    
+    # Kerugian table (full width)
+    st.markdown("#### 💰 Total Kerugian per Kecamatan")
+    table = create_kerugian_table(fingerprint, data, selected_years)
+    if table is not None and not table.empty:
+        st.dataframe(table, use_container_width=True, height=400)
+        # Analysis for kerugian table
+        try:
+            total_kerugian = table['Kerugian_Rupiah'].apply(lambda x: int(x.replace('Rp ', '').replace(',', ''))).sum()
+            top_kerugian = table.iloc[0] if not table.empty else None
+            kecamatan_terdampak = len(table[table['Kerugian_Rupiah'] != 'Rp 0'])
+            
+            analysis = f"Total kerugian akibat bencana mencapai Rp {total_kerugian:,.0f}. "
+            if top_kerugian is not None:
+                analysis += f"Kerugian terbesar terjadi di {top_kerugian.iloc[0]} pada tahun {top_kerugian.iloc[1]} " \
+                           f"dengan nilai {top_kerugian.iloc[2]}. "
+            analysis += f"Terdapat {kecamatan_terdampak} kecamatan yang mengalami kerugian finansial akibat bencana."
+            
+            st.markdown(f"""
+            <div class="chart-explanation">
+                💰 <strong>Hasil Analisis:</strong> {analysis}
+            </div>
+            """, unsafe_allow_html=True)
+        except:
+            st.markdown("""
+            <div class="chart-explanation">
+                💰 <strong>Hasil Analisis:</strong> Data kerugian menunjukkan dampak finansial bencana alam di berbagai kecamatan.
+            </div>
+            """, unsafe_allow_html=True)
+    else:
+        st.info("📊 Data Kerugian tidak tersedia")
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+
+def render_kekerasan_section(fingerprint, data, selected_years, years_key):
+    """Section chart kekerasan anak dan perempuan"""
+    st.markdown("""
+    <div class="section-container">
+        <div class="section-header">
+            <h2>⚠️ KEKERASAN</h2>
+        </div>
+    """, unsafe_allow_html=True)
+    
+    # First row: Tren Total Kekerasan dan Perbandingan Gender
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        render_chart_with_insight(fingerprint, 'kekerasan_total_yearly', years_key, "📈", "📊 Data Total Kekerasan tidak tersedia")
+    
+    with col2:
+        render_chart_with_insight(fingerprint, 'kekerasan_gender_comparison', years_key, "📊", "📊 Data Kekerasan berdasarkan Gender tidak tersedia")
+    
+    # Second row: Kekerasan Perempuan Tren dan Usia
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        render_chart_with_insight(fingerprint, 'kekerasan_perempuan_yearly', years_key, "📈", "📊 Data Kekerasan Perempuan tidak tersedia")
+    
+    with col2:
+        render_chart_with_insight(fingerprint, 'kekerasan_perempuan_usia', years_key, "📊", "📊 Data Kekerasan berdasarkan Usia tidak tersedia")
+    
+    # Third row: Pola Kekerasan Anak Bulanan dan Kumulatif
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        render_chart_with_insight(fingerprint, 'kekerasan_anak_monthly_pattern', years_key, "🔥", "📊 Data Pola Bulanan Kekerasan Anak tidak tersedia")
+    
+    with col2:
+        render_chart_with_insight(fingerprint, 'kekerasan_anak_cumulative', years_key, "📈", "📊 Data Kumulatif Kekerasan Anak tidak tersedia")
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+
+def render_kb_section(fingerprint, data, selected_years, years_key):
+    """Section chart dan tabel keluarga berencana"""
+    st.markdown("""
+    <div class="section-container">
+        <div class="section-header">
+            <h2>👶 KELUARGA BERENCANA (KB)</h2>
+        </div>
+    """, unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        render_chart_with_insight(fingerprint, 'kontrasepsi', years_key, "📊", "📊 Data Kontrasepsi tidak tersedia")
+    
+    with col2:
+        st.markdown("#### 📈 Performa KB Kecamatan 2023-2024")
+        table = create_kb_performance_table(data)
+        if table is not None and not table.empty:
+            st.dataframe(table, use_container_width=True, height=400)
+            # Analysis for KB performance table
+            analysis = analyze_kb_performance_table(data)
+            st.markdown(f"""
+            <div class="chart-explanation">
+                📈 <strong>Hasil Analisis:</strong> {analysis}
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.info("📊 Data Performa KB tidak tersedia")
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+
+# Label tab -> fungsi render section
+SECTION_TABS = {
+    "🗺️ Peta Interaktif": render_map_section,
+    "👥 Bantuan Sosial": render_bantuan_sosial_section,
+    "🌊 Bencana Alam": render_bencana_section,
+    "⚠️ Kekerasan": render_kekerasan_section,
+    "👶 Keluarga Berencana": render_kb_section,
+}
 
 # ===========================
 # MAIN APPLICATION
 # ===========================
 def main():
+    # Profiling opsional (DASHBOARD_PROFILE=1 atau ?profile=1)
+    profiling.start_run("sosial")
+    
     # Load data
-    with st.spinner("📊 Loading data..."):
-        data = load_local_data()
+    with st.spinner("📊 Loading data..."), profiling.section("Load data", "load"):
+        # Fingerprint dihitung sekali per rerun lalu diteruskan ke semua cache turunan
+        fingerprint = sosial_fingerprint()
+        data = load_sosial_data(fingerprint)
     
     if not data:
         st.error("❌ Tidak ada data yang berhasil dimuat!")
+        profiling.finish_run()
         return
     
     # Get available years
@@ -2579,7 +2282,8 @@ def main():
         <div class="filter-section">
         """, unsafe_allow_html=True)
         
-        selected_years = create_year_chips(available_years, "main")
+        with profiling.section("Filter tahun", "filter"):
+            selected_years = create_year_chips(available_years, "main")
         
         st.markdown("</div>", unsafe_allow_html=True)
         
@@ -2606,8 +2310,12 @@ def main():
     """, unsafe_allow_html=True)
     
     try:
+        # Kunci cache untuk chart + insight (urutan klik tahun tidak berpengaruh)
+        years_key = normalize_years(selected_years)
+        
         # Calculate KPIs
-        kpis = calculate_kpis(data, selected_years)
+        with profiling.section("KPI", "groupby"):
+            kpis = get_kpis(fingerprint, years_key)
         
         # Display KPIs - DIPERBAIKI DENGAN LAYOUT YANG LEBIH RAPI
         st.markdown("""
@@ -2671,451 +2379,17 @@ def main():
         st.markdown("</div>", unsafe_allow_html=True)
         
         # ===========================
-        # SECTION: PETA INTERAKTIF - FILTER YANG DIPERBAIKI
-        # ===========================
-        st.markdown("""
-        <div class="map-container">
-            <div class="map-header">
-                <h2>🗺️ PETA INTERAKTIF KABUPATEN MALANG</h2>
-                <p><em>Visualisasi data sosial per kecamatan berdasarkan berbagai indikator</em></p>
-            </div>
-        """, unsafe_allow_html=True)
-        
-        # FILTER PETA YANG DIPERBAIKI - LEBIH RAPI
-        st.markdown("""
-        <div class="map-filter-container">
-            <h4 class="map-filter-header">🎯 Pilih Jenis Data untuk Visualisasi Peta</h4>
-        """, unsafe_allow_html=True)
-        
-        # Layout filter yang lebih rapi
-        filter_col1, filter_col2 = st.columns([2, 3])
-        
-        with filter_col1:
-            map_type = st.selectbox(
-                "📊 Jenis Data:",
-                ["Bencana Alam", "Bantuan Sosial", "KB Performance", "Peserta KB"],
-                key="map_type_selector",
-                help="Pilih jenis data yang ingin ditampilkan pada peta"
-            )
-        
-        with filter_col2:
-            # Info box yang lebih informatif
-            if map_type == "Bencana Alam":
-                info_text = "🌊 Menampilkan tingkat kerawanan bencana per kecamatan berdasarkan data historis"
-                filter_applied = "📅 Filter tahun aktif"
-            elif map_type == "Bantuan Sosial":
-                info_text = "👥 Menampilkan distribusi penerima bantuan sosial per kecamatan"
-                filter_applied = "📅 Filter tahun aktif"
-            elif map_type == "KB Performance":
-                info_text = "📈 Menampilkan tingkat pertumbuhan program KB tahun 2024 vs 2023"
-                filter_applied = "📊 Data perbandingan 2023-2024"
-            elif map_type == "Peserta KB":
-                info_text = "👶 Menampilkan jumlah peserta program Keluarga Berencana per kecamatan"
-                filter_applied = "📅 Filter tahun aktif"
-            
-            st.markdown(f"""
-            <div class="filter-info-box">
-                <strong>ℹ️ Informasi:</strong><br>
-                {info_text}<br>
-                <strong>🔧 Status Filter:</strong> {filter_applied}
-            </div>
-            """, unsafe_allow_html=True)
-        
-        st.markdown("</div>", unsafe_allow_html=True)
-        
-        # Prepare data berdasarkan filter
-        if map_type == "Bencana Alam":
-            map_data = prepare_disaster_data_for_map(data, selected_years)
-        elif map_type == "Bantuan Sosial":
-            map_data = prepare_bantuan_sosial_data_for_map(data, selected_years)
-        elif map_type == "KB Performance":
-            map_data = prepare_kb_performance_data_for_map(data)
-        elif map_type == "Peserta KB":
-            map_data = prepare_peserta_kb_data_for_map(data, selected_years)
-        else:
-            map_data = None
-        
-        # Create and display map
-        interactive_map = create_map_with_data(map_data, map_type, selected_years)
-        
-        if interactive_map:
-            # Display map
-            map_data_result = st_folium(interactive_map, width='100%', height=500)
-            
-            # Map statistics and analysis - DIPERBAIKI
-            if map_data is not None and not map_data.empty:
-                # Analisis data
-                insight = analyze_map_data_generic(map_data, map_type, selected_years)
-                
-                # Statistik berdasarkan jenis data - DIPERBAIKI
-                if map_type == "KB Performance":
-                    avg_value = map_data['Growth_Rate'].mean()
-                    positive_growth = len(map_data[map_data['Growth_Rate'] > 0])
-                    negative_growth = len(map_data[map_data['Growth_Rate'] < 0])
-                    top_3 = map_data.nlargest(3, 'Growth_Rate')
-                    worst_3 = map_data.nsmallest(3, 'Growth_Rate')
-                    
-                    st.markdown(f"""
-                    <div class="map-stats">
-                        <div class="map-stat-card">
-                            <h4>📊 Statistik KB Performance</h4>
-                            <p><strong>Total Kecamatan:</strong> {len(map_data)}</p>
-                            <p><strong>Pertumbuhan Positif:</strong> {positive_growth} kecamatan</p>
-                            <p><strong>Pertumbuhan Negatif:</strong> {negative_growth} kecamatan</p>
-                        </div>
-                        <div class="map-stat-card">
-                            <h4>🔝 Top 3 Pertumbuhan Terbaik</h4>
-                            {'<br>'.join([f"• {row['Kecamatan']}: {row['Growth_Rate']:.2f}%" for _, row in top_3.iterrows()])}
-                        </div>
-                        <div class="map-stat-card">
-                            <h4>📈 Ringkasan Pertumbuhan</h4>
-                            <p><strong>Rata-rata Pertumbuhan:</strong> {avg_value:.2f}%</p>
-                            <p><strong>Tertinggi:</strong> {top_3.iloc[0]['Growth_Rate']:.2f}%</p>
-                            <p><strong>Terendah:</strong> {worst_3.iloc[0]['Growth_Rate']:.2f}%</p>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    # Untuk data lainnya (Bencana, Bantuan Sosial, Peserta KB) - DIPERBAIKI FORMAT RATA-RATA
-                    value_col = map_data.columns[1]  # Kolom kedua adalah value column
-                    total_value = map_data[value_col].sum()
-                    avg_value = map_data[value_col].mean()
-                    top_3 = map_data.nlargest(3, value_col)
-                    
-                    if map_type == "Bencana Alam":
-                        unit = "kejadian"
-                        avg_text = f"{avg_value:.0f} bencana"
-                    elif map_type == "Bantuan Sosial":
-                        unit = "penerima"
-                        avg_text = f"{avg_value:.0f} orang"
-                    elif map_type == "Peserta KB":
-                        unit = "peserta"
-                        avg_text = f"{avg_value:.0f} orang"
-                    
-                    st.markdown(f"""
-                    <div class="map-stats">
-                        <div class="map-stat-card">
-                            <h4>📊 Statistik {map_type}</h4>
-                            <p><strong>Total Kecamatan:</strong> {len(map_data)}</p>
-                            <p><strong>Total {unit.title()}:</strong> {total_value:,.0f}</p>
-                        </div>
-                        <div class="map-stat-card">
-                            <h4>🔝 Top 3 Kecamatan</h4>
-                            {'<br>'.join([f"• {row['Kecamatan']}: {row[value_col]:,.0f} {unit}" for _, row in top_3.iterrows()])}
-                        </div>
-                        <div class="map-stat-card">
-                            <h4>📈 Ringkasan Data</h4>
-                            <p><strong>Rata-rata per Kecamatan:</strong> {avg_text}</p>
-                            <p><strong>Tertinggi:</strong> {top_3.iloc[0][value_col]:,.0f}</p>
-                            <p><strong>Terendah:</strong> {map_data[value_col].min():,.0f}</p>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                # Display insight
-                icon_map = {
-                    "Bencana Alam": "🌊",
-                    "Bantuan Sosial": "👥", 
-                    "KB Performance": "📈",
-                    "Peserta KB": "👶"
-                }
-                icon = icon_map.get(map_type, "📊")
-                
-                st.markdown(f"""
-                <div class="chart-explanation">
-                    {icon} <strong>Hasil Analisis {map_type}:</strong> {insight}
-                </div>
-                """, unsafe_allow_html=True)
-            
-            else:
-                st.warning(f"⚠️ Data {map_type} tidak tersedia untuk periode yang dipilih.")
-        
-        else:
-            st.error("❌ Gagal memuat peta. Silakan coba lagi.")
-        
-        # Instructions
-        st.markdown("""
-        <div class="instructions">
-            <h4>💡 Cara Menggunakan Peta Interaktif:</h4>
-            <ul>
-                <li>🎯 <strong>Filter Data:</strong> Pilih jenis data yang ingin ditampilkan di peta</li>
-                <li>📍 <strong>Marker:</strong> Klik marker untuk melihat detail data per kecamatan</li>
-                <li>🎨 <strong>Warna Marker:</strong> 
-                    <br>• Bencana Alam: Hijau=Aman, Kuning=Rendah, Orange=Sedang, Merah=Tinggi
-                    <br>• Bantuan Sosial: Merah=Tidak Ada, Orange=Sedikit, Biru=Sedang, Hijau=Banyak
-                    <br>• KB Performance: Hijau=Pertumbuhan Bagus, Orange=Penurunan, Merah=Penurunan Besar
-                    <br>• Peserta KB: Merah=Tidak Ada, Orange=Sedikit, Biru=Sedang, Hijau=Banyak</li>
-                <li>🔍 <strong>Zoom & Pan:</strong> Gunakan mouse untuk memperbesar dan menggeser peta</li>
-                <li>📅 <strong>Filter Tahun:</strong> Gunakan filter tahun di sidebar untuk data yang sensitif waktu</li>
-                <li>📊 <strong>Statistik:</strong> Lihat ringkasan statistik di bawah peta untuk insight cepat</li>
-            </ul>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("</div>", unsafe_allow_html=True)
-        
-        # ===========================
-        # SECTION 1: BANTUAN SOSIAL
+        # SECTIONS - TAB LAZY
         # ===========================
-        st.markdown("""
-        <div class="section-container">
-            <div class="section-header">
-                <h2>👥 BANTUAN SOSIAL</h2>
-            </div>
-        """, unsafe_allow_html=True)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            chart = create_penerima_per_tahun_chart(data, selected_years)
-            if chart:
-                st.plotly_chart(chart, use_container_width=True)
-                # Analysis for penerima per tahun
-                analysis = analyze_penerima_per_tahun(data, selected_years)
-                st.markdown(f"""
-                <div class="chart-explanation">
-                    📊 <strong>Hasil Analisis:</strong> {analysis}
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.info("📊 Data Penerima per Tahun tidak tersedia")
-        
-        with col2:
-            chart = create_bantuan_donut_chart(data, selected_years)
-            if chart:
-                st.plotly_chart(chart, use_container_width=True)
-                # Analysis for bantuan donut
-                analysis = analyze_bantuan_donut(data, selected_years)
-                st.markdown(f"""
-                <div class="chart-explanation">
-                    🍩 <strong>Hasil Analisis:</strong> {analysis}
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.info("📊 Data Bantuan tidak tersedia")
-        
-        st.markdown("</div>", unsafe_allow_html=True)
-        
-        # ===========================
-        # SECTION 2: BENCANA ALAM
-        # ===========================
-        st.markdown("""
-        <div class="section-container">
-            <div class="section-header">
-                <h2>🌊 BENCANA ALAM</h2>
-            </div>
-        """, unsafe_allow_html=True)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            chart = create_jenis_bencana_pie_chart(data, selected_years)
-            if chart:
-                st.plotly_chart(chart, use_container_width=True)
-                # Analysis for jenis bencana
-                analysis = analyze_jenis_bencana_pie(data, selected_years)
-                st.markdown(f"""
-                <div class="chart-explanation">
-                    🥧 <strong>Hasil Analisis:</strong> {analysis}
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.info("📊 Data Jenis Bencana tidak tersedia")
-        
-        with col2:
-            chart = create_bencana_kecamatan_chart(data, selected_years)
-            if chart:
-                st.plotly_chart(chart, use_container_width=True)
-                # Analysis for bencana kecamatan
-                analysis = analyze_bencana_kecamatan(data, selected_years)
-                st.markdown(f"""
-                <div class="chart-explanation">
-                    📊 <strong>Hasil Analisis:</strong> {analysis}
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.info("📊 Data Bencana per Kecamatan tidak tersedia")
-        
-        # Kerugian table (full width)
-        st.markdown("#### 💰 Total Kerugian per Kecamatan")
-        table = create_kerugian_table(data, selected_years)
-        if table is not None and not table.empty:
-            st.dataframe(table, use_container_width=True, height=400)
-            # Analysis for kerugian table
-            try:
-                total_kerugian = table['Kerugian_Rupiah'].apply(lambda x: int(x.replace('Rp ', '').replace(',', ''))).sum()
-                top_kerugian = table.iloc[0] if not table.empty else None
-                kecamatan_terdampak = len(table[table['Kerugian_Rupiah'] != 'Rp 0'])
-                
-                analysis = f"Total kerugian akibat bencana mencapai Rp {total_kerugian:,.0f}. "
-                if top_kerugian is not None:
-                    analysis += f"Kerugian terbesar terjadi di {top_kerugian.iloc[0]} pada tahun {top_kerugian.iloc[1]} " \
-                               f"dengan nilai {top_kerugian.iloc[2]}. "
-                analysis += f"Terdapat {kecamatan_terdampak} kecamatan yang mengalami kerugian finansial akibat bencana."
-                
-                st.markdown(f"""
-                <div class="chart-explanation">
-                    💰 <strong>Hasil Analisis:</strong> {analysis}
-                </div>
-                """, unsafe_allow_html=True)
-            except:
-                st.markdown("""
-                <div class="chart-explanation">
-                    💰 <strong>Hasil Analisis:</strong> Data kerugian menunjukkan dampak finansial bencana alam di berbagai kecamatan.
-                </div>
-                """, unsafe_allow_html=True)
-        else:
-            st.info("📊 Data Kerugian tidak tersedia")
-        
-        st.markdown("</div>", unsafe_allow_html=True)
-        
-        # ===========================
-        # SECTION 3: KEKERASAN - LENGKAP DENGAN SEMUA CHART
-        # ===========================
-        st.markdown("""
-        <div class="section-container">
-            <div class="section-header">
-                <h2>⚠️ KEKERASAN</h2>
-            </div>
-        """, unsafe_allow_html=True)
-        
-        # First row: Tren Total Kekerasan dan Perbandingan Gender
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            chart = create_kekerasan_total_yearly_chart(data, selected_years)
-            if chart:
-                st.plotly_chart(chart, use_container_width=True)
-                # Analysis for kekerasan total yearly
-                analysis = analyze_kekerasan_total_yearly(data, selected_years)
-                st.markdown(f"""
-                <div class="chart-explanation">
-                    📈 <strong>Hasil Analisis:</strong> {analysis}
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.info("📊 Data Total Kekerasan tidak tersedia")
-        
-        with col2:
-            chart = create_kekerasan_gender_comparison_chart(data, selected_years)
-            if chart:
-                st.plotly_chart(chart, use_container_width=True)
-                # Analysis for kekerasan gender comparison
-                analysis = analyze_kekerasan_gender_comparison(data, selected_years)
-                st.markdown(f"""
-                <div class="chart-explanation">
-                    📊 <strong>Hasil Analisis:</strong> {analysis}
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.info("📊 Data Kekerasan berdasarkan Gender tidak tersedia")
-        
-        # Second row: Kekerasan Perempuan Tren dan Usia
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            chart = create_kekerasan_perempuan_yearly_chart(data, selected_years)
-            if chart:
-                st.plotly_chart(chart, use_container_width=True)
-                # Analysis for kekerasan perempuan yearly
-                analysis = analyze_kekerasan_perempuan_yearly(data, selected_years)
-                st.markdown(f"""
-                <div class="chart-explanation">
-                    📈 <strong>Hasil Analisis:</strong> {analysis}
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.info("📊 Data Kekerasan Perempuan tidak tersedia")
-        
-        with col2:
-            chart = create_kekerasan_perempuan_usia_chart(data, selected_years)
-            if chart:
-                st.plotly_chart(chart, use_container_width=True)
-                # Analysis for kekerasan perempuan usia
-                analysis = analyze_kekerasan_perempuan_usia(data, selected_years)
-                st.markdown(f"""
-                <div class="chart-explanation">
-                    📊 <strong>Hasil Analisis:</strong> {analysis}
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.info("📊 Data Kekerasan berdasarkan Usia tidak tersedia")
-        
-        # Third row: Pola Kekerasan Anak Bulanan dan Kumulatif
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            chart = create_kekerasan_anak_monthly_pattern_chart(data, selected_years)
-            if chart:
-                st.plotly_chart(chart, use_container_width=True)
-                # Analysis for kekerasan anak monthly pattern
-                analysis = analyze_kekerasan_anak_monthly_pattern(data, selected_years)
-                st.markdown(f"""
-                <div class="chart-explanation">
-                    🔥 <strong>Hasil Analisis:</strong> {analysis}
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.info("📊 Data Pola Bulanan Kekerasan Anak tidak tersedia")
-        
-        with col2:
-            chart = create_kekerasan_anak_cumulative_chart(data, selected_years)
-            if chart:
-                st.plotly_chart(chart, use_container_width=True)
-                # Analysis for kekerasan anak cumulative
-                analysis = analyze_kekerasan_anak_cumulative(data, selected_years)
-                st.markdown(f"""
-                <div class="chart-explanation">
-                    📈 <strong>Hasil Analisis:</strong> {analysis}
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.info("📊 Data Kumulatif Kekerasan Anak tidak tersedia")
-        
-        st.markdown("</div>", unsafe_allow_html=True)
-        
-        # ===========================
-        # SECTION 4: KELUARGA BERENCANA (KB)
-        # ===========================
-        st.markdown("""
-        <div class="section-container">
-            <div class="section-header">
-                <h2>👶 KELUARGA BERENCANA (KB)</h2>
-            </div>
-        """, unsafe_allow_html=True)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            chart = create_kontrasepsi_chart(data, selected_years)
-            if chart:
-                st.plotly_chart(chart, use_container_width=True)
-                # Analysis for kontrasepsi
-                analysis = analyze_kontrasepsi_chart(data, selected_years)
-                st.markdown(f"""
-                <div class="chart-explanation">
-                    📊 <strong>Hasil Analisis:</strong> {analysis}
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.info("📊 Data Kontrasepsi tidak tersedia")
-        
-        with col2:
-            st.markdown("#### 📈 Performa KB Kecamatan 2023-2024")
-            table = create_kb_performance_table(data)
-            if table is not None and not table.empty:
-                st.dataframe(table, use_container_width=True, height=400)
-                # Analysis for KB performance table
-                analysis = analyze_kb_performance_table(data)
-                st.markdown(f"""
-                <div class="chart-explanation">
-                    📈 <strong>Hasil Analisis:</strong> {analysis}
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.info("📊 Data Performa KB tidak tersedia")
-        
-        st.markdown("</div>", unsafe_allow_html=True)
+        # Hanya tab yang sedang dibuka yang menghitung chart-nya; pindah tab memicu rerun
+        # Pilihan jenis peta tetap tersimpan walau tab peta sedang tidak dirender
+        if "map_type_selector" in st.session_state:
+            st.session_state.map_type_selector = st.session_state.map_type_selector
+        section_tabs = st.tabs(list(SECTION_TABS), key="sosial_section", on_change="rerun")
+        for tab, render_section in zip(section_tabs, SECTION_TABS.values()):
+            with tab:
+                if tab.open:
+                    render_section(fingerprint, data, selected_years, years_key)
         
         # Display active filters info
         st.markdown("---")
@@ -3135,6 +2409,8 @@ def main():
     
     except Exception as e:
         st.error(f"❌ Terjadi kesalahan dalam memuat dashboard: {str(e)}")
+    
+    profiling.finish_run()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
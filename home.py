@@ -1,11 +1,5 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime
-import subprocess
-import sys
-import socket
 import os
 
 # Konfigurasi halaman
@@ -16,8 +10,8 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# CSS Styling
-st.markdown("""
+# CSS Styling (hanya disuntikkan di halaman beranda)
+HOME_CSS = """
 <style>
     .main-header {
         background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
@@ -145,68 +139,42 @@ st.markdown("""
         font-size: 0.9rem;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Dashboard yang di-host sebagai halaman dalam satu server Streamlit
+DASHBOARD_PAGES = {
+    "dashboard_kesehatan.py": ("Dashboard Kesehatan", "🏥", "kesehatan"),
+    "dashboard_sosial.py": ("Dashboard Sosial", "👥", "sosial"),
+    "dashboard_pendidikan.py": ("Dashboard Pendidikan", "🎓", "pendidikan"),
+    "dashboard_profil_kecamatan.py": ("Profil Kecamatan", "📍", "profil-kecamatan"),
+}
 
 def check_file_exists(filename):
     """Check if dashboard file exists"""
     return os.path.exists(filename)
 
-def find_available_port(start_port=8502):
-    """Find available port starting from start_port"""
-    port = start_port
-    while port < start_port + 10:
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            result = sock.connect_ex(('127.0.0.1', port))
-            sock.close()
-            if result != 0:
-                return port
-            port += 1
-        except:
-            port += 1
-    return start_port
-
 def open_dashboard(script_name, dashboard_name):
-    """Function to open dashboard in new browser tab"""
+    """Pindah ke halaman dashboard di server yang sama"""
     if not check_file_exists(script_name):
         st.error(f"❌ File {script_name} tidak ditemukan!")
         st.info(f"💡 Pastikan file {script_name} ada di directory yang sama dengan home.py")
         return
-    
-    try:
-        port = find_available_port()
-        
-        # Command untuk Windows
-        if os.name == 'nt':  # Windows
-            subprocess.Popen([
-                sys.executable, "-m", "streamlit", "run", script_name, 
-                "--server.port", str(port)
-            ], shell=True, creationflags=subprocess.CREATE_NEW_CONSOLE)
-        else:  # Linux/Mac
-            subprocess.Popen([
-                sys.executable, "-m", "streamlit", "run", script_name, 
-                "--server.port", str(port)
-            ])
-        
-        st.success(f"✅ {dashboard_name} sedang dibuka...")
-        st.info(f"🌐 URL: http://localhost:{port}")
-        st.warning("⏳ Tunggu beberapa detik, dashboard akan terbuka di browser/tab baru")
-        
-        # Tampilkan link manual jika auto-open gagal
-        st.markdown(f"""
-        <div style="margin-top: 15px;">
-            <p>Jika tidak terbuka otomatis, klik link berikut:</p>
-            <a href="http://localhost:{port}" target="_blank" class="manual-link">
-                🔗 Buka {dashboard_name} Manual
-            </a>
-        </div>
-        """, unsafe_allow_html=True)
-        
-    except Exception as e:
-        st.error(f"❌ Error membuka {dashboard_name}: {str(e)}")
-        st.info(f"💡 Coba jalankan manual dengan command: `streamlit run {script_name}`")
+
+    # Tidak menjalankan proses baru: halaman dashboard memakai proses,
+    # import, dan cache data yang sama dengan beranda
+    st.switch_page(script_name)
+
+def build_navigation():
+    """Daftarkan beranda dan semua dashboard sebagai halaman multipage"""
+    pages = [st.Page(main, title="Beranda", icon="🏛️", default=True)]
+    for script_name, (dashboard_name, icon, url_path) in DASHBOARD_PAGES.items():
+        if check_file_exists(script_name):
+            pages.append(st.Page(script_name, title=dashboard_name, icon=icon, url_path=url_path))
+    return st.navigation(pages)
 
 def main():
+    st.markdown(HOME_CSS, unsafe_allow_html=True)
+
     # Header
     st.markdown("""
     <div class="main-header">
@@ -229,20 +197,17 @@ def main():
     # File Status Check
     st.markdown("## 📁 Status File Dashboard")
     
-    files_to_check = [
-        ("dashboard_kesehatan.py", "Dashboard Kesehatan"),
-        ("dashboard_sosial.py", "Dashboard Sosial"), 
-        ("dashboard_pendidikan.py", "Dashboard Pendidikan")
-    ]
+    # Semua halaman di DASHBOARD_PAGES, termasuk Profil Kecamatan
+    files_to_check = [(filename, name) for filename, (name, _, _) in DASHBOARD_PAGES.items()]
     
-    col1, col2, col3 = st.columns(3)
+    status_cols = st.columns(len(files_to_check))
     file_status = {}
     
     for i, (filename, name) in enumerate(files_to_check):
         exists = check_file_exists(filename)
         file_status[filename] = exists
         
-        with [col1, col2, col3][i]:
+        with status_cols[i]:
             if exists:
                 st.success(f"✅ {name}")
             else:
@@ -292,7 +257,7 @@ def main():
     
     # Main Dashboard Selection
     st.markdown("## 🎯 Pilih Dashboard")
-    st.markdown("Klik tombol di bawah untuk membuka dashboard di tab browser baru:")
+    st.markdown("Klik tombol di bawah untuk membuka dashboard:")
     
     # 3 Dashboard Cards
     col1, col2, col3 = st.columns(3)
@@ -369,21 +334,36 @@ def main():
                     disabled=not file_status.get("dashboard_pendidikan.py", False)):
             open_dashboard("dashboard_pendidikan.py", "Dashboard Pendidikan")
     
+    # Profil lintas sektor
+    st.markdown("### 📍 Profil Kecamatan")
+    st.markdown(
+        "Stunting, APK/APM, bantuan sosial, KB, dan bencana untuk satu kecamatan dalam satu halaman, "
+        "dari tabel fakta kecamatan x tahun yang sudah digabung."
+    )
+    if st.button("🚀 Buka Profil Kecamatan", key="profile", use_container_width=True,
+                disabled=not file_status.get("dashboard_profil_kecamatan.py", False)):
+        open_dashboard("dashboard_profil_kecamatan.py", "Profil Kecamatan")
+    
     # Manual Commands
     st.markdown("---")
     st.markdown("## 🔧 Perintah Manual")
-    st.markdown("Jika tombol tidak berfungsi, gunakan perintah berikut di Command Prompt/Terminal:")
+    st.markdown("Semua dashboard berjalan dalam satu server. Jalankan perintah berikut di Command Prompt/Terminal, lalu buka halaman dashboard:")
     
-    manual_col1, manual_col2, manual_col3 = st.columns(3)
+    st.code("streamlit run home.py", language="bash")
+    
+    manual_col1, manual_col2, manual_col3, manual_col4 = st.columns(4)
     
     with manual_col1:
-        st.code("streamlit run dashboard_kesehatan.py", language="bash")
+        st.code("http://localhost:8501/kesehatan", language="text")
     
     with manual_col2:
-        st.code("streamlit run dashboard_sosial.py", language="bash")
+        st.code("http://localhost:8501/sosial", language="text")
     
     with manual_col3:
-        st.code("streamlit run dashboard_pendidikan.py", language="bash")
+        st.code("http://localhost:8501/pendidikan", language="text")
+    
+    with manual_col4:
+        st.code("http://localhost:8501/profil-kecamatan", language="text")
     
     # Quick Access Section
     st.markdown("---")
@@ -423,8 +403,8 @@ def main():
         ### 🚀 Cara Menggunakan:
         1. **Pastikan semua file dashboard ada** (cek status di atas)
         2. **Klik tombol dashboard** yang ingin Anda akses
-        3. **Dashboard akan terbuka** di browser/tab baru
-        4. **Setiap dashboard** berjalan di port berbeda
+        3. **Dashboard akan terbuka** di halaman yang sama
+        4. **Semua dashboard** berbagi satu server dan cache data
         5. **Gunakan filter** untuk analisis spesifik
         """)
     
@@ -432,8 +412,8 @@ def main():
         st.markdown("""
         ### 🔧 Troubleshooting:
         - **File tidak ditemukan:** Pastikan file ada di folder yang sama
-        - **Port sudah digunakan:** Dashboard akan mencari port lain otomatis
-        - **Browser tidak terbuka:** Gunakan link manual yang muncul
+        - **Dashboard tidak muncul di menu:** Pastikan file dashboard tersedia
+        - **Pindah dashboard:** Gunakan menu navigasi di sidebar
         - **Error lain:** Gunakan perintah manual di Command Prompt
         """)
     
@@ -457,4 +437,4 @@ def main():
     """, unsafe_allow_html=True)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    build_navigation().run()
\ No newline at end of file
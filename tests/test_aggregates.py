@@ -0,0 +1,49 @@
+import itertools
+
+import pandas as pd
+import pytest
+
+from core.aggregates import CUBE_SPECS, ROW_COUNT_COL, build_cube, slice_cube
+from core.datastore import load_dataset
+
+def source_path(name):
+    """Path CSV untuk nama dataset (kebalikan dari nama di load_sosial_data)"""
+    return "data/sosial/" + name.lower().replace(" ", "_") + ".csv"
+
+@pytest.fixture(scope="module")
+def sosial_data():
+    return {name: load_dataset(source_path(name)) for name in CUBE_SPECS}
+
+def slice_cases(df, dims):
+    """Semua subset dimensi (urut seperti cube) x pilihan tahun: satu tahun, beberapa tahun, Semua Tahun"""
+    years = sorted(df["Tahun"].unique().tolist())
+    year_choices = [[years[-1]], years[::2], ["Semua Tahun"]]
+    for size in range(1, len(dims) + 1):
+        for by in itertools.combinations(dims, size):
+            for selected_years in year_choices:
+                yield by, selected_years
+
+def plain_groupby(df, selected_years, by, measures):
+    """Pembanding: filter tahun lalu groupby langsung pada data baris"""
+    if "Semua Tahun" not in selected_years:
+        df = df[df["Tahun"].isin(selected_years)]
+    grouped = df.groupby(list(by), sort=True, observed=True)
+    expected = grouped[measures].sum()
+    expected[ROW_COUNT_COL] = grouped.size()
+    return expected.reset_index()
+
+# ===========================
+# SLICE CUBE VS GROUPBY
+# ===========================
+@pytest.mark.parametrize("name", CUBE_SPECS)
+def test_slice_matches_groupby(sosial_data, name):
+    dims, measures = CUBE_SPECS[name]
+    df = sosial_data[name]
+    cube = build_cube(df, dims, measures)
+
+    for by, selected_years in slice_cases(df, dims):
+        sliced = slice_cube(cube, selected_years, by)
+        expected = plain_groupby(df, selected_years, by, measures)
+        assert not sliced.empty
+        # Ukuran float dijumlahkan dua tahap (per sel lalu per slice); selisih hanya pembulatan
+        pd.testing.assert_frame_equal(sliced, expected, check_dtype=False, rtol=1e-12, obj=f"{name} {by} {selected_years}")
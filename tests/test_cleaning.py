@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.cleaning import (
+    convert_indonesian_number,
+    convert_indonesian_number_series,
+    extract_rupiah_value,
+    extract_rupiah_value_series,
+)
+
+# ===========================
+# GOLDEN SET
+# ===========================
+# Nilai yang pernah/bisa muncul di CSV: angka biasa, format ribuan Indonesia, desimal, notasi ilmiah,
+# teks kosong/strip, nilai khusus float, angka sangat panjang, dan digit non-ASCII
+GOLDEN_NUMBERS = [
+    "0", "7", "1234", " 42 ", "007", "1.234", "12.345", "123.456.789", "1.234.567.890.123",
+    "1.23", "12.5", "1234.5", "1.2345", "1.234.56", "-3", "+8", "-12.9", ".5", "5.", "1e3", "2.5E2",
+    "-1.234", "1,5", "1.234,5", "12,345", "", " ", "-", "abc", "12abc", "n/a",
+    "nan", "NaN", "99999999999999999999", "123456789012345678", "9007199254740993", "1234567890123456789",
+    "1e30", "-1e19", "٣", "१२३", "１２", "²",
+]
+
+GOLDEN_RUPIAH = [value for value in GOLDEN_NUMBERS if value != "²"] + [
+    "Rp0", "rp0", "Rp 0", "RP0", "Rp6.000.000", "Rp 6.000.000", "rp2500000", "Rp2,5", "Rp12.5",
+    "Rp 1.234.567,89", "Rp-", "Rp", "Rp 5 juta", "±Rp1.000", "Rp٣٠٠", "Rp1.000.000.000.000.000.000",
+]
+
+# Nilai non-teks yang ikut di kolom object setelah read_csv
+MISSING_AND_NUMERIC = [np.nan, None, pd.NA, 0, 15, -4, 3.0, 12.7, -0.5, 1e20]
+
+def assert_same_as_scalar(vector_func, scalar_func, series):
+    expected = series.map(scalar_func)
+    result = vector_func(series)
+    assert result.index.equals(series.index)
+    assert result.name == series.name
+    assert result.tolist() == expected.tolist()
+
+# Nilai yang membuat parser skalar melempar error; versi vektor harus gagal dengan cara yang sama
+RAISING_NUMBERS = [("inf", OverflowError), ("-Infinity", OverflowError)]
+RAISING_RUPIAH = RAISING_NUMBERS + [("Rp inf", OverflowError), ("²", ValueError), ("Rp²", ValueError)]
+
+# ===========================
+# convert_indonesian_number_series
+# ===========================
+@pytest.mark.parametrize("values", [GOLDEN_NUMBERS, GOLDEN_NUMBERS + MISSING_AND_NUMERIC, MISSING_AND_NUMERIC])
+def test_number_series_matches_scalar(values):
+    series = pd.Series(values, dtype=object, name="Jumlah", index=range(100, 100 + len(values)))
+    assert_same_as_scalar(convert_indonesian_number_series, convert_indonesian_number, series)
+
+@pytest.mark.parametrize("series", [
+    pd.Series([1.0, 2.5, np.nan, -7.9, 1e3], name="float"),
+    pd.Series([1, None, 3, -2], dtype="Int64", name="Int64"),
+    pd.Series([5, 0, -1], dtype="int64", name="int64"),
+    pd.Series(["1.234", None, "12.5"], dtype="string", name="string"),
+    pd.Series([], dtype=object, name="kosong"),
+    pd.Series([], dtype="float64", name="kosong_float"),
+])
+def test_number_series_dtypes_match_scalar(series):
+    assert_same_as_scalar(convert_indonesian_number_series, convert_indonesian_number, series)
+
+@pytest.mark.parametrize("value, error", RAISING_NUMBERS)
+def test_number_series_raises_like_scalar(value, error):
+    with pytest.raises(error):
+        convert_indonesian_number(value)
+    with pytest.raises(error):
+        convert_indonesian_number_series(pd.Series(["1", value], dtype=object))
+
+# ===========================
+# extract_rupiah_value_series
+# ===========================
+@pytest.mark.parametrize("values", [GOLDEN_RUPIAH, GOLDEN_RUPIAH + MISSING_AND_NUMERIC, MISSING_AND_NUMERIC])
+def test_rupiah_series_matches_scalar(values):
+    series = pd.Series(values, dtype=object, name="Kerugian_Rupiah", index=range(100, 100 + len(values)))
+    assert_same_as_scalar(extract_rupiah_value_series, extract_rupiah_value, series)
+
+@pytest.mark.parametrize("series", [
+    pd.Series([1.0, 2.5, np.nan, -7.9], name="float"),
+    pd.Series([1, None, 3], dtype="Int64", name="Int64"),
+    pd.Series(["Rp6.000.000", None], dtype="string", name="string"),
+    pd.Series([], dtype=object, name="kosong"),
+])
+def test_rupiah_series_dtypes_match_scalar(series):
+    assert_same_as_scalar(extract_rupiah_value_series, extract_rupiah_value, series)
+
+@pytest.mark.parametrize("value, error", RAISING_RUPIAH)
+def test_rupiah_series_raises_like_scalar(value, error):
+    with pytest.raises(error):
+        extract_rupiah_value(value)
+    with pytest.raises(error):
+        extract_rupiah_value_series(pd.Series(["Rp1", value], dtype=object))
+
+def test_rupiah_series_matches_scalar_on_bundled_csv():
+    kerugian = pd.read_csv("data/sosial/bencana_alam.csv")["Kerugian_Rupiah"]
+    assert_same_as_scalar(extract_rupiah_value_series, extract_rupiah_value, kerugian)
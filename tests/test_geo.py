@@ -0,0 +1,40 @@
+import numpy as np
+
+from core.geo import simplify_geojson
+
+# ===========================
+# BATAS BERSAMA
+# ===========================
+def two_neighbours():
+    """Dua polygon bertetangga dengan batas bersama berkelok (ditelusuri berlawanan arah)"""
+    # Derau membuat Douglas-Peucker per ring memilih titik berbeda di kedua sisi batas
+    rng = np.random.default_rng(0)
+    border = [[0.5 + 0.01 * np.sin(40 * y) + 0.004 * rng.standard_normal(), y] for y in np.linspace(0, 1, 200)]
+    border[0], border[-1] = [0.5, 0.0], [0.5, 1.0]
+    left = [[0.0, 0.0]] + border + [[0.0, 1.0], [0.0, 0.0]]
+    right = [[1.0, 0.0], [1.0, 1.0]] + border[::-1] + [[1.0, 0.0]]
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "properties": {"nm_kecamatan": "Kiri"}, "geometry": {"type": "Polygon", "coordinates": [left]}},
+            {"type": "Feature", "properties": {"nm_kecamatan": "Kanan"}, "geometry": {"type": "MultiPolygon", "coordinates": [[right]]}},
+        ],
+    }
+
+def test_shared_border_simplified_identically():
+    simplified = simplify_geojson(two_neighbours(), 0.005)
+    left = simplified["features"][0]["geometry"]["coordinates"][0]
+    right = simplified["features"][1]["geometry"]["coordinates"][0][0]
+
+    # Titik batas (semua titik selain sudut luar) harus sama persis di kedua sisi
+    left_border = [tuple(point) for point in left if point[0] not in (0.0, 1.0)]
+    right_border = [tuple(point) for point in right if point[0] not in (0.0, 1.0)]
+    assert set(left_border) == set(right_border)
+    assert 2 < len(set(left_border)) < 200
+    assert left[0] == left[-1] and right[0] == right[-1]
+
+def test_structure_and_properties_kept():
+    source = two_neighbours()
+    simplified = simplify_geojson(source, 0.005)
+    assert [feature["properties"] for feature in simplified["features"]] == [feature["properties"] for feature in source["features"]]
+    assert [feature["geometry"]["type"] for feature in simplified["features"]] == ["Polygon", "MultiPolygon"]
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.cleaning import MONTH_ORDER, to_categorical
+from core.datastore import load_dataset
+from core.kecamatan import kesehatan_facts, load_dimension
+
+KESEHATAN_PATH = "data/kesehatan/kesehatan_stunting.csv"
+
+@pytest.fixture(scope="module")
+def dimension():
+    return load_dimension()
+
+@pytest.fixture(scope="module")
+def kesehatan_df():
+    return load_dataset(KESEHATAN_PATH)
+
+def with_extra_rows(df, months):
+    """Salinan df dengan baris tambahan (Stunting ekstrem) untuk kecamatan & tahun baris pertama"""
+    extra = pd.concat([df.iloc[[0]]] * len(months), ignore_index=True)
+    extra["Bulan"] = months
+    extra["Stunting"] = 999999
+    combined = pd.concat([df.astype({"Bulan": object}), extra.astype({"Bulan": object})], ignore_index=True)
+    # Encoding seperti saat load: bulan di luar MONTH_ORDER ditambahkan di akhir kategori
+    combined["Bulan"] = to_categorical(combined["Bulan"], MONTH_ORDER)
+    return combined
+
+# ===========================
+# PERIODE TERAKHIR STUNTING
+# ===========================
+@pytest.mark.parametrize("months", [["Agustus "], [np.nan], ["Agustus ", np.nan, "Bulan-13"]], ids=["unknown", "nan", "mixed"])
+def test_unknown_month_not_latest_period(kesehatan_df, dimension, months):
+    expected = kesehatan_facts(kesehatan_df, dimension)
+    facts = kesehatan_facts(with_extra_rows(kesehatan_df, months), dimension)
+    pd.testing.assert_frame_equal(facts, expected)
+    assert facts["Stunting"].max() < 999999
@@ -0,0 +1,187 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import datastore
+from core.kesehatan import (
+    PERIOD_INDEX_SOURCE,
+    PREVALENSI_COL,
+    build_facilities_index,
+    build_latest_period_index,
+    build_period_index,
+    create_sorted_period_data,
+    get_latest_facilities_data,
+    get_latest_period,
+    ingest_period_index,
+    latest_facilities_snapshot,
+    lookup_latest_period,
+    read_period_index,
+    slice_period_trend,
+)
+
+# ===========================
+# CACHE INDEKS PERIODE INKREMENTAL
+# ===========================
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Folder data sementara berisi master kecamatan; cache kolumnar diarahkan ke sana"""
+    os.makedirs(tmp_path / "kesehatan")
+    os.makedirs(tmp_path / "sosial")
+    shutil.copy(datastore.KECAMATAN_MASTER, tmp_path / "sosial" / "master_kecamatan.csv")
+    cache_dir = str(tmp_path / ".cache")
+    monkeypatch.setattr(datastore, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(datastore, "CACHE_DIR", cache_dir)
+    monkeypatch.setattr(datastore, "MANIFEST_PATH", os.path.join(cache_dir, "manifest.json"))
+    monkeypatch.setattr(datastore, "MANIFEST_LOCK_PATH", os.path.join(cache_dir, "manifest.json.lock"))
+    return tmp_path
+
+def source_lines():
+    """Baris CSV stunting bawaan, masing-masing diakhiri newline"""
+    with open(PERIOD_INDEX_SOURCE, encoding="utf-8", newline="") as f:
+        return [line if line.endswith("\n") else line + "\n" for line in f.readlines()]
+
+def write_lines(path, lines, mode="w"):
+    with open(path, mode, encoding="utf-8", newline="") as f:
+        f.writelines(lines)
+    # mtime bisa sama di filesystem beresolusi kasar; pastikan perubahan terdeteksi lewat ukuran/hash
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1_000_000))
+
+def test_period_index_appends_only_new_rows(data_dir):
+    header, *rows = source_lines()
+    csv_path = data_dir / "kesehatan" / "kesehatan_stunting.csv"
+    split = len(rows) - 33
+
+    write_lines(csv_path, [header] + rows[:split])
+    assert ingest_period_index() == split
+    assert ingest_period_index() == 0
+
+    # CSV hanya bertambah baris: cukup baris baru yang diagregasi, hasilnya sama dengan build penuh
+    write_lines(csv_path, rows[split:], mode="a")
+    assert ingest_period_index() == len(rows) - split
+    expected = build_period_index(datastore.load_dataset(PERIOD_INDEX_SOURCE))
+    pd.testing.assert_frame_equal(read_period_index(), expected)
+
+def test_period_index_rebuilds_when_rows_change(data_dir):
+    header, *rows = source_lines()
+    csv_path = data_dir / "kesehatan" / "kesehatan_stunting.csv"
+
+    write_lines(csv_path, [header] + rows[:-1])
+    ingest_period_index()
+
+    # Baris lama dihapus dan baris baru ditambahkan: ukuran naik tetapi awal file berubah
+    write_lines(csv_path, [header] + rows[1:] + rows[:2])
+    assert ingest_period_index() == len(rows) + 1
+    expected = build_period_index(datastore.load_dataset(PERIOD_INDEX_SOURCE))
+    pd.testing.assert_frame_equal(read_period_index(), expected)
+
+# ===========================
+# TREN DARI INDEKS PERIODE VS GROUPBY LAMA
+# ===========================
+@pytest.fixture(scope="module")
+def kesehatan_df():
+    return datastore.load_dataset(PERIOD_INDEX_SOURCE)
+
+def filter_rows(df, years, kecamatan):
+    """Filter sidebar lama: subset baris menurut tahun dan kecamatan"""
+    mask = pd.Series(True, index=df.index)
+    if years is not None:
+        mask &= df['Tahun'].isin(years)
+    if kecamatan is not None:
+        mask &= df['Kecamatan'].isin(kecamatan)
+    return df[mask]
+
+def old_trend(df, by):
+    """Tren seperti dashboard sebelum indeks periode: groupby atas data baris"""
+    if by == 'Tahun':
+        keys = ['Tahun']
+    else:
+        df = create_sorted_period_data(df.copy())
+        keys = ['Tahun', 'Bulan', 'Periode', 'Month_Num']
+    trend = df.groupby(keys, observed=True).agg({
+        'Prevalensi Stunting Persen': ['mean', 'std'],
+        'Stunting': 'sum',
+        'Jumlah Yang Diukur': 'sum'
+    }).reset_index()
+    trend.columns = keys + ['Prevalensi_Mean', 'Prevalensi_Std', 'Total_Stunting', 'Total_Diukur']
+    if by != 'Tahun':
+        trend = trend.sort_values(['Tahun', 'Month_Num']).reset_index(drop=True)
+    return trend
+
+# (tahun, kecamatan) filter: tab tren umum (sidebar) dan tab kecamatan tunggal
+TREND_FILTERS = {
+    "semua": (None, None),
+    "satu_tahun": ([2022], None),
+    "tahun_dan_kecamatan": ([2021, 2023], ['Dau', 'Pujon', 'Kepanjen', 'Turen', 'Singosari']),
+    "kecamatan_tunggal": (None, ['Kepanjen']),
+}
+
+@pytest.mark.parametrize("by", ['Tahun', 'Periode'])
+@pytest.mark.parametrize("years, kecamatan", TREND_FILTERS.values(), ids=TREND_FILTERS.keys())
+def test_slice_period_trend_matches_groupby(kesehatan_df, by, years, kecamatan):
+    expected = old_trend(filter_rows(kesehatan_df, years, kecamatan), by)
+    trend = slice_period_trend(build_period_index(kesehatan_df), by, years, kecamatan)
+    assert not expected.empty
+
+    label_cols = ['Tahun'] if by == 'Tahun' else ['Tahun', 'Bulan', 'Periode', 'Month_Num']
+    for col in label_cols:
+        assert trend[col].astype(str).tolist() == expected[col].astype(str).tolist()
+    for col in ['Total_Stunting', 'Total_Diukur']:
+        assert trend[col].tolist() == expected[col].tolist()
+    # Urutan penjumlahan berbeda (per sel indeks lalu per grup), selisih hanya di bit terakhir
+    pd.testing.assert_series_equal(trend['Prevalensi_Mean'], expected['Prevalensi_Mean'], rtol=1e-12, atol=0)
+    # Std dari SumSq - n*mean^2 bisa kehilangan presisi karena pembatalan; cukup sama dalam toleransi
+    pd.testing.assert_series_equal(trend['Prevalensi_Std'], expected['Prevalensi_Std'], rtol=1e-9, atol=1e-9)
+
+# ===========================
+# PERIODE TERAKHIR & SNAPSHOT FASILITAS VS HELPER LAMA
+# ===========================
+def random_filters(df, count, seed=0):
+    """Kombinasi filter tahun & kecamatan acak (termasuk pilihan kosong) seperti multiselect sidebar"""
+    rng = np.random.default_rng(seed)
+    years = sorted(df['Tahun'].unique().tolist())
+    kecamatan = df['Kecamatan'].cat.categories.tolist()
+    for _ in range(count):
+        n_years = rng.integers(0, len(years) + 1)
+        # Separuh kombinasi hanya memilih beberapa kecamatan, seperti pilihan yang sering dipakai
+        n_kecamatan = rng.integers(0, len(kecamatan) + 1) if rng.random() < 0.5 else rng.integers(1, 4)
+        yield (
+            sorted(rng.choice(years, n_years, replace=False).tolist()),
+            sorted(rng.choice(kecamatan, n_kecamatan, replace=False).tolist()),
+        )
+
+def by_kecamatan(df):
+    df = df.assign(Kecamatan=df['Kecamatan'].astype(str))
+    return df.sort_values('Kecamatan').reset_index(drop=True)
+
+def without_latest_month(df):
+    """Data tanpa pengukuran Agustus untuk separuh kecamatan: periode terakhir bergantung pada filter kecamatan"""
+    half = df['Kecamatan'].cat.categories[::2]
+    drop = (df['Bulan'] == 'Agustus') & df['Kecamatan'].isin(half)
+    return df[~drop].reset_index(drop=True)
+
+@pytest.mark.parametrize("variant", [lambda df: df, without_latest_month], ids=["bawaan", "agustus_sebagian"])
+def test_latest_snapshot_matches_old_helpers(kesehatan_df, variant):
+    kesehatan_df = variant(kesehatan_df)
+    latest_index = build_latest_period_index(build_period_index(kesehatan_df))
+    facilities_index = build_facilities_index(kesehatan_df)
+
+    for years, kecamatan in random_filters(kesehatan_df, 200):
+        filtered_df = filter_rows(kesehatan_df, years, kecamatan)
+        latest_year, latest_month = lookup_latest_period(latest_index, years, kecamatan)
+        assert (latest_year, latest_month) == get_latest_period(filtered_df)
+
+        faskes_df, prevalensi_df = latest_facilities_snapshot(facilities_index, latest_year, latest_month, kecamatan)
+        expected_faskes = get_latest_facilities_data(filtered_df)
+        if expected_faskes.empty:
+            assert faskes_df.empty
+            continue
+        pd.testing.assert_frame_equal(
+            by_kecamatan(faskes_df), by_kecamatan(expected_faskes[faskes_df.columns]), check_dtype=False
+        )
+
+        latest_rows = filtered_df[(filtered_df['Tahun'] == latest_year) & (filtered_df['Bulan'] == latest_month)]
+        expected_prevalensi = latest_rows.groupby('Kecamatan', observed=True).agg({PREVALENSI_COL: 'mean'}).reset_index()
+        pd.testing.assert_frame_equal(by_kecamatan(prevalensi_df), by_kecamatan(expected_prevalensi), check_dtype=False)